@@ -1,8 +1,19 @@
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import datetime, timedelta
 
-from BATCH_CODE.common.config import get_sqlalchemy_db_url
+from API.engine import get_engine
+from API.price_cache import PriceCache
+from API.panel import PricePanel
+from API.latest_price import load_universe
+from API.trading_calendar import get_calendar
+from API.price_stream import (
+    STREAM_CHUNK_ROWS, LAST_BARS_LOOKBACK, project_columns, read_prices, read_last_bars,
+    filter_prices, pivot_prices, iter_chunks, iter_code_frames
+)
+
+# get_all_daily_prices 컬럼 (로컬 캐시 파일 스키마와 동일)
+PRICE_COLUMNS = ["code", "date", "open", "high", "low", "close", "volume", "diff", "last_update"]
 
 
 class MarketDB:
@@ -11,23 +22,52 @@ class MarketDB:
         # -------------------------------------------------------
         # MariaDB
         # -------------------------------------------------------
-        self.engine = create_engine(
-            get_sqlalchemy_db_url(),
-            pool_pre_ping=True,
-            pool_recycle=3600
-        )
+        # DB URL 별 공유 engine (연결은 첫 쿼리 시점)
+        self.engine = get_engine()
+
+        # 로컬 columnar 캐시 (MARKET_CACHE_DIR 설정 시에만 사용)
+        self.price_cache = PriceCache.from_env(self.engine, "etf_daily_price_kr", PRICE_COLUMNS)
+
+        # ETF 기본 정보 (KODEX) 는 최초 사용 시 1회 로딩
+        self._universe = None
+        self._codes = {}
+        self._name_to_code = {}
 
-        self.codes = {}
-        self.name_to_code = {}
+    @property
+    def codes(self):
+        self._ensure_universe()
+        return self._codes
 
-        # ETF 기본 정보 로딩 (KODEX)
+    @property
+    def name_to_code(self):
+        self._ensure_universe()
+        return self._name_to_code
+
+    def _ensure_universe(self):
+        if self._universe is None:
+            self.get_etf_info()
+
+    def refresh(self):
+        """
+        ETF 목록 다시 로딩
+        """
         self.get_etf_info()
+        return self.get_etf_info_optimization()
 
     # =====================================================================
     # ETF 기본 정보 (KODEX)
     # =====================================================================
     def get_etf_info(self):
-        sql = text("""
+        # 최신 거래일 요약 테이블 JOIN (거래일 단위 캐시)
+        summary_sql = """
+            SELECT ci.code, ci.name
+            FROM etf_info_kr ci
+            JOIN etf_latest_price_kr lp ON lp.code = ci.code
+            WHERE ci.name LIKE '%KODEX%'
+              AND lp.volume > 0
+        """
+        # 요약 테이블 사용 불가 시 기존 쿼리
+        fallback_sql = """
             SELECT ci.code, ci.name
             FROM etf_info_kr ci
             WHERE ci.name LIKE '%KODEX%'
@@ -42,16 +82,15 @@ class MarketDB:
                         WHERE code = ci.code
                     )
               )
-        """)
-        with self.engine.connect() as conn:
-            df = pd.read_sql(sql, conn)
+        """
+        df = load_universe(self.engine, "etf_kr", "etf_daily_price_kr", summary_sql, fallback_sql)
 
         if df.empty:
             print("⚠ KODEX ETF 기본 정보 없음")
-            return
 
-        self.codes = dict(zip(df["code"], df["name"]))
-        self.name_to_code = {v: k for k, v in self.codes.items()}
+        self._universe = df[["code", "name"]]
+        self._codes = dict(zip(df["code"], df["name"]))
+        self._name_to_code = {v: k for k, v in self._codes.items()}
 
     # =====================================================================
     # ETF 일별 시세 (단일 종목)
@@ -111,6 +150,59 @@ class MarketDB:
             print(f"[MariaDB ERROR] get_daily_price({code}): {e}")
             return None
 
+    # =====================================================================
+    # 여러 종목 일봉 1회 조회 (long / wide)
+    # =====================================================================
+    def get_daily_prices_bulk(self, codes, start_date=None, end_date=None, wide=False):
+        """
+        codes : 종목코드 또는 종목명 리스트
+        - wide=False : long DataFrame (code, date, open, high, low, close, volume, ...)
+        - wide=True  : {"close": date×code, "volume": date×code} (거래일 캘린더 기준 정렬, 결측 NaN)
+        """
+        if start_date is None:
+            start_date = (datetime.today() - timedelta(days=365)).strftime("%Y-%m-%d")
+        else:
+            start_date = self._normalize_date(start_date)
+
+        if end_date is None:
+            end_date = datetime.today().strftime("%Y-%m-%d")
+        else:
+            end_date = self._normalize_date(end_date)
+
+        resolved = []
+        for code in codes:
+            if code in self.codes:
+                resolved.append(code)
+            elif code in self.name_to_code:
+                resolved.append(self.name_to_code[code])
+            else:
+                print(f"⚠ Code({code}) doesn't exist.")
+
+        if not resolved:
+            return None
+
+        try:
+            df = read_prices(
+                self.engine, "etf_daily_price_kr",
+                [c for c in PRICE_COLUMNS if c != "last_update"],
+                start_date, end_date, resolved
+            )
+
+            if df.empty:
+                print("⚠ MariaDB: 데이터 없음.")
+                return None
+
+            df["date"] = pd.to_datetime(df["date"])
+
+            if not wide:
+                return df
+
+            return pivot_prices(df, self.calendar.range(start_date, end_date))
+
+        except Exception as e:
+            print(f"[MariaDB ERROR] get_daily_prices_bulk: {e}")
+            return None
+
     # =====================================================================
     # 날짜 문자열 정규화
     # =====================================================================
@@ -125,9 +217,6 @@ class MarketDB:
     # 전략 스캐너용 ETF 정보
     # =====================================================================
     def get_etf_info_optimization(self):
-        if not self.codes:
-            self.get_etf_info()
-
         return pd.DataFrame(
             [{"code": k, "name": v} for k, v in self.codes.items()]
         )
@@ -135,20 +224,16 @@ class MarketDB:
     # =====================================================================
     # 날짜 보정: 기준일 이하 가장 최근 거래일
     # =====================================================================
+    @property
+    def calendar(self):
+        """
+        etf_daily_price_kr 거래일 캘린더 (최초 접근 시 로딩, 이후 증분 갱신)
+        """
+        return get_calendar(self.engine, "etf_daily_price_kr")
+
     def get_latest_date(self, date_str):
         try:
-            sql = text("""
-                SELECT DATE_FORMAT(date, '%Y-%m-%d') AS date
-                FROM etf_daily_price_kr
-                WHERE date <= :target
-                ORDER BY date DESC
-                LIMIT 1
-            """)
-
-            with self.engine.connect() as conn:
-                row = conn.execute(sql, {"target": date_str}).fetchone()
-
-            return row.date if row else None
+            return self.calendar.latest_on_or_before(date_str)
 
         except Exception as e:
             print(f"[MariaDB ERROR] get_latest_date: {e}")
@@ -157,24 +242,88 @@ class MarketDB:
     # =====================================================================
     # 전체 ETF 일봉 데이터 1회 조회 (Batch 핵심)
     # =====================================================================
-    def get_all_daily_prices(self, start_date, end_date):
+    def get_all_daily_prices(self, start_date, end_date, codes=None, columns=None):
+        """
+        - codes   : 지정 시 해당 종목만 조회 (SQL IN push-down)
+        - columns : 지정 시 해당 컬럼만 조회 (code, date 는 항상 포함)
+        """
+        if columns is not None:
+            columns = project_columns(PRICE_COLUMNS, columns)
 
-        sql = text("""
-            SELECT code, date, open, high, low, close, volume, diff, last_update
-            FROM etf_daily_price_kr
-            WHERE date BETWEEN :start AND :end
-            ORDER BY code, date
-        """)
+        if self.price_cache is not None:
+            try:
+                df = self.price_cache.read(start_date, end_date)
+                return filter_prices(df, codes, columns)
+            except Exception as e:
+                print(f"[CACHE ERROR] get_all_daily_prices: {e} → MariaDB 직접 조회")
 
-        with self.engine.connect() as conn:
-            df = pd.read_sql(
-                sql,
-                conn,
-                params={"start": start_date, "end": end_date}
-            )
+        df = read_prices(
+            self.engine, "etf_daily_price_kr", columns or PRICE_COLUMNS,
+            start_date, end_date, codes
+        )
 
         if df.empty:
             return df
 
         df["date"] = pd.to_datetime(df["date"])
         return df
+
+    # =====================================================================
+    # 전체 가격 데이터 스트리밍 조회 (server-side cursor, compact dtype)
+    # =====================================================================
+    def iter_daily_prices(self, start_date, end_date, codes=None, columns=None,
+                          chunksize=STREAM_CHUNK_ROWS, by_code=False):
+        """
+        기간 내 전체 종목 일봉을 chunk 단위로 yield
+        - codes   : 지정 시 해당 종목만 조회 (SQL IN push-down)
+        - columns : 필요한 컬럼만 조회 (code, date 는 항상 포함)
+        - by_code : True 면 (code, DataFrame) 종목 단위로 yield
+        """
+        columns = project_columns(PRICE_COLUMNS, columns)
+        chunks = iter_chunks(self.engine, "etf_daily_price_kr", columns, start_date, end_date, chunksize, codes)
+        return iter_code_frames(chunks) if by_code else chunks
+
+    # =====================================================================
+    # 종목별 최근 n 개 일봉 (서버에서 ROW_NUMBER() 로 계산)
+    # =====================================================================
+    def get_last_n_bars(self, n=2, as_of=None, codes=None, columns=None):
+        """
+        as_of 이하 종목별 최근 n 개 일봉 + prev_close (직전 봉 종가)
+        - 스캔 범위: as_of 기준 n + LAST_BARS_LOOKBACK 거래일 (그 안에 봉이 없는 종목은 제외)
+        - n=1 : 종목당 1행 (close / prev_close 나란히) → 전일 대비 비교용
+        - codes   : 지정 시 해당 종목만 조회 (SQL IN push-down)
+        - columns : 필요한 컬럼만 조회 (code, date, close 는 항상 포함)
+        반환: code, date 순 정렬 long DataFrame
+        """
+        as_of = self.get_latest_date(as_of or datetime.today().strftime("%Y-%m-%d"))
+        if as_of is None:
+            return pd.DataFrame(columns=["code", "date", "close", "prev_close"])
+
+        columns = project_columns(PRICE_COLUMNS, columns)
+        start_date = self.calendar.offset(as_of, -(n + LAST_BARS_LOOKBACK)) or self.calendar.dates[0]
+
+        try:
+            return read_last_bars(self.engine, "etf_daily_price_kr", columns, start_date, as_of, n, codes)
+
+        except Exception as e:
+            print(f"[MariaDB ERROR] get_last_n_bars: {e}")
+            return pd.DataFrame(columns=columns + ["prev_close"])
+
+    # =====================================================================
+    # code × 거래일 가격 패널 (memory-mapped, 프로세스 간 공유)
+    # =====================================================================
+    def export_panel(self, start_date, end_date, path):
+        """
+        기간 내 전체 종목 일봉 → PricePanel 파일 저장 후 반환
+        """
+        df = self.get_all_daily_prices(start_date, end_date)
+        panel = PricePanel.from_frame(df)
+        panel.save(path)
+        return panel
+
+    @staticmethod
+    def load_panel(path):
+        """
+        export_panel() 결과를 복사 없이 memory-map 으로 로딩
+        """
+        return PricePanel.load(path)
@@ -0,0 +1,133 @@
+"""
+fetch backend 벤치마크 (pd.read_sql vs API.fetch)
+
+합성 일봉 테이블을 만들어 get_all_daily_prices 와 같은 SELECT 를 backend 별로 실행
+
+    python -m API.bench_fetch --rows 3000000
+    python -m API.bench_fetch --rows 500000 --url sqlite:////tmp/bench.db
+
+- 기본 DB: .env 의 MariaDB (get_engine)
+- 테이블: bench_daily_price (--keep 없으면 종료 시 DROP)
+"""
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from API.fetch import fetch_frame, HAS_CONNECTORX
+
+TABLE = "bench_daily_price"
+INSERT_BATCH = 50000
+
+SELECT_SQL = text(f"""
+    SELECT code, date, open, high, low, close, volume, diff, last_update
+    FROM {TABLE}
+    WHERE date BETWEEN :start AND :end
+    ORDER BY code, date
+""")
+
+
+def build_table(engine, rows, days=500):
+    n_codes = max(1, rows // days)
+    dates = pd.bdate_range("2020-01-01", periods=days).strftime("%Y-%m-%d")
+    rng = np.random.default_rng(0)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        conn.execute(text(f"""
+            CREATE TABLE {TABLE} (
+                code        VARCHAR(20) NOT NULL,
+                date        DATE        NOT NULL,
+                open        BIGINT,
+                high        BIGINT,
+                low         BIGINT,
+                close       BIGINT,
+                volume      BIGINT,
+                diff        INT,
+                last_update DATETIME,
+                PRIMARY KEY (code, date)
+            )
+        """))
+
+    sql = (
+        f"INSERT INTO {TABLE} VALUES "
+        f"(:code, :date, :open, :high, :low, :close, :volume, :diff, :last_update)"
+    )
+    batch = []
+    with engine.begin() as conn:
+        for c in range(n_codes):
+            code = f"{c:06d}"
+            close = rng.integers(1000, 200000, size=len(dates))
+            volume = rng.integers(0, 10_000_000, size=len(dates))
+            for d, px, vol in zip(dates, close, volume):
+                px = int(px)
+                batch.append({
+                    "code": code, "date": d,
+                    "open": px, "high": px + 100, "low": px - 100, "close": px,
+                    "volume": int(vol), "diff": 0,
+                    "last_update": f"{d} 18:00:00",
+                })
+                if len(batch) >= INSERT_BATCH:
+                    conn.execute(text(sql), batch)
+                    batch = []
+        if batch:
+            conn.execute(text(sql), batch)
+
+    return n_codes * len(dates), dates[0], dates[-1]
+
+
+def run(engine, backend, start, end, repeat):
+    best = None
+    rows = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        df = fetch_frame(engine, SELECT_SQL, {"start": start, "end": end}, backend=backend)
+        elapsed = time.perf_counter() - t0
+        rows = len(df)
+        best = elapsed if best is None else min(best, elapsed)
+        del df
+    return rows, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--url", default=None, help="SQLAlchemy URL (기본: .env MariaDB)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="벤치마크 테이블 유지")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        from API.engine import get_engine
+        engine = get_engine()
+
+    print(f"[BENCH] {TABLE} 생성 중 (rows≈{args.rows:,})")
+    total, start, end = build_table(engine, args.rows)
+    print(f"[BENCH] {total:,} rows 적재 완료")
+
+    backends = ["pandas", "cursor"]
+    if HAS_CONNECTORX and engine.dialect.name in ("mysql", "mariadb"):
+        backends.append("connectorx")
+
+    try:
+        results = {}
+        for backend in backends:
+            rows, best = run(engine, backend, start, end, args.repeat)
+            results[backend] = best
+            print(f"[BENCH] {backend:<10} rows={rows:,} best={best:.2f}s ({rows / best:,.0f} rows/s)")
+
+        base = results["pandas"]
+        for backend, best in results.items():
+            print(f"[BENCH] {backend:<10} x{base / best:.2f} vs pd.read_sql")
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
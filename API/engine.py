@@ -0,0 +1,45 @@
+"""
+프로세스 공유 SQLAlchemy engine (DB URL 별 1개)
+
+- MarketDB 를 여러 번 생성해도 connection pool 은 URL 당 1개만 사용
+- create_engine 은 연결을 만들지 않음 → 실제 연결은 첫 쿼리 시점
+- fork 된 자식 프로세스(zygote handler 등)는 부모 pool 을 물려받지 않고 새로 생성
+- MARKET_PROFILE 설정 시 쿼리 프로파일러 연결 (API.profiler)
+"""
+import os
+import threading
+
+from sqlalchemy import create_engine
+
+from API import profiler
+from BATCH_CODE.common.config import get_sqlalchemy_db_url
+
+_engines = {}
+_lock = threading.Lock()
+
+
+def get_engine(url=None):
+    url = url or get_sqlalchemy_db_url()
+
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(
+                url,
+                pool_pre_ping=True,
+                pool_recycle=3600
+            )
+            profiler.install(engine)
+            _engines[url] = engine
+        return engine
+
+
+def _reset_after_fork():
+    # 부모의 socket 을 자식이 재사용하지 않도록 참조만 버림 (close 하지 않음)
+    global _lock
+    _engines.clear()
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,224 @@
+"""
+대량 조회용 typed column fetch (pd.read_sql 대체)
+
+pd.read_sql 은 PyMySQL 이 만든 행 tuple → Row 객체 → DataFrame.from_records 순으로
+셀마다 Python 객체를 거친 뒤 컬럼 타입을 추론함 → 수백만 행에서는 이 변환이 대부분의 시간
+
+backend (MARKET_FETCH_BACKEND, 기본 auto)
+- connectorx : MySQL 프로토콜을 Rust 에서 직접 Arrow 컬럼 버퍼로 decode (행 tuple / 셀 객체 생성 없음)
+               requirements.txt 기본 설치 → MySQL 계열 engine 이면 auto 로 선택
+- cursor     : connectorx 미설치 / 실패 / MySQL 외 engine (sqlite 등) 용 fallback
+               DBAPI cursor 를 server-side 로 FETCH_BLOCK_ROWS 씩 읽어 컬럼 단위로 NumPy 배열 변환
+               (SQLAlchemy Row / from_records 는 생략하지만 PyMySQL 의 행 tuple 은 그대로 생성됨)
+- pandas     : 기존 pd.read_sql (비교 / 문제 시 회피용)
+
+결과 DataFrame 의 컬럼 구성은 pd.read_sql 과 동일, dtype 은 아래가 다름
+- DECIMAL   : float64 (pd.read_sql 은 decimal.Decimal object)
+- DATE      : datetime.date object (pd.read_sql 과 동일), DATETIME/TIMESTAMP 는 datetime64
+- NULL 포함 정수 컬럼은 float64 (pd.read_sql 과 동일)
+
+벤치마크: python -m API.bench_fetch --rows 3000000
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam
+from sqlalchemy.dialects import mysql
+
+from API import profiler
+
+try:
+    import connectorx as cx
+    HAS_CONNECTORX = True
+except ImportError:
+    HAS_CONNECTORX = False
+
+FETCH_BACKEND = os.getenv("MARKET_FETCH_BACKEND", "auto")
+FETCH_BLOCK_ROWS = int(os.getenv("MARKET_FETCH_BLOCK_ROWS", "100000"))
+
+# PyMySQL FIELD_TYPE → 변환 종류
+_FLOAT_TYPES = {0, 4, 5, 246}            # DECIMAL, FLOAT, DOUBLE, NEWDECIMAL
+_INT_TYPES = {1, 2, 3, 8, 9, 13}         # TINY, SHORT, LONG, LONGLONG, INT24, YEAR
+_DATETIME_TYPES = {7, 12}                # TIMESTAMP, DATETIME
+
+
+def fetch_frame(engine, sql, params=None, backend=None):
+    """
+    text() SQL + params → DataFrame
+    """
+    backend = backend or FETCH_BACKEND
+    params = params or {}
+
+    if backend == "pandas":
+        with engine.connect() as conn:
+            return pd.read_sql(sql, conn, params=params)
+
+    is_mysql = engine.dialect.name in ("mysql", "mariadb")
+    use_cx = backend == "connectorx" or (backend == "auto" and is_mysql)
+    if use_cx and not HAS_CONNECTORX:
+        _warn_no_connectorx()
+        use_cx = False
+    if use_cx:
+        try:
+            return _fetch_connectorx(engine, sql, params)
+        except Exception as e:
+            print(f"[FETCH ERROR] connectorx: {e} → cursor fetch")
+
+    return _fetch_cursor(engine, sql, params)
+
+
+# ======================================================
+# connectorx (Arrow)
+# ======================================================
+_warned_no_connectorx = False
+
+
+def _warn_no_connectorx():
+    # requirements.txt 기본 설치 → 누락 시 행 단위 cursor fetch 로 떨어짐을 1회 알림
+    global _warned_no_connectorx
+    if not _warned_no_connectorx:
+        print("[FETCH WARN] connectorx 미설치 → cursor fetch (pip install -r requirements.txt)")
+        _warned_no_connectorx = True
+
+
+def _fetch_connectorx(engine, sql, params):
+    # connectorx 는 bind parameter 미지원 → SQLAlchemy 로 literal 렌더링 (escape 처리됨)
+    query = render_literal_sql(sql, params)
+    url = engine.url.set(drivername="mysql", query={}).render_as_string(hide_password=False)
+
+    t0 = time.perf_counter()
+    table = cx.read_sql(url, query, return_type="arrow")
+    # SQLAlchemy 이벤트를 거치지 않으므로 직접 기록
+    profiler.record(engine, query, None, time.perf_counter() - t0, rows=table.num_rows)
+    return table.to_pandas()
+
+
+def bind_values(sql, params):
+    """
+    params 값을 text() 에 직접 bind (list 값은 expanding IN)
+    """
+    names = set(sql.compile().params)
+    binds = []
+    for key, value in params.items():
+        if key not in names:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = list(value)
+            type_ = bindparam(key, value[0]).type if value else None
+            binds.append(bindparam(key, value, expanding=True, type_=type_))
+        else:
+            binds.append(bindparam(key, value))
+    return sql.bindparams(*binds)
+
+
+def render_literal_sql(sql, params):
+    compiled = bind_values(sql, params).compile(
+        dialect=mysql.dialect(paramstyle="named"),
+        compile_kwargs={"literal_binds": True}
+    )
+    return str(compiled)
+
+
+# ======================================================
+# DBAPI cursor → NumPy 컬럼
+# ======================================================
+def _fetch_cursor(engine, sql, params):
+    # SQLAlchemy Result 를 거치지 않고 DBAPI cursor 를 직접 사용 (Row 객체 생성 / 선행 fetch 없음)
+    compiled = bind_values(sql, params).compile(
+        dialect=engine.dialect,
+        compile_kwargs={"render_postcompile": True}
+    )
+    if engine.dialect.positional:
+        args = tuple(compiled.params[k] for k in compiled.positiontup)
+    else:
+        args = compiled.params
+
+    t0 = time.perf_counter()
+    n_rows = 0
+    raw = engine.raw_connection()
+    try:
+        cursor_class = _server_side_cursor(engine)
+        cursor = raw.cursor(cursor_class) if cursor_class else raw.cursor()
+        try:
+            cursor.execute(compiled.string, args)
+
+            description = cursor.description
+            names = [d[0] for d in description]
+            blocks = [[] for _ in names]
+
+            while True:
+                rows = cursor.fetchmany(FETCH_BLOCK_ROWS)
+                if not rows:
+                    break
+                n_rows += len(rows)
+                for i, col in enumerate(zip(*rows)):
+                    blocks[i].append(_to_array(col, description[i][1]))
+        finally:
+            # SSCursor 는 남은 결과를 읽어 버려야 connection 을 pool 에 돌려줄 수 있음 → 예외 시에도 닫기
+            cursor.close()
+    finally:
+        raw.close()
+
+    # raw cursor 는 SQLAlchemy 이벤트를 거치지 않으므로 직접 기록
+    profiler.record(
+        engine, compiled.string, args, time.perf_counter() - t0,
+        rows=n_rows, description=description
+    )
+
+    data = {}
+    for name, parts in zip(names, blocks):
+        if not parts:
+            data[name] = np.array([], dtype=object)
+        elif len(parts) == 1:
+            data[name] = parts[0]
+        else:
+            data[name] = np.concatenate(parts)
+
+    return pd.DataFrame(data, columns=names)
+
+
+def _server_side_cursor(engine):
+    """
+    PyMySQL: SSCursor (결과를 서버에서 block 단위로 수신), 그 외 드라이버는 기본 cursor
+    """
+    if engine.dialect.driver == "pymysql":
+        import pymysql.cursors
+        return pymysql.cursors.SSCursor
+    return None
+
+
+def _to_array(col, type_code):
+    """
+    컬럼 tuple → NumPy 배열 (NULL 포함 시 float/object 로 완화)
+    """
+    if type_code is None:
+        # 타입 정보 없는 드라이버 (sqlite 등) → 첫 non-NULL 값으로 판단
+        sample = next((v for v in col if v is not None), None)
+        if isinstance(sample, int) and not isinstance(sample, bool):
+            type_code = 8
+        elif isinstance(sample, float):
+            type_code = 5
+
+    if type_code in _FLOAT_TYPES:
+        try:
+            return np.array(col, dtype=np.float64)
+        except TypeError:
+            return np.array([np.nan if v is None else float(v) for v in col], dtype=np.float64)
+
+    if type_code in _INT_TYPES:
+        try:
+            return np.array(col, dtype=np.int64)
+        except TypeError:
+            return np.array([np.nan if v is None else v for v in col], dtype=np.float64)
+
+    if type_code in _DATETIME_TYPES:
+        # DATE 는 pd.read_sql 과 같이 datetime.date object 로 유지 (아래 object 경로)
+        try:
+            return np.array(col, dtype="datetime64[ns]")
+        except (TypeError, ValueError):
+            # '0000-00-00' 등 드라이버가 문자열로 넘기는 값
+            return pd.to_datetime(pd.Series(col, dtype=object), errors="coerce").to_numpy()
+
+    return np.array(col, dtype=object)
@@ -0,0 +1,604 @@
+"""
+종목별 지표 상태 저장소 (새 일봉만 반영 → 일일 갱신 비용 O(codes))
+
+{MARKET_STATE_DIR}/{table}/
+    _manifest.json : 마지막 처리 거래일(last_date), last_update watermark, 파라미터, 생성/갱신 시각
+    _lock          : 프로세스 간 갱신 잠금 (fcntl)
+    state.npz      : 종목별 상태 배열 (행 = codes 순서)
+
+상태 (종목별)
+    close / volume / date ring buffer : 최근 STATE_BARS 봉 (빠지는 값 조회 + 기간 내 봉 수 + 재적재 값 비교)
+    rolling 합               : MA60 / 볼린저(20) 합·제곱합 / RSI(14) 상승·하락 합 + 하락 봉 수
+                               (ref = 종목 첫 종가 기준 편차 합 → 원 단위 정수 가격은 오차 없음)
+    120봉 극값               : 새 값과 비교, 빠지는 값이 극값이었던 종목만 ring 에서 재계산
+                               (monotonic deque 와 같은 분할상환 O(1), 배열 연산으로 처리)
+    Wilder 평활              : RSI(14) 평균 상승 / 하락
+    주봉                     : 진행 중인 주(W-SAT 라벨, 종가, 거래량 합, 마지막 거래일)
+                               + 완료된 주 ring buffer (STATE_WEEKS 주)
+
+sync(as_of)
+    - last_date 이후 행만 조회 → 거래일 순서대로 push (종목 수만큼의 배열 연산)
+    - 전체 재구성(rebuild) 조건
+        상태 파일 없음 / 파라미터 변경 / 생성 후 REBUILD_DAYS 경과
+        as_of < last_date (과거 기준일 실행)
+        새 거래일 수 > MAX_INCREMENTAL_DAYS (장기 미갱신)
+        이미 반영한 기간에 last_update > watermark 인 행의 값이 상태와 다름 (정정 / 부분 적재 후 추가분)
+        (일봉 적재는 최근 페이지 전체에 last_update 를 새로 찍으므로 값이 같으면 watermark 만 갱신)
+    - rebuild 는 STATE_DAYS 기간을 1회 조회해 같은 push 로 재생 (증분과 같은 계산 경로)
+
+daily_last() / weekly_last() 는 screening_kr 의 종목별 마지막 행 + feature 와 같은 컬럼
+
+CLI:
+    python -m API.indicator_state sync    [--table daily_price_kr] [--as-of YYYY-MM-DD]
+    python -m API.indicator_state rebuild [--table daily_price_kr] [--as-of YYYY-MM-DD]
+"""
+import os
+import sys
+import json
+import time
+import fcntl
+import argparse
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from API import indicators
+from API.fetch import fetch_frame
+
+STATE_DIR = os.getenv("MARKET_STATE_DIR")
+STATE_DAYS = int(os.getenv("MARKET_STATE_DAYS", "737"))               # rebuild 조회 기간 (2년 + 1주)
+MAX_INCREMENTAL_DAYS = int(os.getenv("MARKET_STATE_MAX_DAYS", "10"))
+REBUILD_DAYS = int(os.getenv("MARKET_STATE_REBUILD_DAYS", "30"))       # 부동소수 누적 오차 초기화 주기
+
+STATE_VERSION = 2
+STATE_BARS = 261        # 52주 전략 봉 수 조건(260) + 1
+STATE_WEEKS = 64        # 60주선 + 직전 주 + 여유
+MA_WINDOW = 60
+BB_WINDOW = 20
+BB_K = 2
+EXTREME_WINDOW = 120
+RSI_PERIOD = 14
+WEEK_MA_WINDOW = 60
+WEEK_EXTREME_WINDOW = 52
+
+STATE_COLUMNS = ["code", "date", "close", "volume", "last_update"]
+
+CHECK_CHUNK_ROWS = 50000    # 재적재 행 비교 단위 (행 × STATE_BARS 비교 배열 크기 제한)
+
+
+def _days(dates):
+    """
+    날짜 → 1970-01-01 기준 일수 (int64)
+    """
+    return pd.to_datetime(dates).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def _week_label(days):
+    """
+    resample("W-SAT") 라벨 (해당 주 토요일), 1970-01-01 = 목요일
+    """
+    weekday = (days + 3) % 7
+    return days + (5 - weekday) % 7
+
+
+def _to_datetime(days):
+    days = np.asarray(days, dtype=np.int64)
+    out = days.astype("datetime64[D]").astype("datetime64[ns]")
+    return np.where(days >= 0, out, np.datetime64("NaT"))
+
+
+class IndicatorState:
+    """
+    종목별 상태 배열 + push (1 거래일) / 조회
+    """
+
+    FLOAT_FIELDS = [
+        "ref", "sum_ma", "sum_bb", "sq_bb", "gain", "loss", "wgain", "wloss",
+        "high", "low", "prev_ma", "prev_high", "prev_low", "last_volume",
+        "week_close", "week_volume",
+    ]
+    INT_FIELDS = ["pos", "loss_n", "wcount", "week_label", "week_last", "wpos"]
+
+    def __init__(self, codes=()):
+        self.codes = np.asarray(list(codes), dtype=object)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        n = len(self.codes)
+
+        self.close = np.full((n, STATE_BARS), np.nan)
+        self.volume = np.full((n, STATE_BARS), np.nan)
+        self.dates = np.full((n, STATE_BARS), -1, dtype=np.int64)
+        self.wclose = np.full((n, STATE_WEEKS), np.nan)
+        self.wvolume = np.full((n, STATE_WEEKS), np.nan)
+        self.wlabel = np.full((n, STATE_WEEKS), -1, dtype=np.int64)
+        self.wlast = np.full((n, STATE_WEEKS), -1, dtype=np.int64)
+
+        for name in self.FLOAT_FIELDS:
+            setattr(self, name, np.full(n, np.nan))
+        for name in self.INT_FIELDS:
+            setattr(self, name, np.zeros(n, dtype=np.int64))
+        self.week_label[:] = -1
+        self.week_last[:] = -1
+
+    # ------------------------------------------------------------------
+    # 구성
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, df):
+        """
+        code, date, close, volume DataFrame 전체를 거래일 순으로 push
+        """
+        state = cls()
+        state.apply(df)
+        return state
+
+    def apply(self, df):
+        """
+        거래일 순서대로 push, 반영한 거래일 수 반환
+        """
+        df = df.dropna(subset=["close"])
+        if df.empty:
+            return 0
+
+        days = _days(df["date"])
+        order = np.argsort(days, kind="stable")
+        days = days[order]
+        codes = df["code"].astype(str).to_numpy()[order]
+        close = df["close"].to_numpy(dtype=np.float64)[order]
+        volume = np.nan_to_num(df["volume"].to_numpy(dtype=np.float64)[order]) \
+            if "volume" in df.columns else np.zeros(len(df))
+
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        starts = np.concatenate([[0], bounds])
+        ends = np.concatenate([bounds, [len(days)]])
+        for lo, hi in zip(starts, ends):
+            self.push(codes[lo:hi], close[lo:hi], volume[lo:hi], int(days[lo]))
+        return len(starts)
+
+    def _rows(self, codes):
+        """
+        code → 행 번호 (신규 종목은 행 추가)
+        """
+        new = [c for c in dict.fromkeys(codes) if c not in self.index]
+        if new:
+            self._grow(new)
+        return np.fromiter((self.index[c] for c in codes), dtype=np.int64, count=len(codes))
+
+    def _grow(self, new):
+        grown = IndicatorState(new)
+        for name in ["close", "volume", "dates", "wclose", "wvolume", "wlabel", "wlast"] \
+                + self.FLOAT_FIELDS + self.INT_FIELDS:
+            setattr(self, name, np.concatenate([getattr(self, name), getattr(grown, name)]))
+        start = len(self.codes)
+        self.codes = np.concatenate([self.codes, grown.codes])
+        self.index.update({code: start + i for i, code in enumerate(new)})
+
+    # ------------------------------------------------------------------
+    # 1 거래일 반영
+    # ------------------------------------------------------------------
+    def _at(self, rows, pos, back):
+        """
+        종목별 back 봉 전 종가 (pos 기준, 없으면 NaN)
+        """
+        valid = pos >= back
+        return np.where(valid, self.close[rows, (pos - back) % STATE_BARS], np.nan)
+
+    def push(self, codes, close, volume, day):
+        rows = self._rows(codes)
+        pos = self.pos[rows]
+        ref = np.where(np.isnan(self.ref[rows]), close, self.ref[rows])
+        self.ref[rows] = ref
+
+        # 직전 봉 기준 지표 (prev_*)
+        self.prev_ma[rows] = self._ma(rows)
+        self.prev_high[rows] = np.where(pos >= EXTREME_WINDOW, self.high[rows], np.nan)
+        self.prev_low[rows] = np.where(pos >= EXTREME_WINDOW, self.low[rows], np.nan)
+
+        # rolling 합: 새 값 더하고 window 밖으로 나가는 값 빼기
+        dev = close - ref
+        out_ma = np.nan_to_num(self._at(rows, pos, MA_WINDOW) - ref)
+        out_bb = np.nan_to_num(self._at(rows, pos, BB_WINDOW) - ref)
+        self.sum_ma[rows] = np.nan_to_num(self.sum_ma[rows]) + dev - out_ma
+        self.sum_bb[rows] = np.nan_to_num(self.sum_bb[rows]) + dev - out_bb
+        self.sq_bb[rows] = np.nan_to_num(self.sq_bb[rows]) + dev * dev - out_bb * out_bb
+
+        # RSI: 봉 간 차이 (새 차이 추가, RSI_PERIOD 개 전 차이 제거)
+        prev_close = self._at(rows, pos, 1)
+        delta = close - prev_close
+        out_delta = self._at(rows, pos, RSI_PERIOD) - self._at(rows, pos, RSI_PERIOD + 1)
+        gain, loss = np.clip(np.nan_to_num(delta), 0, None), np.clip(-np.nan_to_num(delta), 0, None)
+        out_gain = np.clip(np.nan_to_num(out_delta), 0, None)
+        out_loss = np.clip(-np.nan_to_num(out_delta), 0, None)
+        self.gain[rows] = np.nan_to_num(self.gain[rows]) + gain - out_gain
+        self.loss[rows] = np.nan_to_num(self.loss[rows]) + loss - out_loss
+        self.loss_n[rows] += (loss > 0).astype(np.int64) - (out_loss > 0).astype(np.int64)
+
+        # Wilder 평활 (첫 차이부터 시작)
+        has_delta = ~np.isnan(delta)
+        first = has_delta & (self.wcount[rows] == 0)
+        alpha = 1.0 / RSI_PERIOD
+        self.wgain[rows] = np.where(first, gain, np.where(
+            has_delta, self.wgain[rows] + alpha * (gain - self.wgain[rows]), self.wgain[rows]))
+        self.wloss[rows] = np.where(first, loss, np.where(
+            has_delta, self.wloss[rows] + alpha * (loss - self.wloss[rows]), self.wloss[rows]))
+        self.wcount[rows] += has_delta
+
+        # ring buffer 기록
+        out_extreme = self._at(rows, pos, EXTREME_WINDOW)
+        slot = pos % STATE_BARS
+        self.close[rows, slot] = close
+        self.volume[rows, slot] = volume
+        self.dates[rows, slot] = day
+        self.pos[rows] = pos + 1
+        self.last_volume[rows] = volume
+
+        # 120봉 극값: 빠지는 값이 기존 극값이었고 새 값이 대체하지 못하면 재계산
+        high, low = self.high[rows], self.low[rows]
+        rescan = ((out_extreme == high) & (close < high)) | ((out_extreme == low) & (close > low))
+        self.high[rows] = np.fmax(high, close)
+        self.low[rows] = np.fmin(low, close)
+        if rescan.any():
+            sub = rows[rescan]
+            window = self._window(sub, EXTREME_WINDOW)
+            self.high[sub] = np.nanmax(window, axis=1)
+            self.low[sub] = np.nanmin(window, axis=1)
+
+        self._push_week(rows, close, volume, day)
+
+    def _push_week(self, rows, close, volume, day):
+        label = int(_week_label(np.int64(day)))
+        current = self.week_label[rows]
+        new_week = current != label
+
+        # 진행 중이던 주 → 완료 ring
+        done = rows[new_week & (current >= 0)]
+        if len(done):
+            slot = self.wpos[done] % STATE_WEEKS
+            self.wclose[done, slot] = self.week_close[done]
+            self.wvolume[done, slot] = self.week_volume[done]
+            self.wlabel[done, slot] = self.week_label[done]
+            self.wlast[done, slot] = self.week_last[done]
+            self.wpos[done] += 1
+
+        self.week_close[rows] = close
+        self.week_volume[rows] = np.where(new_week, volume, self.week_volume[rows] + volume)
+        self.week_label[rows] = label
+        self.week_last[rows] = day
+
+    def changed(self, df):
+        """
+        이미 반영한 기간에 다시 적재된 행 중 상태와 값(close / volume)이 다른 행 수
+        - 상태에 없는 (code, date) 는 변경으로 간주 (신규 종목 / ring 보다 오래된 봉 / 추가된 봉)
+        - close 가 비어 있고 상태에도 없는 행은 원래 반영하지 않은 행
+        """
+        changed = 0
+        for lo in range(0, len(df), CHECK_CHUNK_ROWS):
+            chunk = df.iloc[lo:lo + CHECK_CHUNK_ROWS]
+            codes = chunk["code"].astype(str).to_numpy()
+            close = chunk["close"].to_numpy(dtype=np.float64)
+            volume = np.nan_to_num(chunk["volume"].to_numpy(dtype=np.float64))
+            days = _days(chunk["date"])
+
+            known = np.fromiter((c in self.index for c in codes), dtype=bool, count=len(codes))
+            rows = np.fromiter((self.index.get(c, 0) for c in codes), dtype=np.int64, count=len(codes))
+
+            match = self.dates[rows] == days[:, None]
+            found = known & match.any(axis=1)
+            slot = match.argmax(axis=1)
+            same = found \
+                & (self.close[rows, slot] == close) \
+                & (np.nan_to_num(self.volume[rows, slot]) == volume)
+            skipped = ~found & np.isnan(close)
+            changed += int((~same & ~skipped).sum())
+        return changed
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def _window(self, rows, n):
+        """
+        종목별 최근 n 봉 (오른쪽 정렬, 부족분 NaN)
+        """
+        pos = self.pos[rows][:, None]
+        back = np.arange(n, 0, -1)[None, :]
+        values = self.close[rows[:, None], (pos - back) % STATE_BARS]
+        return np.where(pos >= back, values, np.nan)
+
+    def _ma(self, rows):
+        pos = self.pos[rows]
+        return np.where(pos >= MA_WINDOW, self.sum_ma[rows] / MA_WINDOW + self.ref[rows], np.nan)
+
+    def rows_since(self, start_date):
+        """
+        start_date 이후 종목별 봉 수 (최대 STATE_BARS)
+        """
+        start = int(_days([start_date])[0])
+        return pd.Series((self.dates >= start).sum(axis=1), index=self.codes)
+
+    def weeks_since(self, start_date):
+        start = int(_days([start_date])[0])
+        counts = (self.wlast >= start).sum(axis=1) + (self.week_last >= start)
+        return pd.Series(counts, index=self.codes)
+
+    def daily_last(self):
+        """
+        종목별 최근 봉 + 일봉 feature (screening_kr 일봉 feature 와 같은 컬럼)
+        """
+        rows = np.arange(len(self.codes))
+        pos = self.pos
+        last = self.close[rows, (pos - 1) % STATE_BARS]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_bb = self.sum_bb / BB_WINDOW
+            var_bb = (self.sq_bb - self.sum_bb * mean_bb) / (BB_WINDOW - 1)
+            std_bb = np.sqrt(np.clip(var_bb, 0, None))
+            mid = mean_bb + self.ref
+            has_bb = pos >= BB_WINDOW
+
+            has_rsi = pos > RSI_PERIOD
+            rs = self.gain / np.where(self.loss_n > 0, self.loss, np.nan)
+            has_wilder = self.wcount >= RSI_PERIOD
+            rsi_wilder = 100 * self.wgain / (self.wgain + self.wloss)
+
+        has_extreme = pos >= EXTREME_WINDOW
+        df = pd.DataFrame({
+            "date": _to_datetime(self.dates[rows, (pos - 1) % STATE_BARS]),
+            "close": last,
+            "volume": self.last_volume,
+            "prev_close": self._at(rows, pos, 2),
+            "ma60": self._ma(rows),
+            "prev_ma60": self.prev_ma,
+            "high120": np.where(has_extreme, self.high, np.nan),
+            "low120": np.where(has_extreme, self.low, np.nan),
+            "prev_high120": self.prev_high,
+            "prev_low120": self.prev_low,
+            "bb_upper": np.where(has_bb, mid + std_bb * BB_K, np.nan),
+            "bb_lower": np.where(has_bb, mid - std_bb * BB_K, np.nan),
+            "rsi": np.where(has_rsi, 100 - (100 / (1 + rs)), np.nan),
+            "rsi_wilder": np.where(has_wilder, rsi_wilder, np.nan),
+        }, index=pd.Index(self.codes, name="code"))
+        return df[pos > 0]
+
+    def weekly_last(self):
+        """
+        종목별 진행 중인 주 + 주봉 feature (52주 극값 / 60주선, 직전 주 값 포함)
+        """
+        rows = np.arange(len(self.codes))[:, None]
+        wpos = self.wpos[:, None]
+        back = np.arange(WEEK_MA_WINDOW, 0, -1)[None, :]
+        done = np.where(wpos >= back, self.wclose[rows, (wpos - back) % STATE_WEEKS], np.nan)
+        close = np.concatenate([done, self.week_close[:, None]], axis=1)
+
+        features = {
+            "high52": indicators.rolling_max(close, WEEK_EXTREME_WINDOW),
+            "low52": indicators.rolling_min(close, WEEK_EXTREME_WINDOW),
+            "ma60": indicators.rolling_mean(close, WEEK_MA_WINDOW),
+        }
+        df = pd.DataFrame({
+            "date": _to_datetime(self.week_label),
+            "close": self.week_close,
+            "volume": self.week_volume,
+            "last_date": _to_datetime(self.week_last),
+            "prev_close": close[:, -2],
+        }, index=pd.Index(self.codes, name="code"))
+        for name, panel in features.items():
+            df[name] = panel[:, -1]
+            df[f"prev_{name}"] = panel[:, -2]
+        return df[self.week_label >= 0]
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def save(self, path):
+        arrays = {name: getattr(self, name) for name in
+                  ["close", "volume", "dates", "wclose", "wvolume", "wlabel", "wlast"]
+                  + self.FLOAT_FIELDS + self.INT_FIELDS}
+        arrays["codes"] = self.codes.astype(str)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            state = cls()
+            state.codes = data["codes"].astype(object)
+            state.index = {code: i for i, code in enumerate(state.codes)}
+            for name in data.files:
+                if name != "codes":
+                    setattr(state, name, data[name])
+        return state
+
+
+class IndicatorStateStore:
+
+    def __init__(self, engine, table, state_dir):
+        self.engine = engine
+        self.table = table
+        self.dir = Path(state_dir) / table
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self.dir / "_manifest.json"
+        self._state_path = self.dir / "state.npz"
+
+    @classmethod
+    def from_env(cls, engine, table):
+        """
+        MARKET_STATE_DIR 미설정이면 None
+        """
+        if not STATE_DIR:
+            return None
+        return cls(engine, table, STATE_DIR)
+
+    @staticmethod
+    def params():
+        return {
+            "version": STATE_VERSION, "bars": STATE_BARS, "weeks": STATE_WEEKS,
+            "ma": MA_WINDOW, "bb": BB_WINDOW, "extreme": EXTREME_WINDOW, "rsi": RSI_PERIOD,
+        }
+
+    # ------------------------------------------------------------------
+    # 동기화
+    # ------------------------------------------------------------------
+    def sync(self, as_of):
+        """
+        as_of 까지 반영된 IndicatorState 반환 (증분 또는 rebuild)
+        """
+        as_of = pd.Timestamp(as_of).strftime("%Y-%m-%d")
+
+        with self._locked():
+            manifest = self._load_manifest()
+            reason = self._rebuild_reason(manifest, as_of)
+            if reason:
+                print(f"[STATE] {self.table} rebuild: {reason}")
+                return self._rebuild(as_of)
+
+            state = IndicatorState.load(self._state_path)
+            redelivered = self._redelivered(manifest)
+            changed = state.changed(redelivered)
+            if changed:
+                print(f"[STATE] {self.table} rebuild: 반영 기간 값 변경 {changed}행")
+                return self._rebuild(as_of)
+
+            if as_of == manifest["last_date"]:
+                if not redelivered.empty:
+                    self._save(state, manifest, redelivered, as_of)
+                return state
+
+            df = self._query(
+                "date > :start AND date <= :end",
+                {"start": manifest["last_date"], "end": as_of}
+            )
+            n_days = df["date"].nunique()
+            if n_days > MAX_INCREMENTAL_DAYS:
+                print(f"[STATE] {self.table} rebuild: 새 거래일 {n_days}일 > {MAX_INCREMENTAL_DAYS}")
+                return self._rebuild(as_of)
+
+            last_date = manifest["last_date"]
+            state.apply(df)
+            self._save(state, manifest, pd.concat([df, redelivered], ignore_index=True), as_of)
+            print(f"[STATE] {self.table} {last_date} → {as_of} ({n_days}일, {len(df)}행)")
+            return state
+
+    def rebuild(self, as_of):
+        with self._locked():
+            return self._rebuild(pd.Timestamp(as_of).strftime("%Y-%m-%d"))
+
+    def _rebuild_reason(self, manifest, as_of):
+        if manifest is None or not self._state_path.exists():
+            return "상태 없음"
+        if manifest.get("params") != self.params():
+            return "파라미터 변경"
+        if time.time() - manifest.get("built_at", 0) > REBUILD_DAYS * 86400:
+            return f"생성 후 {REBUILD_DAYS}일 경과"
+        if as_of < manifest["last_date"]:
+            return f"as_of {as_of} < last_date {manifest['last_date']}"
+        return None
+
+    def _redelivered(self, manifest):
+        """
+        이미 반영한 기간에 watermark 이후 다시 적재된 행 (값 비교 대상)
+        """
+        if not manifest.get("watermark"):
+            return pd.DataFrame(columns=STATE_COLUMNS)
+        return self._query(
+            "date BETWEEN :start AND :end AND last_update > :watermark",
+            {"start": manifest["first_date"], "end": manifest["last_date"], "watermark": manifest["watermark"]}
+        )
+
+    def _rebuild(self, as_of):
+        start = (pd.Timestamp(as_of) - pd.Timedelta(days=STATE_DAYS)).strftime("%Y-%m-%d")
+        df = self._query("date BETWEEN :start AND :end", {"start": start, "end": as_of})
+
+        state = IndicatorState.build(df)
+        manifest = {
+            "table": self.table,
+            "params": self.params(),
+            "first_date": start,
+            "last_date": as_of,
+            "watermark": None,
+            "built_at": time.time(),
+        }
+        self._save(state, manifest, df, as_of)
+        return state
+
+    def _save(self, state, manifest, df, as_of):
+        manifest["last_date"] = as_of
+        manifest["updated_at"] = time.time()
+        manifest["codes"] = len(state.codes)
+
+        if "last_update" in df.columns and df["last_update"].notna().any():
+            wm = pd.to_datetime(df["last_update"]).max().strftime("%Y-%m-%d %H:%M:%S")
+            if manifest.get("watermark") is None or wm > manifest["watermark"]:
+                manifest["watermark"] = wm
+
+        state.save(self._state_path)
+        self._save_manifest(manifest)
+
+    def _query(self, where, params):
+        sql = text(f"""
+            SELECT {", ".join(STATE_COLUMNS)}
+            FROM {self.table}
+            WHERE {where}
+        """)
+        df = fetch_frame(self.engine, sql, params)
+        df["date"] = pd.to_datetime(df["date"])
+        df["code"] = df["code"].astype(str)
+        return df
+
+    # ------------------------------------------------------------------
+    # 파일 / 잠금
+    # ------------------------------------------------------------------
+    def _load_manifest(self):
+        if not self._manifest_path.exists():
+            return None
+        with open(self._manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest):
+        tmp = self._manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp, self._manifest_path)
+
+    @contextmanager
+    def _locked(self):
+        with open(self.dir / "_lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+# ======================================================
+# CLI
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["sync", "rebuild"])
+    parser.add_argument("--table", default="daily_price_kr")
+    parser.add_argument("--as-of", default=datetime.now().strftime("%Y-%m-%d"))
+    parser.add_argument("--dir", default=STATE_DIR, help="상태 디렉터리 (기본: MARKET_STATE_DIR)")
+    args = parser.parse_args()
+
+    if not args.dir:
+        print("[STATE ERROR] MARKET_STATE_DIR 미설정 (--dir 지정)")
+        return 1
+
+    from API.engine import get_engine
+    store = IndicatorStateStore(get_engine(), args.table, args.dir)
+
+    if args.command == "rebuild":
+        state = store.rebuild(args.as_of)
+    else:
+        state = store.sync(args.as_of)
+
+    print(f"ROWCOUNT={len(state.codes)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""
+(codes × days) 패널 지표 — 전 종목을 NumPy 배열 연산으로 동시 계산
+
+입력: 2-D 배열, 행 = code, 열 = 시간 오름차순 (PricePanel.close 등), 결측 NaN
+- rolling_* : 최근 window 열 중 NaN 이 아닌 값만 사용
+              유효 값 수 >= min_periods (기본 window) 일 때만 계산, 나머지 NaN
+- ema / wilder : NaN 열은 건너뜀 (직전 상태 유지, 해당 열 결과는 NaN)
+                 유효 관측 수 >= min_periods 부터 값 (pandas ewm(adjust=False) 와 동일)
+
+달력 기준 패널(PricePanel)은 거래정지 구간도 윈도우에 포함됨
+→ 기존 per-code pandas 계산(groupby("code") 후 rolling)과 같은 "봉 기준" 윈도우가 필요하면
+  bars_from_frame() 으로 종목별 봉을 오른쪽 정렬한 패널을 만들어 사용
+  (마지막 열 = 종목별 최근 봉, [:, -2] = 직전 봉)
+
+검증: python -m API.indicators   (per-code pandas 계산과 비교)
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# rolling 윈도우 임시 배열 크기 제한 (종목 수 단위, 256 × 500일 × 120봉 ≈ 120MB)
+ROW_BLOCK = 256
+
+
+# ======================================================
+# 패널 구성
+# ======================================================
+def bars_from_frame(df, fields, min_bars=2):
+    """
+    code, date 정렬 long DataFrame → (codes, {field: (n_codes, n_bars) 배열})
+    - 종목별 봉을 오른쪽 정렬 (앞쪽은 NaN), 열 수는 최소 min_bars
+    """
+    codes, inverse = np.unique(df["code"].to_numpy(), return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(codes))
+    n_bars = max(int(counts.max()) if len(counts) else 0, min_bars)
+
+    # 종목 내 위치 (df 는 code, date 정렬 → 종목 행이 연속) → 종목 마지막 봉이 n_bars - 1 열
+    starts = np.cumsum(counts) - counts
+    pos = np.arange(len(df)) - starts[inverse]
+    cols = n_bars - counts[inverse] + pos
+
+    arrays = {}
+    for field in fields:
+        arr = np.full((len(codes), n_bars), np.nan)
+        arr[inverse, cols] = df[field].to_numpy(dtype=np.float64)
+        arrays[field] = arr
+    return codes, arrays
+
+
+def align_right(x):
+    """
+    행마다 NaN 이 아닌 값을 순서 유지한 채 오른쪽으로 정렬 (달력 패널 → 봉 패널)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    order = np.argsort(~np.isnan(x), axis=1, kind="stable")
+    return np.take_along_axis(x, order, axis=1)
+
+
+# ======================================================
+# rolling (NaN-aware)
+# ======================================================
+def _valid_count(x, window):
+    valid = (~np.isnan(x)).astype(np.int64)
+    cs = np.cumsum(valid, axis=1)
+    count = cs.copy()
+    count[:, window:] -= cs[:, :-window]
+    return count
+
+
+def _window_reduce(x, window, func, **kwargs):
+    """
+    (codes, days, window) 윈도우 view 에 func(axis=2) 적용 (앞쪽은 NaN 패딩)
+    - 윈도우별 직접 계산 → 횡보 구간 합/표준편차가 정확히 0
+      (누적합 차분 방식은 큰 가격대에서 1e-10 수준 잔차가 남아 "손실 0 → NaN" 판정이 어긋남)
+    - NaN 채운 임시 배열은 ROW_BLOCK 종목씩 나눠 생성
+    """
+    padded = np.concatenate([np.full((x.shape[0], window - 1), np.nan), x], axis=1)
+    view = sliding_window_view(padded, window, axis=1)
+
+    out = np.empty(x.shape)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for lo in range(0, x.shape[0], ROW_BLOCK):
+            out[lo:lo + ROW_BLOCK] = func(view[lo:lo + ROW_BLOCK], axis=2, **kwargs)
+    return out
+
+
+def _masked(result, count, min_periods):
+    result[count < min_periods] = np.nan
+    return result
+
+
+def rolling_sum(x, window, min_periods=None):
+    x = np.asarray(x, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+    return _masked(_window_reduce(x, window, np.nansum), _valid_count(x, window), min_periods)
+
+
+def rolling_mean(x, window, min_periods=None):
+    x = np.asarray(x, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+
+    count = _valid_count(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = _window_reduce(x, window, np.nansum) / count
+    return _masked(mean, count, min(max(min_periods, 1), window))
+
+
+def rolling_std(x, window, min_periods=None, ddof=1):
+    x = np.asarray(x, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+    std = _window_reduce(x, window, np.nanstd, ddof=ddof)
+    return _masked(std, _valid_count(x, window), max(min_periods, ddof + 1))
+
+
+def _rolling_extreme(x, window, min_periods, func, accumulate, fill):
+    x = np.asarray(x, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+
+    filled = np.where(np.isnan(x), fill, x)
+    out = np.empty(x.shape)
+
+    # 앞쪽 window-1 열은 누적 극값 (min_periods < window 인 경우만 살아남음)
+    head = min(window - 1, x.shape[1])
+    if head:
+        out[:, :head] = accumulate(filled[:, :head], axis=1)
+    if x.shape[1] >= window:
+        out[:, window - 1:] = func(sliding_window_view(filled, window, axis=1), axis=2)
+
+    return _masked(out, _valid_count(x, window), max(min_periods, 1))
+
+
+def rolling_max(x, window, min_periods=None):
+    return _rolling_extreme(x, window, min_periods, np.max, np.maximum.accumulate, -np.inf)
+
+
+def rolling_min(x, window, min_periods=None):
+    return _rolling_extreme(x, window, min_periods, np.min, np.minimum.accumulate, np.inf)
+
+
+# ======================================================
+# 지수 이동평균
+# ======================================================
+def _ewm(x, alpha, min_periods):
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    state = np.full(x.shape[0], np.nan)
+    count = np.zeros(x.shape[0], dtype=np.int64)
+
+    # 시간축(열)만 Python 루프, 종목 방향은 벡터 연산
+    for j in range(x.shape[1]):
+        col = x[:, j]
+        valid = ~np.isnan(col)
+        state = np.where(
+            valid,
+            np.where(np.isnan(state), col, state + alpha * (col - state)),
+            state
+        )
+        count += valid
+        out[:, j] = np.where(valid & (count >= min_periods), state, np.nan)
+
+    return out
+
+
+def ema(x, span, min_periods=1):
+    """
+    pandas ewm(span=span, adjust=False).mean() 과 동일
+    """
+    return _ewm(x, 2.0 / (span + 1.0), min_periods)
+
+
+def wilder(x, period, min_periods=None):
+    """
+    Wilder 평활 (alpha = 1/period) = pandas ewm(alpha=1/period, adjust=False)
+    """
+    return _ewm(x, 1.0 / period, period if min_periods is None else min_periods)
+
+
+# ======================================================
+# 지표
+# ======================================================
+def diff(x, periods=1):
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] > periods:
+        out[:, periods:] = x[:, periods:] - x[:, :-periods]
+    return out
+
+
+def shift(x, periods=1):
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] > periods:
+        out[:, periods:] = x[:, :-periods]
+    return out
+
+
+def rsi(close, period=14, method="simple"):
+    """
+    - simple : 단순 이동평균 (기존 compute_rsi 와 동일, 평균 손실 0 → NaN)
+    - wilder : Wilder 평활 (평균 손실 0 → 100)
+    """
+    delta = diff(close)
+    gain = np.where(np.isnan(delta), np.nan, np.clip(delta, 0, None))
+    loss = np.where(np.isnan(delta), np.nan, np.clip(-delta, 0, None))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method == "simple":
+            avg_gain = rolling_mean(gain, period)
+            avg_loss = rolling_mean(loss, period)
+            rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+            return 100 - (100 / (1 + rs))
+
+        if method == "wilder":
+            avg_gain = wilder(gain, period)
+            avg_loss = wilder(loss, period)
+            return 100 * avg_gain / (avg_gain + avg_loss)
+
+    raise ValueError(f"unknown rsi method: {method}")
+
+
+def bollinger(close, window=20, k=2.0):
+    """
+    (중심선, 상단, 하단)
+    """
+    mid = rolling_mean(close, window)
+    std = rolling_std(close, window)
+    return mid, mid + std * k, mid - std * k
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """
+    (macd, signal, histogram)
+    """
+    line = ema(close, fast) - ema(close, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+def true_range(high, low, close):
+    """
+    max(high - low, |high - 전일 종가|, |low - 전일 종가|) (첫 봉은 high - low)
+    """
+    prev = shift(close)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    tr = np.fmax(high - low, np.abs(high - prev))
+    return np.fmax(tr, np.abs(low - prev))
+
+
+def atr(high, low, close, period=14, method="wilder"):
+    tr = true_range(high, low, close)
+    if method == "wilder":
+        return wilder(tr, period)
+    if method == "simple":
+        return rolling_mean(tr, period)
+    raise ValueError(f"unknown atr method: {method}")
+
+
+# ======================================================
+# 검증 (per-code pandas 결과와 비교)
+# ======================================================
+def _self_check(n_codes=200, n_days=300, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    dates = pd.bdate_range("2023-01-02", periods=n_days)
+    for i in range(n_codes):
+        n = n_days if i % 5 else int(rng.integers(5, n_days))   # 신규 상장
+        close = np.round(rng.uniform(1000, 200000) * np.exp(np.cumsum(rng.normal(0, 0.02, n))))
+        if i % 9 == 0:
+            close[-n // 3:] = close[-n // 3]                   # 횡보 (std 0)
+        spread = rng.uniform(0, 0.03, n) * close
+        for d, c, s in zip(dates[-n:], close, spread):
+            rows.append((f"{i:06d}", d, c + s, c - s, c))
+    df = pd.DataFrame(rows, columns=["code", "date", "high", "low", "close"])
+
+    # 거래정지: 일부 종목 중간 봉 제거 (봉 기준 윈도우 검증)
+    df = df[~(df["code"].isin(["000003", "000007"]) & df["date"].between(dates[100], dates[130]))]
+    df = df.sort_values(["code", "date"]).reset_index(drop=True)
+
+    codes, m = bars_from_frame(df, ["high", "low", "close"])
+    g = df.groupby("code")
+
+    def compare(name, panel, func):
+        worst = 0.0
+        for i, (code, grp) in enumerate(g):
+            exp = func(grp).to_numpy(dtype=np.float64)
+            got = panel[i, -len(exp):]
+            np.testing.assert_allclose(got, exp, rtol=1e-9, atol=1e-6, equal_nan=True, err_msg=f"{name} {code}")
+            both = ~np.isnan(exp)
+            if both.any():
+                worst = max(worst, float(np.max(np.abs(got[both] - exp[both]))))
+        print(f"OK {name:<14} max_abs_err={worst:.2e}")
+
+    close = m["close"]
+    compare("rolling_mean", rolling_mean(close, 20), lambda x: x["close"].rolling(20).mean())
+    compare("rolling_std", rolling_std(close, 20), lambda x: x["close"].rolling(20).std())
+    compare("rolling_max", rolling_max(close, 120), lambda x: x["close"].rolling(120).max())
+    compare("rolling_min", rolling_min(close, 120), lambda x: x["close"].rolling(120).min())
+    compare("rolling_mean_mp", rolling_mean(close, 60, min_periods=5),
+            lambda x: x["close"].rolling(60, min_periods=5).mean())
+
+    def pandas_rsi(x, period=14):
+        delta = x["close"].diff()
+        gain = delta.clip(lower=0)
+        loss = -delta.clip(upper=0)
+        avg_gain = gain.rolling(window=period, min_periods=period).mean()
+        avg_loss = loss.rolling(window=period, min_periods=period).mean()
+        rs = avg_gain / avg_loss.replace(0, np.nan)
+        return 100 - (100 / (1 + rs))
+
+    def pandas_wilder_rsi(x, period=14):
+        delta = x["close"].diff()
+        avg_gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+        avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+        return 100 * avg_gain / (avg_gain + avg_loss)
+
+    compare("rsi_simple", rsi(close, 14), pandas_rsi)
+    compare("rsi_wilder", rsi(close, 14, method="wilder"), pandas_wilder_rsi)
+    compare("ema", ema(close, 12), lambda x: x["close"].ewm(span=12, adjust=False).mean())
+
+    def pandas_macd(x):
+        line = x["close"].ewm(span=12, adjust=False).mean() - x["close"].ewm(span=26, adjust=False).mean()
+        return line - line.ewm(span=9, adjust=False).mean()
+
+    compare("macd_hist", macd(close)[2], pandas_macd)
+
+    def pandas_atr(x, period=14):
+        prev = x["close"].shift(1)
+        tr = pd.concat([x["high"] - x["low"], (x["high"] - prev).abs(), (x["low"] - prev).abs()], axis=1).max(axis=1)
+        return tr.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+    compare("atr", atr(m["high"], m["low"], close, 14), pandas_atr)
+
+    # 달력 패널 (중간 NaN) : pandas rolling(min_periods) 과 같은 NaN-aware 결과
+    wide = df.pivot(index="date", columns="code", values="close")
+    got = rolling_mean(wide.to_numpy().T, 20, min_periods=15)
+    exp = wide.rolling(20, min_periods=15).mean().to_numpy().T
+    np.testing.assert_allclose(got, exp, rtol=1e-9, atol=1e-6, equal_nan=True)
+    got = rolling_max(wide.to_numpy().T, 20, min_periods=15)
+    exp = wide.rolling(20, min_periods=15).max().to_numpy().T
+    np.testing.assert_allclose(got, exp, equal_nan=True)
+    np.testing.assert_allclose(align_right(wide.to_numpy().T), close, equal_nan=True)
+    print("OK calendar_panel / align_right")
+
+    print(f"indicators self-check 통과 ({len(codes)} codes × {close.shape[1]} bars)")
+
+
+if __name__ == "__main__":
+    _self_check()
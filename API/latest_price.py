@@ -0,0 +1,233 @@
+"""
+종목별 최신 거래일 요약 테이블 (code → 최신 date / close / volume)
+
+get_comp_info_optimization / get_etf_info 의 활성 종목 조회는
+  "각 종목 MAX(date) 행의 volume > 0"
+을 correlated subquery 로 매번 계산함 → 요약 테이블 JOIN 으로 대체
+
+- refresh_latest_prices(): 요약 테이블의 최신 날짜 - LOOKBACK_DAYS 이후 일봉만 읽어 upsert
+  (첫 실행 시 전체 1회 적재, 이후 신규 거래일 + 최근 정정분만 반영)
+  → 일봉 적재 job 뒤의 갱신 job 에서만 실행 (BATCH_CODE/StockList/PriceSummaryUpdate{KR,US}.py)
+- load_universe(): 활성 종목 목록을 (최신 거래일, 해당일 MAX(last_update)) 기준으로 캐시 (조회 전용)
+    in-process : 같은 프로세스 내 MarketDB 재생성 시 재조회 없음
+    on-disk    : {MARKET_CACHE_DIR}/universe/{name}.json (MARKET_CACHE_DIR 설정 시)
+- 요약 테이블이 일봉 최신 거래일보다 뒤처졌거나 쓸 수 없으면 (갱신 전 / 미생성 / 권한 등)
+  기존 correlated 쿼리로 fallback
+
+CLI:
+    python -m API.latest_price [daily_price_kr ...] [--full]
+"""
+import os
+import sys
+import json
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+# 일봉 테이블 → 요약 테이블
+SUMMARY_TABLES = {
+    "daily_price_kr": "latest_price_kr",
+    "daily_price_us": "latest_price_us",
+    "etf_daily_price_kr": "etf_latest_price_kr",
+    "etf_daily_price_us": "etf_latest_price_us",
+}
+
+LOOKBACK_DAYS = int(os.getenv("LATEST_PRICE_LOOKBACK_DAYS", "7"))
+CACHE_DIR = os.getenv("MARKET_CACHE_DIR")
+
+SUMMARY_DDL = """
+CREATE TABLE IF NOT EXISTS {summary} (
+    code        VARCHAR(20) NOT NULL,
+    date        DATE        NOT NULL,
+    close       DOUBLE      NULL,
+    volume      BIGINT      NULL,
+    updated_at  TIMESTAMP   NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (code),
+    KEY idx_{summary}_volume (volume)
+) COMMENT '{price_table} 종목별 최신 거래일 요약'
+"""
+
+# 같은 code 가 다시 들어오면 더 최신(같은 날 정정 포함) 행일 때만 갱신
+# (MariaDB 는 SET 절을 왼쪽부터 평가 → date 는 마지막에 갱신)
+UPSERT_SQL = """
+INSERT INTO {summary} (code, date, close, volume)
+SELECT dp.code, dp.date, dp.close, dp.volume
+FROM {price_table} dp
+JOIN (
+    SELECT code, MAX(date) AS date
+    FROM {price_table}
+    WHERE date >= :since
+    GROUP BY code
+) m ON m.code = dp.code AND m.date = dp.date
+ON DUPLICATE KEY UPDATE
+    close  = IF(VALUES(date) >= {summary}.date, VALUES(close),  {summary}.close),
+    volume = IF(VALUES(date) >= {summary}.date, VALUES(volume), {summary}.volume),
+    date   = GREATEST({summary}.date, VALUES(date))
+"""
+
+_universe_memo = {}
+
+
+# ======================================================
+# 요약 테이블 갱신
+# ======================================================
+def refresh_latest_prices(engine, price_table, full=False):
+    """
+    요약 테이블 upsert, 반영 행 수 반환
+    """
+    summary = SUMMARY_TABLES[price_table]
+
+    with engine.begin() as conn:
+        conn.execute(text(SUMMARY_DDL.format(summary=summary, price_table=price_table)))
+
+        since = "1900-01-01"
+        if not full:
+            row = conn.execute(text(f"""
+                SELECT DATE_FORMAT(MAX(date) - INTERVAL {LOOKBACK_DAYS} DAY, '%Y-%m-%d')
+                FROM {summary}
+            """)).fetchone()
+            if row and row[0]:
+                since = row[0]
+
+        result = conn.execute(
+            text(UPSERT_SQL.format(summary=summary, price_table=price_table)),
+            {"since": since}
+        )
+        return result.rowcount
+
+
+# ======================================================
+# 활성 종목 목록 (per 거래일 캐시)
+# ======================================================
+def load_universe(engine, name, price_table, summary_sql, fallback_sql):
+    """
+    활성 종목 DataFrame(code, name) 반환
+    - name        : 캐시 구분용 이름 (예: 'stock_kr')
+    - summary_sql : 요약 테이블 JOIN 쿼리
+    - fallback_sql: 기존 correlated subquery 쿼리
+    """
+    try:
+        key = _universe_key(engine, price_table)
+    except Exception as e:
+        print(f"[MariaDB ERROR] load_universe({name}) key: {e}")
+        key = None
+
+    if key is not None:
+        cached = _universe_memo.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1].copy()
+
+        df = _read_disk(name, key)
+        if df is not None:
+            _universe_memo[name] = (key, df)
+            return df.copy()
+
+    df = None
+    try:
+        with engine.connect() as conn:
+            if _summary_fresh(conn, price_table, key):
+                df = pd.read_sql(text(summary_sql), conn)
+            else:
+                print(f"[INFO] load_universe({name}) {SUMMARY_TABLES[price_table]} 미갱신 → 기존 쿼리로 조회")
+    except Exception as e:
+        print(f"[MariaDB ERROR] load_universe({name}) summary: {e} → 기존 쿼리로 조회")
+
+    if df is None:
+        with engine.connect() as conn:
+            df = pd.read_sql(text(fallback_sql), conn)
+
+    df = df[["code", "name"]]
+    if key is not None and not df.empty:
+        _universe_memo[name] = (key, df)
+        _write_disk(name, key, df)
+
+    return df.copy()
+
+
+def _summary_fresh(conn, price_table, key):
+    """
+    요약 테이블 최신 날짜 >= 일봉 최신 거래일 (key 없으면 판단 불가 → False)
+    """
+    if key is None:
+        return False
+    latest = conn.execute(text(f"""
+        SELECT DATE_FORMAT(MAX(date), '%Y-%m-%d')
+        FROM {SUMMARY_TABLES[price_table]}
+    """)).scalar()
+    return latest is not None and latest >= key[0]
+
+
+def _universe_key(engine, price_table):
+    """
+    (최신 거래일, 해당일 MAX(last_update))
+    - 새 거래일 적재 / 같은 날 추가 적재·정정 모두 key 변경으로 감지
+    """
+    with engine.connect() as conn:
+        row = conn.execute(text(f"""
+            SELECT DATE_FORMAT(date, '%Y-%m-%d'), DATE_FORMAT(MAX(last_update), '%Y-%m-%d %H:%i:%s')
+            FROM {price_table}
+            WHERE date = (SELECT MAX(date) FROM {price_table})
+            GROUP BY date
+        """)).fetchone()
+
+    if not row:
+        return None
+    return [row[0], row[1]]
+
+
+def _disk_path(name):
+    if not CACHE_DIR:
+        return None
+    return Path(CACHE_DIR) / "universe" / f"{name}.json"
+
+
+def _read_disk(name, key):
+    path = _disk_path(name)
+    if path is None or not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get("key") != key:
+        return None
+    return pd.DataFrame(data["rows"], columns=["code", "name"])
+
+
+def _write_disk(name, key, df):
+    path = _disk_path(name)
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "rows": df.values.tolist()}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# ======================================================
+# CLI
+# ======================================================
+def main(tables=None, full=False):
+    """
+    요약 테이블 갱신 (일봉 적재 job 뒤에 실행), 반영 행 수 합계 반환
+    """
+    from API.engine import get_engine
+
+    engine = get_engine()
+    total = 0
+    for table in tables or list(SUMMARY_TABLES):
+        rows = refresh_latest_prices(engine, table, full=full)
+        total += rows
+        print(f"{SUMMARY_TABLES[table]} 갱신: {rows}건")
+
+    print(f"ROWCOUNT={total}")
+    return total
+
+
+if __name__ == "__main__":
+    main([a for a in sys.argv[1:] if not a.startswith("--")], full="--full" in sys.argv[1:])
@@ -0,0 +1,153 @@
+"""
+code × 거래일 가격 패널 (memory-mapped NumPy)
+
+{path}/
+    meta.json                              : codes, dates(YYYY-MM-DD), shape
+    open.npy / high.npy / low.npy / close.npy : float32 (n_codes, n_days), 결측 NaN
+    volume.npy                             : int64   (n_codes, n_days), 결측 0
+
+- load() 는 np.load(mmap_mode="r") 로 파일을 그대로 매핑 (복사 없음)
+  → 여러 전략 프로세스가 같은 page cache 를 공유
+- 행 = code (codes 순서), 열 = 거래일 (dates 오름차순)
+"""
+import os
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+VOLUME_FIELD = "volume"
+
+
+class PricePanel:
+
+    def __init__(self, codes, dates, arrays):
+        self.codes = list(codes)
+        self.dates = pd.DatetimeIndex(dates)
+        self.code_index = {code: i for i, code in enumerate(self.codes)}
+
+        self.open = arrays["open"]
+        self.high = arrays["high"]
+        self.low = arrays["low"]
+        self.close = arrays["close"]
+        self.volume = arrays["volume"]
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_frame(cls, df):
+        """
+        get_all_daily_prices() 형식의 long DataFrame → 패널
+        (code, date, open, high, low, close, volume)
+        """
+        dates = pd.to_datetime(df["date"]).dt.normalize()
+        code_cat = pd.Categorical(df["code"])
+        date_cat = pd.Categorical(dates)
+
+        ci = code_cat.codes
+        di = date_cat.codes
+        shape = (len(code_cat.categories), len(date_cat.categories))
+
+        arrays = {}
+        for field in PRICE_FIELDS:
+            arr = np.full(shape, np.nan, dtype=np.float32)
+            arr[ci, di] = df[field].to_numpy(dtype=np.float32)
+            arrays[field] = arr
+
+        vol = np.zeros(shape, dtype=np.int64)
+        vol[ci, di] = df[VOLUME_FIELD].fillna(0).to_numpy(dtype=np.int64)
+        arrays[VOLUME_FIELD] = vol
+
+        return cls(code_cat.categories, date_cat.categories, arrays)
+
+    # ------------------------------------------------------------------
+    # 저장 / 로딩
+    # ------------------------------------------------------------------
+    def save(self, path):
+        """
+        tmp 디렉터리에 쓴 뒤 교체 (읽는 쪽은 항상 완전한 패널만 봄)
+        """
+        path = Path(path)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+
+        for field in PRICE_FIELDS + (VOLUME_FIELD,):
+            np.save(tmp / f"{field}.npy", np.ascontiguousarray(getattr(self, field)))
+
+        meta = {
+            "codes": self.codes,
+            "dates": [d.strftime("%Y-%m-%d") for d in self.dates],
+            "shape": list(self.shape),
+        }
+        with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        old = None
+        if path.exists():
+            old = path.with_name(f"{path.name}.{os.getpid()}.old")
+            os.replace(path, old)
+        os.replace(tmp, path)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        path = Path(path)
+        with open(path / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        mode = "r" if mmap else None
+        arrays = {
+            field: np.load(path / f"{field}.npy", mmap_mode=mode)
+            for field in PRICE_FIELDS + (VOLUME_FIELD,)
+        }
+        return cls(meta["codes"], pd.to_datetime(meta["dates"]), arrays)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def rows(self, codes):
+        """
+        codes → 행 index 배열 (패널에 없는 code 는 제외)
+        """
+        return np.array(
+            [self.code_index[c] for c in codes if c in self.code_index],
+            dtype=np.int64
+        )
+
+    def date_slice(self, start_date=None, end_date=None):
+        """
+        [start_date, end_date] 에 해당하는 열 slice
+        """
+        lo = 0 if start_date is None else self.dates.searchsorted(pd.Timestamp(start_date), "left")
+        hi = len(self.dates) if end_date is None else self.dates.searchsorted(pd.Timestamp(end_date), "right")
+        return slice(lo, hi)
+
+    def to_frame(self, codes=None):
+        """
+        패널 → long DataFrame (code, date, open, high, low, close, volume), 결측 행 제외
+        """
+        idx = np.arange(len(self.codes)) if codes is None else self.rows(codes)
+
+        close = np.asarray(self.close[idx])
+        mask = ~np.isnan(close)
+        ci, di = np.nonzero(mask)
+
+        df = pd.DataFrame({
+            "code": np.asarray(self.codes, dtype=object)[idx[ci]],
+            "date": self.dates[di],
+        })
+        for field in PRICE_FIELDS:
+            df[field] = np.asarray(getattr(self, field)[idx])[mask]
+        df[VOLUME_FIELD] = np.asarray(self.volume[idx])[mask]
+        return df
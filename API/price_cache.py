@@ -0,0 +1,235 @@
+"""
+일봉 테이블 로컬 columnar 캐시 (Parquet, 월 단위 파일)
+
+{MARKET_CACHE_DIR}/{table}/
+    _manifest.json    : 캐시 범위(from/to), last_update watermark, 마지막 refresh 시각
+    _lock             : 프로세스 간 갱신 잠금 (fcntl)
+    2025-01.parquet   : 해당 월 전체 종목 일봉
+
+- MARKET_CACHE_DIR 가 설정되어 있고 pyarrow 가 있으면 MarketDB.get_all_daily_prices 가 자동 사용
+- refresh: 캐시 마지막 날짜 기준 REFRESH_LOOKBACK_DAYS 이내 중 last_update > watermark 인 행만 조회
+  (신규 거래일 + 최근 정정분). 그보다 오래된 정정은 rebuild() 로 재적재
+- 요청 시작일이 캐시 범위보다 앞이면 부족한 구간만 DB 에서 backfill (watermark 는 refresh 에서만 전진)
+- 반환 dtype 은 DB 직접 조회(API.fetch)와 동일 (date 는 datetime.date object)
+"""
+import os
+import json
+import time
+import fcntl
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+from API.fetch import fetch_frame
+
+try:
+    import pyarrow  # noqa: F401  (parquet 엔진)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+CACHE_DIR = os.getenv("MARKET_CACHE_DIR")
+REFRESH_TTL_SEC = int(os.getenv("MARKET_CACHE_TTL", "60"))
+REFRESH_LOOKBACK_DAYS = int(os.getenv("MARKET_CACHE_LOOKBACK_DAYS", "10"))
+
+
+class PriceCache:
+
+    def __init__(self, engine, table, columns, cache_dir):
+        """
+        columns: SELECT 컬럼 순서 그대로 (code, date, ..., last_update 포함)
+        """
+        self.engine = engine
+        self.table = table
+        self.columns = list(columns)
+        self.dir = Path(cache_dir) / table
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self.dir / "_manifest.json"
+
+    @classmethod
+    def from_env(cls, engine, table, columns):
+        """
+        캐시 비활성(MARKET_CACHE_DIR 미설정 / pyarrow 없음) 이면 None
+        """
+        if not CACHE_DIR:
+            return None
+        if not HAS_PYARROW:
+            print("⚠ MARKET_CACHE_DIR 설정됨 - pyarrow 미설치로 캐시 비활성")
+            return None
+        return cls(engine, table, columns, CACHE_DIR)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def read(self, start_date, end_date):
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+
+        with self._locked():
+            manifest = self._load_manifest()
+
+            if manifest is None:
+                manifest = self._initial_load(start)
+            else:
+                if start < pd.Timestamp(manifest["from"]):
+                    self._backfill(manifest, start)
+                self._refresh(manifest)
+
+        frames = [
+            pd.read_parquet(path)
+            for path in self._month_files(start, end)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+
+        df = pd.concat(frames, ignore_index=True)
+        df = df[(df["date"] >= start) & (df["date"] <= end)]
+        df = df.sort_values(["code", "date"]).reset_index(drop=True)[self.columns]
+
+        # DB 경로와 같은 datetime.date object 로 반환 (datetime64[D] → object 는 배열 단위 변환)
+        df["date"] = df["date"].to_numpy().astype("datetime64[D]").astype(object)
+        return df
+
+    def rebuild(self, start_date):
+        """
+        캐시 전체 재적재 (오래된 정정 반영용)
+        """
+        with self._locked():
+            for path in self.dir.glob("*.parquet"):
+                path.unlink()
+            if self._manifest_path.exists():
+                self._manifest_path.unlink()
+            self._initial_load(pd.Timestamp(start_date).normalize())
+
+    # ------------------------------------------------------------------
+    # 적재
+    # ------------------------------------------------------------------
+    def _initial_load(self, start):
+        df = self._query(
+            "date >= :start",
+            {"start": start.strftime("%Y-%m-%d")}
+        )
+        manifest = {
+            "from": start.strftime("%Y-%m-%d"),
+            "to": start.strftime("%Y-%m-%d"),
+            "watermark": None,
+            "refreshed_at": 0,
+        }
+        self._merge(df, manifest)
+        manifest["refreshed_at"] = time.time()
+        self._save_manifest(manifest)
+        return manifest
+
+    def _backfill(self, manifest, start):
+        cached_from = pd.Timestamp(manifest["from"])
+        df = self._query(
+            "date >= :start AND date < :cached_from",
+            {"start": start.strftime("%Y-%m-%d"), "cached_from": cached_from.strftime("%Y-%m-%d")}
+        )
+        manifest["from"] = start.strftime("%Y-%m-%d")
+        # 과거 구간 행의 last_update 로 watermark 를 올리면 아직 refresh 하지 않은 최근 행을 영영 건너뜀
+        self._merge(df, manifest, advance_watermark=False)
+        self._save_manifest(manifest)
+
+    def _refresh(self, manifest):
+        if time.time() - manifest.get("refreshed_at", 0) < REFRESH_TTL_SEC:
+            return
+
+        recent_from = pd.Timestamp(manifest["to"]) - timedelta(days=REFRESH_LOOKBACK_DAYS)
+        recent_from = max(recent_from, pd.Timestamp(manifest["from"]))
+
+        where = "date >= :recent_from"
+        params = {"recent_from": recent_from.strftime("%Y-%m-%d")}
+        if manifest.get("watermark"):
+            where += " AND last_update > :watermark"
+            params["watermark"] = manifest["watermark"]
+
+        df = self._query(where, params)
+        self._merge(df, manifest)
+        manifest["refreshed_at"] = time.time()
+        self._save_manifest(manifest)
+
+    def _query(self, where, params):
+        sql = text(f"""
+            SELECT {", ".join(self.columns)}
+            FROM {self.table}
+            WHERE {where}
+        """)
+        df = fetch_frame(self.engine, sql, params)
+
+        df["date"] = pd.to_datetime(df["date"]).dt.normalize()
+        if "last_update" in df.columns:
+            df["last_update"] = pd.to_datetime(df["last_update"])
+        return df
+
+    def _merge(self, df, manifest, advance_watermark=True):
+        """
+        조회 결과를 월 파일에 upsert (code, date 기준 최신 행 유지)
+        - advance_watermark: last_update watermark 전진 여부 (backfill 은 False)
+        """
+        if df.empty:
+            return
+
+        for month, part in df.groupby(df["date"].dt.strftime("%Y-%m")):
+            path = self.dir / f"{month}.parquet"
+            if path.exists():
+                part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+                part = part.drop_duplicates(["code", "date"], keep="last")
+
+            part = part.sort_values(["code", "date"]).reset_index(drop=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            part.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+
+        max_date = df["date"].max()
+        if max_date > pd.Timestamp(manifest["to"]):
+            manifest["to"] = max_date.strftime("%Y-%m-%d")
+
+        if advance_watermark and "last_update" in df.columns and df["last_update"].notna().any():
+            wm = df["last_update"].max().strftime("%Y-%m-%d %H:%M:%S")
+            if manifest.get("watermark") is None or wm > manifest["watermark"]:
+                manifest["watermark"] = wm
+
+    # ------------------------------------------------------------------
+    # 파일 / 잠금
+    # ------------------------------------------------------------------
+    def _month_files(self, start, end):
+        months = pd.period_range(start.to_period("M"), end.to_period("M"), freq="M")
+        paths = [self.dir / f"{m.strftime('%Y-%m')}.parquet" for m in months]
+        return [p for p in paths if p.exists()]
+
+    def _load_manifest(self):
+        if not self._manifest_path.exists():
+            return None
+        with open(self._manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest):
+        tmp = self._manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp, self._manifest_path)
+
+    @contextmanager
+    def _locked(self):
+        with open(self.dir / "_lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def rebuild_cache(db, start_date=None):
+    """
+    MarketDB 인스턴스의 캐시 전체 재적재 (기본: 2년)
+    """
+    if db.price_cache is None:
+        print("⚠ 캐시 비활성 (MARKET_CACHE_DIR 미설정)")
+        return
+    if start_date is None:
+        start_date = (datetime.today() - timedelta(days=730)).strftime("%Y-%m-%d")
+    db.price_cache.rebuild(start_date)
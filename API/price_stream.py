@@ -0,0 +1,299 @@
+"""
+일봉 테이블 스트리밍 조회 (server-side cursor, 메모리 절약형 dtype)
+
+- stream_results=True → PyMySQL SSCursor 로 행을 받는 즉시 chunk 단위 처리
+  (전체 결과를 클라이언트 메모리에 올리지 않음)
+- 컬럼 projection: 필요한 컬럼만 SELECT (code, date 는 항상 포함)
+- compact dtype
+    code           : category
+    date           : datetime64 (chunk 당 1회 변환)
+    open/high/low/close : float32
+    diff           : int32
+    volume         : int64 (int32 범위 초과 종목 존재)
+- iter_code_frames(): ORDER BY code, date 결과를 종목 단위 DataFrame 으로 재조립
+  → 전략은 마지막 행 도착 전부터 종목별 계산 시작 가능
+- codes 지정 시 CODE_BATCH_SIZE 개씩 정렬된 IN 목록으로 SQL 에 push-down
+  (batch 간에도 code 순서 유지 → iter_code_frames 그대로 사용 가능)
+- read_last_bars(): 종목별 최근 n 개 봉을 서버에서 ROW_NUMBER() 로 잘라 조회 (prev_close 포함)
+- read_bar_counts(): 기간 내 종목별 봉 수만 조회 (일봉 행을 받지 않고 "최소 봉 수" 조건 확인)
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sqlalchemy import text, bindparam
+
+from API.fetch import fetch_frame
+
+STREAM_CHUNK_ROWS = int(os.getenv("MARKET_STREAM_CHUNK_ROWS", "200000"))
+CODE_BATCH_SIZE = int(os.getenv("MARKET_CODE_BATCH_SIZE", "1000"))
+
+# get_last_n_bars 스캔 범위: as_of 기준 (n + LAST_BARS_LOOKBACK) 거래일 (거래정지 종목 여유분)
+LAST_BARS_LOOKBACK = int(os.getenv("MARKET_LAST_BARS_LOOKBACK", "10"))
+
+KEY_COLUMNS = ["code", "date"]
+
+COMPACT_DTYPES = {
+    "open": np.float32,
+    "high": np.float32,
+    "low": np.float32,
+    "close": np.float32,
+    "diff": np.int32,
+    "volume": np.int64,
+}
+
+
+def project_columns(available, columns=None):
+    """
+    요청 컬럼 검증 + code, date 선두 고정
+    (SQL 에 그대로 들어가므로 테이블 컬럼 목록 밖의 이름은 거부)
+    """
+    if columns is None:
+        return [c for c in available if c != "last_update"]
+
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise ValueError(f"unknown price columns: {unknown}")
+
+    return KEY_COLUMNS + [c for c in columns if c not in KEY_COLUMNS]
+
+
+def compact_frame(df):
+    """
+    get_all_daily_prices 형식 DataFrame → compact dtype (복사본 반환)
+    """
+    df = df.copy()
+    if "code" in df.columns:
+        df["code"] = df["code"].astype("category")
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"])
+    if "last_update" in df.columns:
+        df["last_update"] = pd.to_datetime(df["last_update"])
+
+    for col, dtype in COMPACT_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if np.issubdtype(dtype, np.integer):
+            df[col] = df[col].fillna(0)
+        df[col] = df[col].astype(dtype)
+
+    return df
+
+
+def price_sql(table, columns, with_codes=False):
+    """
+    기간(+ code IN) 조회 SQL
+    """
+    where = "date BETWEEN :start AND :end"
+    if with_codes:
+        where += " AND code IN :codes"
+
+    sql = text(f"""
+        SELECT {", ".join(columns)}
+        FROM {table}
+        WHERE {where}
+        ORDER BY code, date
+    """)
+    if with_codes:
+        sql = sql.bindparams(bindparam("codes", expanding=True))
+    return sql
+
+
+def code_batches(codes):
+    """
+    codes → 정렬된 CODE_BATCH_SIZE 단위 list
+    """
+    codes = sorted({str(c) for c in codes})
+    for i in range(0, len(codes), CODE_BATCH_SIZE):
+        yield codes[i:i + CODE_BATCH_SIZE]
+
+
+def read_prices(engine, table, columns, start_date, end_date, codes=None):
+    """
+    기간 내 일봉 1회 조회 (codes 지정 시 batch IN push-down)
+    - typed column fetch (API.fetch) 사용
+    """
+    params = {"start": start_date, "end": end_date}
+
+    if codes is None:
+        return fetch_frame(engine, price_sql(table, columns), params)
+
+    sql = price_sql(table, columns, with_codes=True)
+    frames = [
+        fetch_frame(engine, sql, {**params, "codes": batch})
+        for batch in code_batches(codes)
+    ]
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def last_bars_sql(table, columns, with_codes=False):
+    """
+    종목별 최근 :n 개 봉 SQL (window function, MariaDB 10.2+)
+    - prev_close : 직전 봉 종가 (LAG) → 각 종목 첫 행도 기간 내 직전 봉 기준으로 채워짐
+    """
+    where = "date BETWEEN :start AND :end"
+    if with_codes:
+        where += " AND code IN :codes"
+
+    select = ", ".join(columns)
+    sql = text(f"""
+        SELECT {select}, prev_close
+        FROM (
+            SELECT {select},
+                   LAG(close) OVER (PARTITION BY code ORDER BY date) AS prev_close,
+                   ROW_NUMBER() OVER (PARTITION BY code ORDER BY date DESC) AS rn
+            FROM {table}
+            WHERE {where}
+        ) t
+        WHERE rn <= :n
+        ORDER BY code, date
+    """)
+    if with_codes:
+        sql = sql.bindparams(bindparam("codes", expanding=True))
+    return sql
+
+
+def read_last_bars(engine, table, columns, start_date, end_date, n, codes=None):
+    """
+    [start_date, end_date] 안에서 종목별 최근 n 개 봉 + prev_close
+    - start_date 는 n + 여유 거래일 이전으로 잡아야 함 (window 범위 = 스캔 범위)
+    """
+    if "close" not in columns:
+        columns = columns + ["close"]
+    params = {"start": start_date, "end": end_date, "n": int(n)}
+
+    if codes is None:
+        df = fetch_frame(engine, last_bars_sql(table, columns), params)
+    else:
+        sql = last_bars_sql(table, columns, with_codes=True)
+        frames = [
+            fetch_frame(engine, sql, {**params, "codes": batch})
+            for batch in code_batches(codes)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=columns + ["prev_close"])
+        df = pd.concat(frames, ignore_index=True)
+
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+def read_bar_counts(engine, table, start_date, end_date, codes=None):
+    """
+    기간 내 종목별 일봉 수 (Series, index=code) — (date, code) 인덱스만 읽음
+    """
+    where = "date BETWEEN :start AND :end"
+    if codes is not None:
+        where += " AND code IN :codes"
+
+    sql = text(f"""
+        SELECT code, COUNT(*) AS bars
+        FROM {table}
+        WHERE {where}
+        GROUP BY code
+    """)
+    params = {"start": start_date, "end": end_date}
+
+    if codes is None:
+        df = fetch_frame(engine, sql, params)
+    else:
+        sql = sql.bindparams(bindparam("codes", expanding=True))
+        frames = [fetch_frame(engine, sql, {**params, "codes": batch}) for batch in code_batches(codes)]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["code", "bars"])
+
+    return pd.Series(
+        df["bars"].to_numpy(dtype=np.int64), index=df["code"].astype(str).to_numpy(), name="bars"
+    )
+
+
+def filter_prices(df, codes=None, columns=None):
+    """
+    캐시 등 이미 받아둔 DataFrame 에 codes / columns 조건 적용
+    """
+    if codes is not None:
+        df = df[df["code"].isin({str(c) for c in codes})].reset_index(drop=True)
+    if columns is not None:
+        df = df[columns]
+    return df
+
+
+def pivot_prices(df, dates, fields=("close", "volume")):
+    """
+    long DataFrame → {field: DataFrame(index=거래일, columns=code)}
+    - dates 로 reindex (해당 종목 거래 없는 날은 NaN)
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(list(dates)), name="date")
+    return {
+        field: df.pivot(index="date", columns="code", values=field).reindex(index)
+        for field in fields
+    }
+
+
+def iter_chunks(engine, table, columns, start_date, end_date,
+                chunksize=STREAM_CHUNK_ROWS, codes=None):
+    """
+    server-side cursor 로 기간 내 일봉을 chunk(DataFrame) 단위로 yield
+    """
+    params = {"start": start_date, "end": end_date}
+
+    if codes is None:
+        queries = [(price_sql(table, columns), params)]
+    else:
+        sql = price_sql(table, columns, with_codes=True)
+        queries = [(sql, {**params, "codes": batch}) for batch in code_batches(codes)]
+
+    with engine.connect().execution_options(stream_results=True) as conn:
+        for sql, query_params in queries:
+            for chunk in pd.read_sql(sql, conn, params=query_params, chunksize=chunksize):
+                yield compact_frame(chunk)
+
+
+def iter_code_frames(chunks):
+    """
+    (code, DataFrame) 단위로 재조립
+    - chunk 경계에 걸친 종목은 다음 chunk 와 합친 뒤 내보냄
+    - 입력이 code 순 정렬되어 있어야 함 (iter_chunks 는 ORDER BY code, date)
+    """
+    carry = None
+
+    for chunk in chunks:
+        if carry is not None:
+            chunk = concat_chunks([carry, chunk])
+        if chunk.empty:
+            continue
+
+        codes = chunk["code"].astype(str).to_numpy()
+        last_code = codes[-1]
+
+        # 마지막 종목은 다음 chunk 에 이어질 수 있으므로 보류
+        # (DB collation 순서와 Python 문자열 순서가 다를 수 있어 뒤에서부터 탐색)
+        differs = codes[::-1] != last_code
+        tail_start = len(codes) - int(np.argmax(differs)) if differs.any() else 0
+        carry = chunk.iloc[tail_start:]
+        done = chunk.iloc[:tail_start]
+
+        for code, group in done.groupby(codes[:tail_start], sort=False):
+            yield code, group.reset_index(drop=True)
+
+    if carry is not None and not carry.empty:
+        yield str(carry["code"].iloc[0]), carry.reset_index(drop=True)
+
+
+def concat_chunks(chunks):
+    """
+    chunk 목록 → 하나의 DataFrame (code category 유지)
+    """
+    chunks = [c for c in chunks if c is not None and not c.empty]
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+
+    codes = union_categoricals([c["code"] for c in chunks])
+    df = pd.concat([c.drop(columns="code") for c in chunks], ignore_index=True)
+    df.insert(0, "code", codes)
+    return df
@@ -0,0 +1,194 @@
+"""
+MarketDB 쿼리 프로파일러 (MARKET_PROFILE 설정 시에만 동작)
+
+MARKET_PROFILE=/path/to/profile.jsonl
+MARKET_PROFILE_SLOW_MS=1000      # 이 이상 걸린 SELECT 는 EXPLAIN 결과 함께 기록
+
+기록 (1 쿼리 = 1 줄 JSON)
+    ts / script(실행 중인 전략 스크립트) / caller(MarketDB 메서드 위치)
+    fingerprint(리터럴 제거한 SQL 해시) / sql / params(긴 list 는 건수만)
+    elapsed_ms / rows / approx_bytes(rows × 컬럼 최대 길이 합) / explain
+
+- get_engine() 이 만드는 engine 에 SQLAlchemy cursor 이벤트로 자동 연결
+- API.fetch 의 raw cursor 경로는 record() 를 직접 호출
+- 기록 실패는 쿼리 실행에 영향 없음 ([PROFILE ERROR] 출력만)
+
+집계 예:
+    jq -r '[.script, .fingerprint, .elapsed_ms] | @tsv' profile.jsonl
+"""
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+
+from sqlalchemy import event
+
+PROFILE_PATH = os.getenv("MARKET_PROFILE")
+SLOW_MS = float(os.getenv("MARKET_PROFILE_SLOW_MS", "1000"))
+
+_API_DIR = os.path.dirname(os.path.abspath(__file__))
+_SKIP_FILES = {
+    os.path.join(_API_DIR, name)
+    for name in ("fetch.py", "price_stream.py", "profiler.py", "engine.py")
+}
+_SKIP_PACKAGES = (os.sep + "sqlalchemy" + os.sep, os.sep + "pandas" + os.sep, os.sep + "pymysql" + os.sep)
+
+_write_lock = threading.Lock()
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,?)+\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def enabled():
+    return bool(PROFILE_PATH)
+
+
+def install(engine):
+    """
+    engine 에 cursor 이벤트 연결 (중복 연결 방지)
+    """
+    if not enabled() or getattr(engine, "_market_profiler", False):
+        return engine
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    engine._market_profiler = True
+    return engine
+
+
+# ======================================================
+# SQLAlchemy 이벤트
+# ======================================================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_profile_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get("_profile_start")
+    if not stack:
+        return
+    elapsed = time.perf_counter() - stack.pop()
+
+    # server-side cursor 는 execute 시점에 행 수를 알 수 없음
+    rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+
+    record(
+        conn.engine, statement, parameters, elapsed,
+        rows=rows, description=cursor.description, executemany=executemany
+    )
+
+
+# ======================================================
+# 기록
+# ======================================================
+def record(engine, statement, parameters, elapsed, rows=None, description=None, executemany=False):
+    if not enabled():
+        return
+    try:
+        elapsed_ms = round(elapsed * 1000, 2)
+        entry = {
+            "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "script": _script_name(),
+            "caller": _caller(),
+            "fingerprint": fingerprint(statement),
+            "sql": _SPACE_RE.sub(" ", statement).strip()[:2000],
+            "params": _summarize(parameters, executemany),
+            "elapsed_ms": elapsed_ms,
+            "rows": rows,
+            "approx_bytes": _approx_bytes(rows, description),
+        }
+        if elapsed_ms >= SLOW_MS and statement.lstrip()[:6].upper() == "SELECT" and not executemany:
+            entry["explain"] = _explain(engine, statement, parameters)
+
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with _write_lock:
+            with open(PROFILE_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    except Exception as e:
+        print(f"[PROFILE ERROR] {e}")
+
+
+def fingerprint(statement):
+    """
+    리터럴 / IN 목록 / 공백 정규화 후 해시 (같은 쿼리 패턴 = 같은 fingerprint)
+    """
+    sql = _STRING_RE.sub("?", statement)
+    sql = _IN_LIST_RE.sub("IN (?)", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _SPACE_RE.sub(" ", sql).strip().lower()
+    return hashlib.md5(sql.encode("utf-8")).hexdigest()[:12]
+
+
+def _explain(engine, statement, parameters):
+    """
+    별도 raw connection 에서 EXPLAIN 실행 (원래 cursor 가 streaming 중이어도 안전)
+    """
+    if engine.dialect.name not in ("mysql", "mariadb"):
+        return None
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("EXPLAIN " + statement, parameters)
+        names = [d[0] for d in cursor.description]
+        plan = [dict(zip(names, row)) for row in cursor.fetchall()]
+        cursor.close()
+        return plan
+    except Exception as e:
+        return f"EXPLAIN 실패: {e}"
+    finally:
+        raw.close()
+
+
+def _approx_bytes(rows, description):
+    if rows is None or not description:
+        return None
+    width = sum((d[3] or 0) for d in description)
+    return rows * width if width else None
+
+
+def _summarize(parameters, executemany):
+    if executemany:
+        return {"executemany": len(parameters)}
+    if isinstance(parameters, dict):
+        items = parameters.items()
+    elif isinstance(parameters, (list, tuple)):
+        items = enumerate(parameters)
+    else:
+        return parameters
+
+    # IN 목록으로 펼쳐진 수천 개 code 는 건수만 남김
+    summary = {}
+    for key, value in items:
+        if isinstance(value, (list, tuple, set)):
+            summary[str(key)] = f"<{len(value)} values>"
+        else:
+            summary[str(key)] = value
+    if len(summary) > 20:
+        return {"count": len(summary), "first": dict(list(summary.items())[:5])}
+    return summary
+
+
+def _script_name():
+    main = sys.modules.get("__main__")
+    path = getattr(main, "__file__", None) or (sys.argv[0] if sys.argv else "")
+    return os.path.basename(path) or None
+
+
+def _caller():
+    """
+    SQLAlchemy / pandas / API 내부 helper 를 벗어난 첫 호출 위치 (예: AnalyzeKR.py:get_all_daily_prices:231)
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename not in _SKIP_FILES and not any(p in filename for p in _SKIP_PACKAGES):
+            return f"{os.path.basename(filename)}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
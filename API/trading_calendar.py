@@ -0,0 +1,147 @@
+"""
+거래일 캘린더 (일봉 테이블의 DISTINCT date 기준)
+
+- 최초 1회 DISTINCT date 전체 조회 → 이후 마지막 거래일 이후 날짜만 추가 조회
+- MARKET_CACHE_DIR 설정 시 {MARKET_CACHE_DIR}/calendar/{table}.json 에 저장
+  → 새 프로세스도 증분 조회 1회로 시작
+- 같은 프로세스 내에서는 CALENDAR_TTL 초 동안 DB 재확인 없이 재사용
+- 날짜는 'YYYY-MM-DD' 문자열 정렬 리스트 → 모든 조회는 bisect O(log n)
+"""
+import os
+import json
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+CACHE_DIR = os.getenv("MARKET_CACHE_DIR")
+CALENDAR_TTL_SEC = int(os.getenv("MARKET_CALENDAR_TTL", "60"))
+
+_calendars = {}
+
+
+def _to_str(date):
+    if isinstance(date, str) and len(date) == 10 and date[4] == "-" and date[7] == "-":
+        return date
+    return pd.Timestamp(date).strftime("%Y-%m-%d")
+
+
+class TradingCalendar:
+
+    def __init__(self, dates):
+        self.dates = sorted(set(dates))
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def last(self):
+        return self.dates[-1] if self.dates else None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def is_trading_day(self, date):
+        date = _to_str(date)
+        i = bisect_left(self.dates, date)
+        return i < len(self.dates) and self.dates[i] == date
+
+    def latest_on_or_before(self, date):
+        """
+        date 이하 가장 최근 거래일 (없으면 None)
+        """
+        i = bisect_right(self.dates, _to_str(date))
+        return self.dates[i - 1] if i else None
+
+    def offset(self, date, n):
+        """
+        date 기준 n 거래일 이동 (date 가 휴일이면 직전 거래일 기준)
+        - n < 0 : 과거, n > 0 : 미래 (범위 밖이면 None)
+        """
+        i = bisect_right(self.dates, _to_str(date)) - 1
+        j = i + n
+        if i < 0 or j < 0 or j >= len(self.dates):
+            return None
+        return self.dates[j]
+
+    def range(self, start_date, end_date):
+        """
+        [start_date, end_date] 거래일 리스트
+        """
+        lo = bisect_left(self.dates, _to_str(start_date))
+        hi = bisect_right(self.dates, _to_str(end_date))
+        return self.dates[lo:hi]
+
+    # ------------------------------------------------------------------
+    # 적재 / 증분 갱신
+    # ------------------------------------------------------------------
+    def extend(self, dates):
+        new = sorted(d for d in set(dates) if self.last is None or d > self.last)
+        self.dates.extend(new)
+        return len(new)
+
+    def refresh(self, engine, price_table):
+        """
+        마지막 거래일 이후 날짜만 DB 에서 추가
+        """
+        sql = f"SELECT DISTINCT DATE_FORMAT(date, '%Y-%m-%d') FROM {price_table}"
+        params = {}
+        if self.last is not None:
+            sql += " WHERE date > :last"
+            params["last"] = self.last
+
+        with engine.connect() as conn:
+            rows = conn.execute(text(sql), params).fetchall()
+
+        return self.extend(row[0] for row in rows)
+
+
+def get_calendar(engine, price_table):
+    """
+    테이블별 거래일 캘린더 (프로세스 내 공유 + disk cache)
+    """
+    now = time.monotonic()
+    entry = _calendars.get(price_table)
+    if entry is not None and now - entry[1] < CALENDAR_TTL_SEC:
+        return entry[0]
+
+    calendar = entry[0] if entry is not None else _read_disk(price_table)
+    if calendar is None:
+        calendar = TradingCalendar([])
+
+    if calendar.refresh(engine, price_table):
+        _write_disk(price_table, calendar)
+
+    _calendars[price_table] = (calendar, now)
+    return calendar
+
+
+def _disk_path(price_table):
+    if not CACHE_DIR:
+        return None
+    return Path(CACHE_DIR) / "calendar" / f"{price_table}.json"
+
+
+def _read_disk(price_table):
+    path = _disk_path(price_table)
+    if path is None or not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return TradingCalendar(json.load(f)["dates"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_disk(price_table, calendar):
+    path = _disk_path(price_table)
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"dates": calendar.dates}, f)
+    os.replace(tmp, path)
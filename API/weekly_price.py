@@ -0,0 +1,281 @@
+"""
+주봉 테이블 (daily_price_kr → weekly_price_kr, daily_price_us → weekly_price_us)
+
+주봉 전략은 종목마다 resample("W-SAT") 을 컬럼별로 호출해 매일 일봉에서 주봉을 다시 만듦
+→ 전 종목 주봉을 정렬 1회 + reduceat 으로 집계해 테이블에 저장, 일봉 적재 후 증분 갱신
+
+주 구분: week = 해당 주 토요일 (resample("W-SAT") 라벨과 동일, 일~토)
+         거래일(월~금) 기준으로는 ISO 주(월~일)와 같은 묶음
+컬럼   : code, week, first_date, last_date, open, high, low, close, volume, bars(거래일 수)
+
+- refresh_weekly_prices(): 주봉 테이블 MAX(last_date) - LOOKBACK_DAYS 가 속한 주부터 재집계해 교체
+  (신규 거래일 + 최근 정정분, 첫 실행 / --full 은 종목 batch 단위 전체 적재)
+  → 일봉 적재 job 뒤의 갱신 job 에서만 실행 (BATCH_CODE/StockList/PriceSummaryUpdate{KR,US}.py)
+- read_weekly_prices(): 기간 안에 거래일이 있는 주 (last_date >= start)
+  end 가 주 중간이면 마지막 주는 일봉에서 end 까지로 재집계
+- MarketDB.get_weekly_prices() 는 조회 전용: 주봉 테이블이 일봉 최신 거래일보다 뒤처져 있으면
+  (갱신 전 / 미생성) 테이블에 쓰지 않고 일봉에서 build_weekly_bars() 로 직접 집계
+
+CLI:
+    python -m API.weekly_price [daily_price_kr ...] [--full]
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text, bindparam, inspect
+
+from API.fetch import fetch_frame
+from API.price_stream import read_prices, code_batches
+
+# 일봉 테이블 → 주봉 테이블
+WEEKLY_TABLES = {
+    "daily_price_kr": "weekly_price_kr",
+    "daily_price_us": "weekly_price_us",
+}
+
+LOOKBACK_DAYS = int(os.getenv("WEEKLY_PRICE_LOOKBACK_DAYS", "7"))
+
+DAILY_COLUMNS = ["code", "date", "open", "high", "low", "close", "volume"]
+WEEKLY_COLUMNS = ["code", "week", "first_date", "last_date", "open", "high", "low", "close", "volume", "bars"]
+DATE_COLUMNS = ["week", "first_date", "last_date"]
+
+WEEKLY_DDL = """
+CREATE TABLE IF NOT EXISTS {weekly} (
+    code        VARCHAR(20) NOT NULL,
+    week        DATE        NOT NULL,
+    first_date  DATE        NOT NULL,
+    last_date   DATE        NOT NULL,
+    open        DOUBLE      NULL,
+    high        DOUBLE      NULL,
+    low         DOUBLE      NULL,
+    close       DOUBLE      NULL,
+    volume      BIGINT      NULL,
+    bars        TINYINT     NOT NULL,
+    updated_at  TIMESTAMP   NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (code, week),
+    KEY idx_{weekly}_week_code (week, code)
+) COMMENT '{price_table} 주봉 (W-SAT)'
+"""
+
+# DELETE 후 INSERT 지만, 같은 구간을 동시에 refresh 해도 중복 키 오류 없이 같은 결과
+UPSERT_SQL = """
+INSERT INTO {weekly} (code, week, first_date, last_date, open, high, low, close, volume, bars)
+VALUES (:code, :week, :first_date, :last_date, :open, :high, :low, :close, :volume, :bars)
+ON DUPLICATE KEY UPDATE
+    first_date = VALUES(first_date),
+    last_date  = VALUES(last_date),
+    open       = VALUES(open),
+    high       = VALUES(high),
+    low        = VALUES(low),
+    close      = VALUES(close),
+    volume     = VALUES(volume),
+    bars       = VALUES(bars)
+"""
+
+
+# ======================================================
+# 집계
+# ======================================================
+def week_label(dates):
+    """
+    날짜 → 해당 주 토요일 (datetime64[D] 배열)
+    """
+    days = pd.to_datetime(dates).to_numpy().astype("datetime64[D]")
+    weekday = (days.astype(np.int64) + 3) % 7        # 1970-01-01 = 목요일
+    return days + ((5 - weekday) % 7).astype("timedelta64[D]")
+
+
+def week_start(date):
+    """
+    date 가 속한 주의 일요일 ('YYYY-MM-DD')
+    """
+    return (pd.Timestamp(week_label([date])[0]) - pd.Timedelta(days=6)).strftime("%Y-%m-%d")
+
+
+def build_weekly_bars(df):
+    """
+    일봉 long DataFrame → 전 종목 주봉 (code, week 정렬)
+    - (code, week) 경계를 한 번에 찾고 reduceat 으로 집계 (종목 루프 없음)
+    - open / high / low 컬럼이 없으면 NaN
+    """
+    df = df.dropna(subset=["close"])
+    if df.empty:
+        return pd.DataFrame(columns=WEEKLY_COLUMNS)
+
+    df = df.sort_values(["code", "date"], kind="mergesort")
+    codes = df["code"].astype(str).to_numpy()
+    days = pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]")
+    weeks = week_label(days)
+
+    new = np.empty(len(df), dtype=bool)
+    new[0] = True
+    new[1:] = (codes[1:] != codes[:-1]) | (weeks[1:] != weeks[:-1])
+    starts = np.flatnonzero(new)
+    ends = np.append(starts[1:], len(df)) - 1
+
+    def column(name):
+        if name not in df.columns:
+            return np.full(len(df), np.nan)
+        return df[name].to_numpy(dtype=np.float64)
+
+    high, low = column("high"), column("low")
+    volume = np.nan_to_num(column("volume"))
+
+    weekly = pd.DataFrame({
+        "code": codes[starts],
+        "week": weeks[starts],
+        "first_date": days[starts],
+        "last_date": days[ends],
+        "open": column("open")[starts],
+        "high": np.fmax.reduceat(high, starts),
+        "low": np.fmin.reduceat(low, starts),
+        "close": column("close")[ends],
+        "volume": np.add.reduceat(volume, starts),
+        "bars": ends - starts + 1,
+    })
+    for col in DATE_COLUMNS:
+        weekly[col] = pd.to_datetime(weekly[col])
+    return weekly
+
+
+# ======================================================
+# 갱신
+# ======================================================
+def refresh_weekly_prices(engine, price_table, full=False):
+    """
+    주봉 테이블 갱신, 반영 행 수 반환
+    """
+    weekly = WEEKLY_TABLES[price_table]
+
+    with engine.begin() as conn:
+        conn.execute(text(WEEKLY_DDL.format(weekly=weekly, price_table=price_table)))
+        last = None if full else conn.execute(text(f"SELECT MAX(last_date) FROM {weekly}")).scalar()
+
+    if last is None:
+        return _load_all(engine, price_table, weekly)
+
+    since = week_start(pd.Timestamp(last) - pd.Timedelta(days=LOOKBACK_DAYS))
+    df = read_prices(engine, price_table, DAILY_COLUMNS, since, "9999-12-31")
+    bars = build_weekly_bars(df)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {weekly} WHERE week >= :week"), {"week": since})
+        _upsert(conn, weekly, bars)
+    return len(bars)
+
+
+def _load_all(engine, price_table, weekly):
+    """
+    전체 재적재 (종목 batch 단위로 일봉 조회 → 집계 → 교체)
+    """
+    with engine.connect() as conn:
+        codes = [row[0] for row in conn.execute(text(f"SELECT DISTINCT code FROM {price_table}"))]
+
+    total = 0
+    delete = text(f"DELETE FROM {weekly} WHERE code IN :codes").bindparams(bindparam("codes", expanding=True))
+    for batch in code_batches(codes):
+        df = read_prices(engine, price_table, DAILY_COLUMNS, "1900-01-01", "9999-12-31", batch)
+        bars = build_weekly_bars(df)
+        with engine.begin() as conn:
+            conn.execute(delete, {"codes": batch})
+            _upsert(conn, weekly, bars)
+        total += len(bars)
+    return total
+
+
+def _upsert(conn, weekly, bars):
+    if bars.empty:
+        return
+    bars = bars[WEEKLY_COLUMNS].copy()
+    for col in DATE_COLUMNS:
+        bars[col] = bars[col].dt.strftime("%Y-%m-%d")
+    bars["volume"] = bars["volume"].astype(np.int64)
+    records = bars.astype(object).where(bars.notna(), None).to_dict("records")
+    conn.execute(text(UPSERT_SQL.format(weekly=weekly)), records)
+
+
+def is_stale(engine, price_table, latest_date):
+    """
+    주봉 테이블 최신 last_date < 일봉 최신 거래일 (테이블 없음 / 비어 있음 포함)
+    """
+    weekly = WEEKLY_TABLES[price_table]
+    if latest_date is None:
+        return False
+    if not inspect(engine).has_table(weekly):
+        return True
+    with engine.connect() as conn:
+        last = conn.execute(text(f"""
+            SELECT MAX(last_date)
+            FROM {weekly}
+            WHERE week = (SELECT MAX(week) FROM {weekly})
+        """)).scalar()
+    return last is None or pd.Timestamp(last) < pd.Timestamp(latest_date)
+
+
+# ======================================================
+# 조회
+# ======================================================
+def read_weekly_prices(engine, price_table, start_date, end_date, codes=None):
+    """
+    [start_date, end_date] 안에 거래일이 있는 주봉 (code, week 정렬)
+    """
+    weekly = WEEKLY_TABLES[price_table]
+    end_week = pd.Timestamp(week_label([end_date])[0]).strftime("%Y-%m-%d")
+
+    where = "week BETWEEN :start AND :end_week AND last_date >= :start"
+    if codes is not None:
+        where += " AND code IN :codes"
+
+    sql = text(f"""
+        SELECT {", ".join(WEEKLY_COLUMNS)}
+        FROM {weekly}
+        WHERE {where}
+        ORDER BY code, week
+    """)
+    params = {"start": start_date, "end_week": end_week}
+
+    if codes is None:
+        df = fetch_frame(engine, sql, params)
+    else:
+        sql = sql.bindparams(bindparam("codes", expanding=True))
+        frames = [fetch_frame(engine, sql, {**params, "codes": batch}) for batch in code_batches(codes)]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=WEEKLY_COLUMNS)
+
+    for col in DATE_COLUMNS:
+        df[col] = pd.to_datetime(df[col])
+
+    # end 가 주 중간 → 마지막 주를 end 까지의 일봉으로 재집계
+    if (df["last_date"] > pd.Timestamp(end_date)).any():
+        daily = read_prices(engine, price_table, DAILY_COLUMNS, week_start(end_date), end_date, codes)
+        last_week = build_weekly_bars(daily)
+        last_week = last_week[last_week["last_date"] >= pd.Timestamp(start_date)]
+        df = pd.concat([df[df["week"] < pd.Timestamp(end_week)], last_week], ignore_index=True)
+        df = df.sort_values(["code", "week"]).reset_index(drop=True)
+
+    return df
+
+
+# ======================================================
+# CLI
+# ======================================================
+def main(tables=None, full=False):
+    """
+    주봉 테이블 갱신 (일봉 적재 job 뒤에 실행), 반영 행 수 합계 반환
+    """
+    from API.engine import get_engine
+
+    engine = get_engine()
+    total = 0
+    for table in tables or list(WEEKLY_TABLES):
+        rows = refresh_weekly_prices(engine, table, full=full)
+        total += rows
+        print(f"{WEEKLY_TABLES[table]} 갱신: {rows}건")
+
+    print(f"ROWCOUNT={total}")
+    return total
+
+
+if __name__ == "__main__":
+    main([a for a in sys.argv[1:] if not a.startswith("--")], full="--full" in sys.argv[1:])
@@ -0,0 +1,16 @@
+# ===== sys.path 세팅 (최상단) =====
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(PROJECT_ROOT))
+
+# US 일봉 적재 job 뒤에 실행 (stock_job_info.depends_on 으로 연결, Runner/schema.sql 참고)
+# → 전략 / 조회 프로세스는 요약 테이블 / 주봉 테이블을 읽기만 함
+from API import latest_price, weekly_price
+
+
+if __name__ == "__main__":
+    total = latest_price.main(["daily_price_us", "etf_daily_price_us"])
+    total += weekly_price.main(["daily_price_us"])
+    print(f"ROWCOUNT={total}")
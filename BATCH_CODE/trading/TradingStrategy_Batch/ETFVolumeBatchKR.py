@@ -36,7 +36,7 @@ strategy_name = "ETF_TOP20_VOLUME_KR"
 # =======================================================
 # 2. 전체 가격 한 번에 조회
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, today_str)
+df_all = mk.get_all_daily_prices(start_date, today_str, codes=etf_codes)
 
 if df_all.empty:
     print("\n전체 가격 데이터 없음 — 종료")
@@ -0,0 +1,13 @@
+# ===== sys.path 세팅 (최상단) =====
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.append(str(PROJECT_ROOT))
+
+# 전략 로직은 통합 스크리닝 엔진 (BATCH_CODE/trading/screening_kr.py)
+from BATCH_CODE.trading.screening_kr import run
+
+
+if __name__ == "__main__":
+    run()  # 전체 전략 (가격 1회 조회)
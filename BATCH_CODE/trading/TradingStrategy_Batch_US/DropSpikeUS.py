@@ -34,47 +34,41 @@ stocks = set(company_df["code"])
 
 print(f"\n총 {len(stocks)}개 미국 종목 스캔 시작...\n")
 
-start_date = (pd.Timestamp.today() - pd.DateOffset(days=14)).strftime("%Y-%m-%d")
 today_str = datetime.now().strftime("%Y-%m-%d")
 latest_trade_date = mk.get_latest_date(today_str)
 
 strategy_name = "DAILY_DROP_SPIKE_US"
 
 # =======================================================
-# 3. 전체 가격 데이터 한 번에 조회
+# 3. 종목별 최근 봉 + 직전 종가 조회 (서버에서 종목당 1행으로 계산)
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, latest_trade_date)
+df_last = mk.get_last_n_bars(1, latest_trade_date, codes=stocks, columns=["close", "volume"])
 
-if df_all.empty:
+if df_last.empty:
     print("\n전체 가격 데이터 없음 종료")
     exit()
 
-df_all = df_all[df_all["code"].isin(stocks)]
-df_all = df_all.sort_values(["code", "date"])
+# 직전 봉 없는 종목 제외
+df_last = df_last.dropna(subset=["prev_close"])
 
 drop_list = []
 
 # =======================================================
 # 4. 종목별 하락률 계산
 # =======================================================
-for code, group in df_all.groupby("code"):
+for row in df_last.itertuples(index=False):
 
-    if len(group) < 2:
-        continue
+    rate = ((row.close - row.prev_close) / row.prev_close) * 100
 
-    prev, last = group.tail(2).iloc
-
-    rate = ((last["close"] - prev["close"]) / prev["close"]) * 100
-
-    if rate <= -5 and last["close"] >= 15:
+    if rate <= -5 and row.close >= 15:
         drop_list.append({
-            "code": code,
-            "name": mk.code_to_name.get(code, "UNKNOWN"),
-            "date": last["date"].strftime("%Y-%m-%d"),
-            "prev_close": float(prev["close"]),
-            "close": float(last["close"]),
+            "code": row.code,
+            "name": mk.code_to_name.get(row.code, "UNKNOWN"),
+            "date": row.date.strftime("%Y-%m-%d"),
+            "prev_close": float(row.prev_close),
+            "close": float(row.close),
             "rate": round(rate, 2),
-            "volume": float(last.get("volume", 0))
+            "volume": float(row.volume)
         })
 
 # =======================================================
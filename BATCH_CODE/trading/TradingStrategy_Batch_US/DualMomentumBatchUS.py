@@ -0,0 +1,13 @@
+# ===== sys.path 세팅 (최상단) =====
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.append(str(PROJECT_ROOT))
+
+# 전략 로직은 US 듀얼모멘텀 통합 배치 (BATCH_CODE/trading/dual_momentum_us.py)
+from BATCH_CODE.trading.dual_momentum_us import run
+
+
+if __name__ == "__main__":
+    run()  # 1M / 3M / 6M / 1Y (가격 1회 조회)
@@ -35,7 +35,7 @@ latest_trade_date = mk.get_latest_date(today_str)
 # =======================================================
 # 2. 전체 ETF 가격 한 번에 조회
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, latest_trade_date)
+df_all = mk.get_all_daily_prices(start_date, latest_trade_date, codes=etfs)
 
 if df_all.empty:
     print("\n전체 ETF 가격 데이터 없음 — 종료")
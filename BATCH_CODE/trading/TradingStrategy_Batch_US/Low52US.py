@@ -6,10 +6,12 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 sys.path.append(str(PROJECT_ROOT))
 
 # ===== 기존 import =====
+import numpy as np
 import pandas as pd
 import warnings
 from datetime import datetime
 
+from API import indicators
 from API.AnalyzeUS import MarketDB
 from BATCH_CODE.trading.txt_saver_us import (
     save_strategy_result,
@@ -35,64 +37,53 @@ latest_trade_date = mk.get_latest_date(today_str)
 strategy_name = "WEEKLY_52W_NEW_LOW_US"
 
 # =======================================================
-# 2. 전체 가격 1회 조회
+# 2. 주봉 조회 (주봉 테이블, W-SAT) + 일봉 수 조건
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, latest_trade_date)
+weekly_all = mk.get_weekly_prices(start_date, latest_trade_date, codes=stocks)
 
-if df_all.empty:
+if weekly_all.empty:
     print("\n전체 가격 데이터 없음 — 종료")
     exit()
 
-df_all["date"] = pd.to_datetime(df_all["date"])
-df_all = df_all[df_all["code"].isin(stocks)]
-df_all = df_all.sort_values(["code", "date"])
+# 기간 내 일봉 260개 미만 종목 제외 (일봉 행은 받지 않고 종목별 COUNT 만 조회)
+bar_counts = mk.get_bar_counts(start_date, latest_trade_date, codes=stocks)
+enough = bar_counts.index[bar_counts >= 260]
+
+weekly_all = weekly_all[weekly_all["code"].isin(stocks) & weekly_all["code"].isin(enough)]
+weekly_all = weekly_all.dropna(subset=["close"]).sort_values(["code", "week"])
 
 low_list = []
 
 # =======================================================
-# 3. 종목별 주봉 변환 + 52주 신저가 첫 발생 탐지
+# 3. 52주 신저가 첫 발생 탐지 (전 종목 주봉 패널 1회 계산)
 # =======================================================
-for code, group in df_all.groupby("code"):
-
-    if len(group) < 260:   # 최소 5년치 일봉
-        continue
-
-    df = group.sort_values("date").copy()
-    df.set_index("date", inplace=True)
-
-    weekly = pd.DataFrame({
-        "open": df["open"].resample("W-SAT").first(),
-        "high": df["high"].resample("W-SAT").max(),
-        "low": df["low"].resample("W-SAT").min(),
-        "close": df["close"].resample("W-SAT").last(),
-        "volume": df["volume"].resample("W-SAT").sum()
-    }).dropna()
-
-    if len(weekly) < 52:
-        continue
-
-    weekly["LOW_52_CLOSE"] = weekly["close"].rolling(52).min()
-
-    prev = weekly.iloc[-2]
-    last = weekly.iloc[-1]
-
-    if (
-            last["close"] == last["LOW_52_CLOSE"]
-            and prev["close"] > prev["LOW_52_CLOSE"]
-            and last["close"] >= 15
-    ):
-        diff = round(((last["close"] - prev["close"]) / prev["close"]) * 100, 2)
-
-        low_list.append({
-            "code": code,
-            "name": mk.code_to_name.get(code, "UNKNOWN"),
-            "date": last.name.strftime("%Y-%m-%d"),
-            "close": float(last["close"]),
-            "prev_close": float(prev["close"]),
-            "volume": float(last["volume"]),
-            "diff": diff,
-            "special_value": round(float(last["LOW_52_CLOSE"]), 2)
-        })
+codes, bars = indicators.bars_from_frame(weekly_all.rename(columns={"week": "date"}), ["close", "volume"])
+close, volume = bars["close"], bars["volume"]
+n_weeks = np.count_nonzero(~np.isnan(close), axis=1)
+last_week = weekly_all.groupby("code")["week"].max().reindex(codes)
+
+low52 = indicators.rolling_min(close, 52)
+
+hit = (
+    (n_weeks >= 52)
+    & (close[:, -1] == low52[:, -1])
+    & (close[:, -2] > low52[:, -2])
+    & (close[:, -1] >= 15)
+)
+
+for k in np.flatnonzero(hit):
+    diff = round(((close[k, -1] - close[k, -2]) / close[k, -2]) * 100, 2)
+
+    low_list.append({
+        "code": codes[k],
+        "name": mk.code_to_name.get(codes[k], "UNKNOWN"),
+        "date": last_week.iloc[k].strftime("%Y-%m-%d"),
+        "close": float(close[k, -1]),
+        "prev_close": float(close[k, -2]),
+        "volume": float(volume[k, -1]),
+        "diff": diff,
+        "special_value": round(float(low52[k, -1]), 2)
+    })
 
 # =======================================================
 # 4. 정렬 + TXT 저장
@@ -6,10 +6,12 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 sys.path.append(str(PROJECT_ROOT))
 
 # ===== 기존 import =====
+import numpy as np
 import pandas as pd
 import warnings
 from datetime import datetime
 
+from API import indicators
 from API.AnalyzeUS import MarketDB
 from BATCH_CODE.trading.txt_saver_us import (
     save_strategy_result,
@@ -34,71 +36,57 @@ latest_trade_date = mk.get_latest_date(today_str)
 strategy_name = "WEEKLY_TOUCH_MA60_US"
 
 # =======================================================
-# 2. 전체 가격 1회 조회
+# 2. 주봉 조회 (주봉 테이블, W-SAT) + 일봉 수 조건
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, latest_trade_date)
+weekly_all = mk.get_weekly_prices(start_date, latest_trade_date, codes=stocks)
 
-if df_all.empty:
+if weekly_all.empty:
     print("\n전체 가격 데이터 없음 — 종료")
     exit()
 
-df_all["date"] = pd.to_datetime(df_all["date"])
-df_all = df_all[df_all["code"].isin(stocks)]
-df_all = df_all.sort_values(["code", "date"])
+# 기간 내 일봉 260개 미만 종목 제외 (일봉 행은 받지 않고 종목별 COUNT 만 조회)
+bar_counts = mk.get_bar_counts(start_date, latest_trade_date, codes=stocks)
+enough = bar_counts.index[bar_counts >= 260]
+
+weekly_all = weekly_all[weekly_all["code"].isin(stocks) & weekly_all["code"].isin(enough)]
+weekly_all = weekly_all.dropna(subset=["close"]).sort_values(["code", "week"])
 
 touch_list = []
 
 # =======================================================
-# 3. 종목별 주봉 변환 + MA60 터치 스캔
+# 3. MA60 터치 스캔 (전 종목 주봉 패널 1회 계산)
 # =======================================================
-for code, group in df_all.groupby("code"):
-
-    if len(group) < 260:  # 주봉 60개 만들기 위한 안전선
-        continue
-
-    df = group.sort_values("date").copy()
-    df.set_index("date", inplace=True)
-
-    # --- 주봉 변환 ---
-    weekly = pd.DataFrame({
-        "open": df["open"].resample("W-SAT").first(),
-        "high": df["high"].resample("W-SAT").max(),
-        "low": df["low"].resample("W-SAT").min(),
-        "close": df["close"].resample("W-SAT").last(),
-        "volume": df["volume"].resample("W-SAT").sum()
-    }).dropna()
-
-    if len(weekly) < 60:
-        continue
+codes, bars = indicators.bars_from_frame(weekly_all.rename(columns={"week": "date"}), ["close", "volume"])
+close, volume = bars["close"], bars["volume"]
+n_weeks = np.count_nonzero(~np.isnan(close), axis=1)
+last_week = weekly_all.groupby("code")["week"].max().reindex(codes)
 
-    # --- 60주 이동평균 ---
-    weekly["MA60"] = weekly["close"].rolling(60).mean()
+# --- 60주 이동평균 ---
+ma60 = indicators.rolling_mean(close, 60)
+prev_ma60 = ma60[:, -2]
 
-    prev = weekly.iloc[-2]
-    last = weekly.iloc[-1]
+# --- MA60 터치율 (핵심): 직전 주 MA60 대비 이번 주 종가 ---
+valid = (n_weeks >= 60) & ~np.isnan(prev_ma60) & (prev_ma60 != 0)
+with np.errstate(invalid="ignore", divide="ignore"):
+    touch_rate = ((close[:, -1] - prev_ma60) / prev_ma60) * 100
 
-    if pd.isna(prev["MA60"]) or prev["MA60"] == 0:
-        continue
+# --- 진짜 60주선 터치 조건 ---
+hit = valid & (touch_rate >= -1.0) & (touch_rate <= 1.0) & (close[:, -1] >= 15)
 
+for k in np.flatnonzero(hit):
     # --- 주간 등락률 ---
-    diff = round(((last["close"] - prev["close"]) / prev["close"]) * 100, 2)
-
-    # --- MA60 터치율 (핵심) ---
-    touch_rate = ((last["close"] - prev["MA60"]) / prev["MA60"]) * 100
-
-    # --- 진짜 60주선 터치 조건 ---
-    if -1.0 <= touch_rate <= 1.0 and last["close"] >= 15:
-
-        touch_list.append({
-            "code": code,
-            "name": mk.code_to_name.get(code, "UNKNOWN"),
-            "date": last.name.strftime("%Y-%m-%d"),
-            "close": float(last["close"]),
-            "prev_close": float(prev["close"]),
-            "diff": diff,
-            "volume": float(last["volume"]),
-            "special_value": round(float(prev["MA60"]), 2)  # 60주선
-        })
+    diff = round(((close[k, -1] - close[k, -2]) / close[k, -2]) * 100, 2)
+
+    touch_list.append({
+        "code": codes[k],
+        "name": mk.code_to_name.get(codes[k], "UNKNOWN"),
+        "date": last_week.iloc[k].strftime("%Y-%m-%d"),
+        "close": float(close[k, -1]),
+        "prev_close": float(close[k, -2]),
+        "diff": diff,
+        "volume": float(volume[k, -1]),
+        "special_value": round(float(prev_ma60[k]), 2)  # 60주선
+    })
 
 # =======================================================
 # 4. 정렬 + TXT 저장
@@ -52,7 +52,7 @@ def compute_rsi(series, period=14):
 # =======================================================
 # 3. 전체 일봉 데이터 1회 조회
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, latest_trade_date)
+df_all = mk.get_all_daily_prices(start_date, latest_trade_date, codes=stocks)
 
 if df_all.empty:
     print("전체 가격 데이터 없음")
@@ -27,7 +27,6 @@ stocks = set(company["code"])
 
 print(f"\n총 {len(stocks)}개 미국 종목 스캔 시작...\n")
 
-start_date = (pd.Timestamp.today() - pd.DateOffset(days=14)).strftime("%Y-%m-%d")
 today_str = datetime.now().strftime("%Y-%m-%d")
 latest_trade_date = mk.get_latest_date(today_str)
 
@@ -35,44 +34,35 @@ strategy_name = "DAILY_TOP20_VOLUME_US"
 volume_candidates = []
 
 # =======================================================
-# 2. 전체 데이터 1번 조회 (MariaDB)
+# 2. 종목별 최근 봉 + 직전 종가 조회 (서버에서 종목당 1행으로 계산)
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, latest_trade_date)
+df_last = mk.get_last_n_bars(1, latest_trade_date, codes=stocks, columns=["close", "volume"])
 
-if df_all.empty:
+if df_last.empty:
     print("전체 가격 데이터 없음")
     exit()
 
-df_all["date"] = pd.to_datetime(df_all["date"])
-df_all = df_all[df_all["code"].isin(stocks)]
-df_all = df_all.sort_values(["code", "date"])
+# 직전 봉 없는 종목 제외
+df_last = df_last.dropna(subset=["prev_close"])
 
 # =======================================================
 # 3. 종목별 최근 2거래일 비교
 # =======================================================
-for code, group in df_all.groupby("code"):
+for row in df_last.itertuples(index=False):
 
-    if len(group) < 2:
+    if pd.isna(row.volume) or row.volume == 0:
         continue
 
-    group = group.sort_values("date").set_index("date")
-
-    prev = group.iloc[-2]
-    last = group.iloc[-1]
-
-    if pd.isna(last["volume"]) or last["volume"] == 0:
-        continue
-
-    rate = ((last["close"] - prev["close"]) / prev["close"]) * 100
+    rate = ((row.close - row.prev_close) / row.prev_close) * 100
 
     volume_candidates.append({
-        "code": code,
-        "name": mk.code_to_name.get(code, "UNKNOWN"),
-        "date": last.name.strftime("%Y-%m-%d"),
-        "prev_close": float(prev["close"]),
-        "close": float(last["close"]),
+        "code": row.code,
+        "name": mk.code_to_name.get(row.code, "UNKNOWN"),
+        "date": row.date.strftime("%Y-%m-%d"),
+        "prev_close": float(row.prev_close),
+        "close": float(row.close),
         "rate": round(rate, 2),
-        "volume": float(last["volume"])
+        "volume": float(row.volume)
     })
 
 # =======================================================
@@ -36,7 +36,7 @@ strategy_name = "DAILY_BB_UPPER_TOUCH_US"
 # =======================================================
 # 2. 전체 가격 한 번에 조회 (MariaDB)
 # =======================================================
-df_all = mk.get_all_daily_prices(start_date, latest_trade_date)
+df_all = mk.get_all_daily_prices(start_date, latest_trade_date, codes=stocks)
 
 if df_all.empty:
     print("\n전체 가격 데이터 없음 — 종료")
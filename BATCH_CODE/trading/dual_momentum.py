@@ -0,0 +1,143 @@
+"""
+듀얼모멘텀 공통 계산 (1M / 3M / 6M / 1Y 를 가격 1회 조회로 함께 계산)
+
+DualMomentumBatch{20,60,180,365}{KR,US}.py 는 기간마다
+  가격 조회 → pivot → 종목 루프로 수익률 계산 → 정렬
+을 반복함 → 가장 긴 기간을 1회 조회해 만든 종가 pivot 에서 기간별 시작 / 종료 거래일 행만 꺼내
+전 종목 수익률을 배열 연산으로 계산하고, 상대모멘텀 상위는 argpartition 으로 선택
+
+- 기간 / 절대모멘텀 통과 조건은 기존 배치와 동일
+  (KR 3M = 90일, US 3M = 60일 / KR: 수익률 > 기준, US: 수익률 >= 기준)
+- 절대모멘텀 기준(%)은 공용 config.json (COMMON_CONFIG_PATH) 의 "dual_momentum" 에서 시장 / 기간별로 지정
+    {"dual_momentum": {"KR": {"1M": 5.0, "3M": 10.0, ...}, "US": {...}}}
+  미지정 기간은 MIN_RETURNS 기본값
+- 상대모멘텀 동률은 수익률(반올림 전) → 종목코드 순으로 정렬 (실행마다 같은 순서)
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 시장 → 기간 → 조회 일수
+HORIZON_DAYS = {
+    "KR": {"1M": 30, "3M": 90, "6M": 180, "1Y": 365},
+    "US": {"1M": 30, "3M": 60, "6M": 180, "1Y": 365},
+}
+
+# 절대모멘텀 기준 (%) 기본값
+MIN_RETURNS = {"1M": 5.0, "3M": 10.0, "6M": 15.0, "1Y": 25.0}
+
+# 절대모멘텀 통과 조건에 기준값 포함 여부
+INCLUSIVE = {"KR": False, "US": True}
+
+TOP_RELATIVE = 40     # 상대모멘텀 상위
+FINAL_TOP = 20        # 최종 선택 수
+
+RETURN_COLUMNS = ["code", "prev_close", "close", "returns"]
+
+
+def strategy_names(market):
+    """
+    기간 → 전략명 (DUAL_MOMENTUM_1M_KR ...)
+    """
+    return {f"DUAL_MOMENTUM_{h}_{market}": h for h in HORIZON_DAYS[market]}
+
+
+# =======================================================
+# 설정
+# =======================================================
+def load_min_returns(market):
+    """
+    기간별 절대모멘텀 기준 (%) — config.json 값 우선, 없으면 MIN_RETURNS
+    """
+    min_returns = dict(MIN_RETURNS)
+
+    config_path = os.getenv("COMMON_CONFIG_PATH")
+    if not config_path:
+        return min_returns
+
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+    except FileNotFoundError:
+        raise RuntimeError(f"[FATAL] config.json not found: {config_path}")
+
+    overrides = cfg.get("dual_momentum", {}).get(market, {})
+    unknown = [h for h in overrides if h not in HORIZON_DAYS[market]]
+    if unknown:
+        raise ValueError(f"unknown dual_momentum horizons for {market}: {unknown}")
+
+    min_returns.update({h: float(v) for h, v in overrides.items()})
+    return min_returns
+
+
+# =======================================================
+# 계산
+# =======================================================
+def close_pivot(df):
+    """
+    일봉 long DataFrame → 종가 pivot (거래일 × code, 거래일 정렬)
+    """
+    df = df.assign(date=pd.to_datetime(df["date"]), code=df["code"].astype(str))
+    return df.pivot(index="date", columns="code", values="close").sort_index()
+
+
+def momentum_returns(pivot, start_date, end_date):
+    """
+    [start_date, end_date] 의 첫 / 마지막 거래일 행 → 두 행 모두 종가가 있는 종목의 기간 수익률 (%)
+    (기존 배치의 pivot.iloc[0] / pivot.iloc[-1] 과 같은 행)
+    반환: DataFrame(code, prev_close, close, returns) — code 정렬, returns 는 반올림 전
+    """
+    index = pivot.index
+    first = index.searchsorted(pd.Timestamp(start_date), side="left")
+    last = index.searchsorted(pd.Timestamp(end_date), side="right") - 1
+    if first > last:
+        return pd.DataFrame(columns=RETURN_COLUMNS)
+
+    old = pivot.iloc[first].to_numpy(dtype=np.float64)
+    new = pivot.iloc[last].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(old) & ~np.isnan(new)
+
+    old, new = old[valid], new[valid]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = (new / old - 1) * 100
+
+    return pd.DataFrame({
+        "code": pivot.columns.to_numpy()[valid],
+        "prev_close": old,
+        "close": new,
+        "returns": returns,
+    }, columns=RETURN_COLUMNS)
+
+
+def top_positions(values, n):
+    """
+    values 내림차순 상위 n 개 위치 (argpartition 으로 후보만 남긴 뒤 후보만 정렬, NaN 은 마지막)
+    """
+    if len(values) > n:
+        candidates = np.argpartition(-values, n - 1)[:n]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+def select(returns, min_return, inclusive=False, top_relative=TOP_RELATIVE, final_top=FINAL_TOP):
+    """
+    상대모멘텀 상위 top_relative → 절대모멘텀(min_return %) 통과 → 상위 final_top
+    - returns 는 소수 둘째 자리 반올림 (기존 배치와 같은 Python round) 후 기준과 비교
+    """
+    if returns.empty:
+        return returns
+
+    raw = returns["returns"].to_numpy(dtype=np.float64)
+    top = top_positions(raw, top_relative)
+
+    picked = returns.iloc[top].reset_index(drop=True)
+    picked["returns"] = [round(float(v), 2) for v in raw[top]]
+
+    if inclusive:
+        passed = picked["returns"] >= min_return
+    else:
+        passed = picked["returns"] > min_return
+    return picked[passed].head(final_top).reset_index(drop=True)
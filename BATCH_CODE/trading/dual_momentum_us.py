@@ -0,0 +1,145 @@
+"""
+US 듀얼모멘텀 통합 배치 (1M / 3M / 6M / 1Y 가격 1회 조회)
+
+TradingStrategy_Batch_US/DualMomentumBatch{20,60,180,365}US.py 는 기간마다 가격을 조회했음
+→ 선택된 기간 중 가장 이른 시작 거래일부터 1회 조회 → 종가 pivot 공유 → 기간별 DUAL_MOMENTUM_*_US 저장
+
+- 기존 스크립트(stock_job_info 등록 경로)는 run([strategy_name]) 만 호출
+- 기간 / 기준 / 출력 / TXT 형식은 기존 스크립트와 동일 (계산은 BATCH_CODE.trading.dual_momentum)
+
+실행:
+    python -m BATCH_CODE.trading.dual_momentum_us                        # 전체 기간
+    python -m BATCH_CODE.trading.dual_momentum_us DUAL_MOMENTUM_3M_US    # 이름 지정
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+import pandas as pd
+
+from API.AnalyzeUS import MarketDB
+from BATCH_CODE.trading import dual_momentum as dm
+from BATCH_CODE.trading.txt_saver_us import (
+    save_strategy_result,
+    save_strategy_detail
+)
+
+# 이름 → 기간
+DUAL_MOMENTUM = dm.strategy_names("US")
+
+
+def _adjust_date(mk, date_str):
+    """
+    거래일 보정 (date_str 이전 최근 거래일)
+    """
+    latest = mk.get_latest_date(date_str)
+    if latest is None:
+        print(f"거래일 없음: {date_str}")
+    return latest
+
+
+def save_results(strategy_name, df, end_date):
+    """
+    STRATEGY_RESULT 1행 + STRATEGY_DETAIL N행 (special_value = 순위), 저장 건수 반환
+    """
+    today = datetime.now().strftime("%Y%m%d")
+    result_id = f"{today}_{strategy_name}"
+
+    save_strategy_result(
+        strategy_name=strategy_name,
+        signal_date=end_date,
+        total_data=len(df)
+    )
+
+    for rank, row in enumerate(df.to_dict("records"), start=1):
+        save_strategy_detail(
+            signal_date=end_date,
+            action=strategy_name,
+            code=row["code"],
+            name=row["name"],
+            prev_close=row["old_price"],
+            price=row["new_price"],
+            diff=row["returns"],
+            volume=0,
+            special_value=rank,
+            result_id=result_id
+        )
+
+    print(f"TXT 생성 완료 → RESULT_ID={result_id}, ROWCOUNT={len(df)}\n")
+    return len(df)
+
+
+def run(names=None):
+    """
+    names 기간만 실행 (None = 전체), 전략별 저장 건수 dict 반환
+    """
+    names = list(names or DUAL_MOMENTUM)
+    unknown = [n for n in names if n not in DUAL_MOMENTUM]
+    if unknown:
+        raise ValueError(f"unknown strategies: {unknown} (available: {list(DUAL_MOMENTUM)})")
+
+    mk = MarketDB()
+    min_returns = dm.load_min_returns("US")
+
+    today = pd.Timestamp.today()
+    end_date = _adjust_date(mk, today.strftime("%Y-%m-%d"))
+    starts = {
+        name: _adjust_date(
+            mk, (today - pd.DateOffset(days=dm.HORIZON_DAYS["US"][DUAL_MOMENTUM[name]])).strftime("%Y-%m-%d")
+        )
+        for name in names
+    }
+
+    # 가장 이른 시작 거래일 ~ 종료 거래일 1회 조회
+    load_start = min((d for d in starts.values() if d), default=None)
+    pivot = None
+    if load_start and end_date:
+        df_all = mk.get_all_daily_prices(load_start, end_date, codes=mk.code_to_name, columns=["close"])
+        df_all = df_all[df_all["code"].isin(mk.code_to_name)]
+        if df_all.empty:
+            print("전체 가격 데이터 없음")
+        else:
+            pivot = dm.close_pivot(df_all)
+
+    counts = {}
+    for name in names:
+        horizon = DUAL_MOMENTUM[name]
+        start_date = starts[name]
+        counts[name] = 0
+
+        if not start_date or not end_date:
+            print("날짜 보정 실패 → 종료")
+            continue
+
+        print(f"\n[DUAL MOMENTUM {horizon} US] ({start_date} ~ {end_date})\n")
+
+        returns = pd.DataFrame() if pivot is None else dm.momentum_returns(pivot, start_date, end_date)
+        if returns.empty:
+            print("데이터 없음 → 종료")
+            continue
+
+        final = dm.select(returns, min_returns[horizon], inclusive=dm.INCLUSIVE["US"])
+        if final.empty:
+            print("절대모멘텀 통과 종목 없음")
+            continue
+
+        df_final = pd.DataFrame({
+            "code": final["code"],
+            "name": [mk.code_to_name.get(code, "UNKNOWN") for code in final["code"]],
+            "old_price": final["prev_close"].astype(float),
+            "new_price": final["close"].astype(float),
+            "returns": final["returns"],
+        })
+        print(df_final.to_string(index=False), "\n")
+
+        counts[name] = save_results(name, df_final, end_date)
+
+    return counts
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:] or None)
@@ -0,0 +1,576 @@
+"""
+KR 통합 스크리닝 엔진 (가격 1회 조회 + 전 종목 벡터화 feature 계산)
+
+TradingStrategy_Batch/*.py 는 전략마다
+  MarketDB 생성 → 종목 목록 → 가격 조회 → groupby("code") 루프 → TXT 저장
+을 반복함 → 선택된 전략 중 가장 긴 기간을 1회 조회해 feature 를 한 번에 계산하고
+전략별 STRATEGY_RESULT_KR / STRATEGY_DETAIL_KR 을 기록
+
+- 전략은 strategy_name 으로 개별 선택 가능
+  → 기존 스크립트(stock_job_info 등록 경로)는 run([strategy_name]) 만 호출
+- 전략별 조회 기간 / 최소 봉 수 / 조건 / 정렬 / special_value 는 기존 스크립트와 동일
+  (긴 기간을 읽어도 rows_since() 로 "기존 기간 안의 봉 수" 조건을 그대로 적용)
+- 전일 비교만 하는 전략(스파이크 / 거래량)만 선택되면 get_last_n_bars 로 종목당 1행만 조회
+- MARKET_STATE_DIR 설정 시 일봉 / 주봉 feature 는 API.indicator_state 증분 상태에서 읽음
+  (새 일봉만 반영, 가격 기간 조회는 듀얼모멘텀이 선택된 경우에만)
+- 듀얼모멘텀은 선택된 기간이 종가 pivot 1회를 공유 (BATCH_CODE.trading.dual_momentum)
+- 상태가 없으면 주봉 전략은 주봉 테이블(API.weekly_price)을 읽고 일봉 수 조건은 COUNT 조회
+  (주봉 전략만 선택되면 일봉 기간 조회 없음)
+
+실행:
+    python -m BATCH_CODE.trading.screening_kr                      # 전체 전략
+    python -m BATCH_CODE.trading.screening_kr RSI_30_UNHEATED_KR   # 이름 지정
+"""
+import sys
+import warnings
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+import numpy as np
+import pandas as pd
+
+from API import indicators
+from API.AnalyzeKR import MarketDB
+from API.indicator_state import IndicatorStateStore
+from API.price_stream import LAST_BARS_LOOKBACK
+from BATCH_CODE.trading import dual_momentum as dm
+from BATCH_CODE.trading.txt_saver_kr import (
+    save_strategy_result,
+    save_strategy_detail
+)
+
+warnings.filterwarnings("ignore", category=RuntimeWarning)
+
+DETAIL_COLUMNS = ["code", "name", "date", "close", "prev_close", "diff", "volume", "special_value"]
+
+# 듀얼모멘텀: 이름 → 기간 (기간 일수 / 절대모멘텀 기준은 dual_momentum 모듈 + config.json)
+DUAL_MOMENTUM = dm.strategy_names("KR")
+
+
+# =======================================================
+# 공통 feature (전 종목 1회 계산)
+# =======================================================
+def _last_features(df, features):
+    """
+    종목별 마지막 행 + 지표의 최근 / 직전 봉 값 (API.indicators 패널 연산)
+    - features(close 패널) → {컬럼: (codes × bars) 배열}
+      마지막 열 → 컬럼, 직전 열 → prev_컬럼
+    - 종목별 봉을 오른쪽 정렬한 패널 → 기존 groupby("code") rolling 과 같은 봉 기준 윈도우
+    """
+    codes, bars = indicators.bars_from_frame(df, ["close"])
+    close = bars["close"]
+
+    last = df.groupby("code", sort=False).tail(1).set_index("code").reindex(codes)
+    last["prev_close"] = close[:, -2]
+    for name, panel in features(close).items():
+        last[name] = panel[:, -1]
+        last[f"prev_{name}"] = panel[:, -2]
+    return last
+
+
+def _daily_features(close):
+    """
+    MA60 / 120일 극값 / 볼린저(20, 2) / RSI(14, 단순평균)
+    """
+    _, bb_upper, bb_lower = indicators.bollinger(close, 20, 2)
+    return {
+        "ma60": indicators.rolling_mean(close, 60),
+        "high120": indicators.rolling_max(close, 120),
+        "low120": indicators.rolling_min(close, 120),
+        "bb_upper": bb_upper,
+        "bb_lower": bb_lower,
+        "rsi": indicators.rsi(close, 14),
+    }
+
+
+def _weekly_features(close):
+    """
+    52주 극값 / 60주 이동평균
+    """
+    return {
+        "high52": indicators.rolling_max(close, 52),
+        "low52": indicators.rolling_min(close, 52),
+        "ma60": indicators.rolling_mean(close, 60),
+    }
+
+
+def _pct(new, old):
+    return (new - old) / old * 100
+
+
+class ScreeningContext:
+    """
+    전략들이 공유하는 가격 데이터 / feature (최초 접근 시 1회 계산)
+    """
+
+    def __init__(self, mk, stocks, load_start, as_of, state=None, weekly_start=None):
+        self.mk = mk
+        self.stocks = stocks
+        self.load_start = load_start
+        self.as_of = as_of
+        self.state = state
+        self.weekly_start = weekly_start
+        self.today = pd.Timestamp.today()
+        self._bar_counts = {}
+
+    def start(self, **offset):
+        return (self.today - pd.DateOffset(**offset)).strftime("%Y-%m-%d")
+
+    # ---------------------------------------------------
+    # 일봉 (code, date 정렬 long DataFrame)
+    # ---------------------------------------------------
+    @cached_property
+    def prices(self):
+        if self.load_start is None:
+            return None
+
+        df = self.mk.get_all_daily_prices(
+            self.load_start, self.as_of, codes=self.stocks, columns=["close", "volume"]
+        )
+        df = df[df["code"].isin(self.stocks)]
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        df["code"] = df["code"].astype(str)
+        return (
+            df.dropna(subset=["date"])
+            .sort_values(["code", "date"])
+            .reset_index(drop=True)
+        )
+
+    def rows_since(self, start_date):
+        """
+        start_date 이후 종목별 일봉 수 (기존 스크립트의 len(group) 조건)
+        """
+        if self.state is not None:
+            return self.state.rows_since(start_date)
+        if self.prices is None or self.load_start > start_date:
+            if start_date not in self._bar_counts:
+                self._bar_counts[start_date] = self.mk.get_bar_counts(start_date, self.as_of, codes=self.stocks)
+            return self._bar_counts[start_date]
+        df = self.prices
+        return df.loc[df["date"] >= start_date].groupby("code").size()
+
+    @cached_property
+    def daily_last(self):
+        if self.state is not None:
+            return self._state_rows(self.state.daily_last())
+        return _last_features(self.prices, _daily_features)
+
+    @cached_property
+    def weekly(self):
+        """
+        주봉 (W-SAT, 종가 / 거래량 / 주 마지막 거래일) — 주봉 테이블에서 조회
+        """
+        df = self.mk.get_weekly_prices(self.weekly_start, self.as_of, codes=self.stocks)
+        df = df.rename(columns={"week": "date"})[["code", "date", "close", "volume", "last_date"]]
+        df["code"] = df["code"].astype(str)
+        return (
+            df[df["code"].isin(self.stocks)]
+            .dropna(subset=["close"])
+            .sort_values(["code", "date"])
+            .reset_index(drop=True)
+        )
+
+    def weeks_since(self, start_date):
+        if self.state is not None:
+            return self.state.weeks_since(start_date)
+        weekly = self.weekly
+        return weekly.loc[weekly["last_date"] >= start_date].groupby("code").size()
+
+    @cached_property
+    def weekly_last(self):
+        if self.state is not None:
+            return self._state_rows(self.state.weekly_last())
+        return _last_features(self.weekly, _weekly_features)
+
+    def _state_rows(self, df):
+        return df[df.index.isin(self.stocks)].sort_index()
+
+    # ---------------------------------------------------
+    # 종목별 최근 봉 + 직전 종가 (스파이크 / 거래량)
+    # ---------------------------------------------------
+    @cached_property
+    def last_bars(self):
+        """
+        get_last_n_bars(1) 과 같은 범위 (as_of 기준 1 + LAST_BARS_LOOKBACK 거래일)
+        - 이미 일봉을 읽었으면 재조회 없이 잘라서 사용
+        """
+        if self.prices is None:
+            df = self.mk.get_last_n_bars(1, self.as_of, codes=self.stocks, columns=["close", "volume"])
+            return df.dropna(subset=["prev_close"]).set_index("code")
+
+        since = self.mk.calendar.offset(self.as_of, -(1 + LAST_BARS_LOOKBACK))
+        df = self.prices
+        if since is not None:
+            df = df.loc[df["date"] >= since]
+
+        df = df.assign(prev_close=df.groupby("code", sort=False)["close"].shift(1))
+        return df.groupby("code", sort=False).tail(1).dropna(subset=["prev_close"]).set_index("code")
+
+    # ---------------------------------------------------
+    # 듀얼모멘텀 (종가 pivot 1회 → 기간별 행 비교)
+    # ---------------------------------------------------
+    @cached_property
+    def close_pivot(self):
+        return dm.close_pivot(self.prices)
+
+    @cached_property
+    def min_returns(self):
+        return dm.load_min_returns("KR")
+
+    def names(self, codes, default="UNKNOWN"):
+        return [self.mk.codes.get(code, default) for code in codes]
+
+
+# =======================================================
+# 전략 (ctx → 정렬된 DETAIL_COLUMNS DataFrame)
+# =======================================================
+def _detail(ctx, last, special_value):
+    """
+    후보 행 → 저장용 DataFrame (diff / 소수점 round 는 기존 스크립트와 같은 Python round)
+    """
+    return pd.DataFrame({
+        "code": last.index.astype(str),
+        "name": ctx.names(last.index),
+        "date": pd.to_datetime(last["date"]).dt.strftime("%Y-%m-%d").to_numpy(),
+        "close": last["close"].astype(float).to_numpy(),
+        "prev_close": last["prev_close"].astype(float).to_numpy(),
+        "diff": [round(v, 2) for v in _pct(last["close"], last["prev_close"])],
+        "volume": last["volume"].astype(float).to_numpy(),
+        "special_value": special_value,
+    }, columns=DETAIL_COLUMNS)
+
+
+def _ranked(df, by, ascending):
+    df = df.sort_values(by=by, ascending=ascending).reset_index(drop=True)
+    df["special_value"] = range(1, len(df) + 1)
+    return df
+
+
+def _enough(last, counts, minimum):
+    """
+    기존 스크립트 기간 안의 봉 수 >= minimum
+    - 직전 봉 지표(prev_*)를 쓰는 전략은 기존 기간 안에서 prev 값이 계산되던 경우만 통과하도록
+      window + 1 을 minimum 으로 사용
+    """
+    return counts.reindex(last.index).fillna(0) >= minimum
+
+
+def drop_spike(ctx):
+    last = ctx.last_bars
+    last = last[(_pct(last["close"], last["prev_close"]) <= -5) & (last["close"] >= 10000)]
+    return _ranked(_detail(ctx, last, 0), "diff", True)
+
+
+def rise_spike(ctx):
+    last = ctx.last_bars
+    last = last[last["volume"].fillna(0) > 0]
+    last = last[(_pct(last["close"], last["prev_close"]) >= 5) & (last["close"] >= 10000)]
+    return _ranked(_detail(ctx, last, 0), "diff", False)
+
+
+def volume_top20(ctx):
+    last = ctx.last_bars
+    last = last[last["volume"].fillna(0) > 0]
+    return _ranked(_detail(ctx, last, 0), "volume", False).head(20)
+
+
+def high_120d(ctx):
+    last = ctx.daily_last
+    last = last[_enough(last, ctx.rows_since(ctx.start(days=200)), 121)]
+    last = last[
+        (last["close"] >= last["high120"]) &
+        (last["prev_close"] < last["prev_high120"]) &
+        (last["close"] >= 10000)
+    ]
+    return _detail(ctx, last, last["high120"].astype(float).to_numpy()) \
+        .sort_values(by="close", ascending=False)
+
+
+def low_120d(ctx):
+    last = ctx.daily_last
+    last = last[_enough(last, ctx.rows_since(ctx.start(days=200)), 121)]
+    last = last[
+        (last["low120"] >= last["close"]) &
+        (last["close"] >= 10000) &
+        (last["prev_close"] > last["prev_low120"])
+    ]
+    return _detail(ctx, last, last["low120"].astype(float).to_numpy()) \
+        .sort_values(by="close", ascending=True)
+
+
+def _weekly_52w(ctx):
+    start = ctx.start(days=400)
+    last = ctx.weekly_last
+    enough = _enough(last, ctx.rows_since(start), 260) & _enough(last, ctx.weeks_since(start), 53)
+    return last[enough]
+
+
+def high_52w(ctx):
+    last = _weekly_52w(ctx)
+    last = last[
+        (last["close"] >= last["high52"]) &
+        (last["prev_close"] < last["prev_high52"]) &
+        (last["close"] >= 10000)
+    ]
+    return _detail(ctx, last, last["high52"].astype(float).to_numpy()) \
+        .sort_values(by="close", ascending=False)
+
+
+def low_52w(ctx):
+    last = _weekly_52w(ctx)
+    last = last[
+        (last["low52"] >= last["close"]) &
+        (last["close"] >= 10000) &
+        (last["prev_close"] > last["prev_low52"])
+    ]
+    return _detail(ctx, last, last["low52"].astype(float).to_numpy()) \
+        .sort_values(by="close", ascending=True)
+
+
+def _touch_ma60(ctx, last):
+    last = last[last["prev_ma60"].notna() & (last["prev_ma60"] != 0)]
+    touch_rate = _pct(last["close"], last["prev_ma60"])
+    last = last[(touch_rate >= -1.0) & (touch_rate <= 1.0) & (last["close"] >= 10000)]
+    special = [round(float(v), 2) for v in last["prev_ma60"]]
+    return last, special
+
+
+def touch_ma60_daily(ctx):
+    last = ctx.daily_last
+    last = last[_enough(last, ctx.rows_since(ctx.start(months=6)), 61)]
+    last, special = _touch_ma60(ctx, last)
+    return _detail(ctx, last, special).sort_values(by="diff")
+
+
+def touch_ma60_weekly(ctx):
+    last = ctx.weekly_last
+    last = last[_enough(last, ctx.weeks_since(ctx.start(years=2)), 61)]
+    last, special = _touch_ma60(ctx, last)
+    return _detail(ctx, last, special).sort_values(by="diff")
+
+
+def _rsi(ctx):
+    last = ctx.daily_last
+    last = last[_enough(last, ctx.rows_since(ctx.start(months=6)), 20)]
+    return last[last["rsi"].notna() & (last["close"] >= 10000) & (last["volume"].fillna(0) > 0)]
+
+
+def rsi_30(ctx):
+    last = _rsi(ctx)
+    last = last[last["rsi"] <= 30]
+    special = [round(float(v), 2) for v in last["rsi"]]
+    return _detail(ctx, last, special).sort_values(by="special_value")
+
+
+def rsi_70(ctx):
+    last = _rsi(ctx)
+    last = last[last["rsi"] >= 70]
+    special = [round(float(v), 2) for v in last["rsi"]]
+    return _detail(ctx, last, special).sort_values(by="special_value", ascending=False)
+
+
+def _bollinger(ctx, band):
+    last = ctx.daily_last
+    last = last[_enough(last, ctx.rows_since(ctx.start(months=6)), 20)]
+    return last[last[band].notna()]
+
+
+def bb_lower_touch(ctx):
+    last = _bollinger(ctx, "bb_lower")
+    gap_rate = _pct(last["close"], last["bb_lower"])
+    last = last[
+        (gap_rate >= -0.5) & (gap_rate <= 0.5) &
+        (last["close"] >= 10000) &
+        (last["close"] >= last["bb_lower"] * 0.995) &
+        (last["volume"].fillna(0) > 0)
+    ]
+    special = [round(float(v), 2) for v in last["bb_lower"]]
+    return _detail(ctx, last, special).sort_values(by="diff")
+
+
+def bb_upper_touch(ctx):
+    last = _bollinger(ctx, "bb_upper")
+    last = last[last["volume"].fillna(0) > 0]
+    gap_rate = _pct(last["close"], last["bb_upper"])
+    last = last[(gap_rate >= -1.0) & (gap_rate <= 1.0) & (last["close"] >= 10000)]
+    special = [round(float(v), 2) for v in last["bb_upper"]]
+    return _detail(ctx, last, special).sort_values(by="diff", ascending=False)
+
+
+def dual_momentum(ctx, strategy_name):
+    """
+    기간 수익률 상위 TOP_RELATIVE → 절대모멘텀 통과 → 상위 FINAL_TOP (dual_momentum.select)
+    - 선택된 모든 기간이 같은 종가 pivot 을 공유
+    - signal_date 는 종료 거래일, special_value 는 순위
+    """
+    horizon = DUAL_MOMENTUM[strategy_name]
+    days = dm.HORIZON_DAYS["KR"][horizon]
+    start_date = ctx.mk.get_latest_date(ctx.start(days=days))
+    end_date = ctx.mk.get_latest_date(ctx.as_of)
+    if not start_date or not end_date:
+        print(f"거래일 없음: {ctx.start(days=days)} ~ {ctx.as_of}")
+        return None, end_date
+
+    print(f"\n[{strategy_name}] ({start_date} ~ {end_date})\n")
+
+    returns = dm.momentum_returns(ctx.close_pivot, start_date, end_date)
+    final = dm.select(returns, ctx.min_returns[horizon], inclusive=dm.INCLUSIVE["KR"])
+
+    result = pd.DataFrame({
+        "code": final["code"],
+        "name": ctx.names(final["code"], default=""),
+        "date": end_date,
+        "close": final["close"].astype(float),
+        "prev_close": final["prev_close"].astype(float),
+        "diff": final["returns"],
+        "volume": 0,
+        "special_value": range(1, len(final) + 1),
+    }, columns=DETAIL_COLUMNS)
+    return result, end_date
+
+
+# 이름 → (전략 함수, 조회 기간(DateOffset 인자, None = 최근 봉만), 출력 제목)
+STRATEGIES = {
+    "DAILY_DROP_SPIKE_KR": (drop_spike, None, "[일봉] 전일 대비 5% 이상 하락 종목"),
+    "DAILY_RISE_SPIKE_KR": (rise_spike, None, "[일봉] 전일 대비 5% 이상 상승 종목"),
+    "DAILY_TOP20_VOLUME_KR": (volume_top20, None, "[일봉] 거래량 TOP20 종목"),
+    "DAILY_120D_NEW_HIGH_KR": (high_120d, {"days": 200}, "[일봉] 120일 종가 신고가 '첫 발생' 종목"),
+    "DAILY_120D_NEW_LOW_KR": (low_120d, {"days": 200}, "[일봉] 120일 종가 신저가 '첫 발생' 종목"),
+    "WEEKLY_52W_NEW_HIGH_KR": (high_52w, {"days": 400}, "[주봉] 52주 신고가 '첫 발생' 종목"),
+    "WEEKLY_52W_NEW_LOW_KR": (low_52w, {"days": 400}, "[주봉] 52주 종가 신저가 종목"),
+    "DAILY_TOUCH_MA60_KR": (touch_ma60_daily, {"months": 6}, "[일봉] 60일선 터치 종목"),
+    "WEEKLY_TOUCH_MA60_KR": (touch_ma60_weekly, {"years": 2}, "[주봉] 60주선 터치 종목"),
+    "RSI_30_UNHEATED_KR": (rsi_30, {"months": 6}, "[RSI] 30 이하 & 종가 10,000 이상 종목"),
+    "RSI_70_OVERHEATED_KR": (rsi_70, {"months": 6}, "[RSI] 70 이상 과열 종목"),
+    "DAILY_BB_LOWER_TOUCH_KR": (bb_lower_touch, {"months": 6}, "[일봉] 볼린저 하단 터치 종목 (±0.5%)"),
+    "DAILY_BB_UPPER_TOUCH_KR": (bb_upper_touch, {"months": 6}, "[일봉] 볼린저 상단 터치 종목 (±1%)"),
+}
+for _name, _horizon in DUAL_MOMENTUM.items():
+    STRATEGIES[_name] = (
+        dual_momentum, {"days": dm.HORIZON_DAYS["KR"][_horizon] + 7}, f"[DUAL MOMENTUM] {_name}"
+    )
+
+# 주봉 테이블에서 읽는 전략 (일봉 기간 조회 불필요)
+WEEKLY_STRATEGIES = {high_52w, low_52w, touch_ma60_weekly}
+
+
+# =======================================================
+# 저장
+# =======================================================
+def save_results(strategy_name, df, title, signal_date=None):
+    """
+    STRATEGY_RESULT 1행 + STRATEGY_DETAIL N행, 저장 건수 반환
+    """
+    if df is None or df.empty:
+        print(f"\n{title} 없음 — 저장 생략\n")
+        return 0
+
+    print(f"\n{title}\n")
+    print(df.to_string(index=False))
+    print(f"\n총 {len(df)}건 감지됨.\n")
+
+    signal_date = signal_date or df.iloc[0]["date"]
+    result_id = f"{datetime.now().strftime('%Y%m%d')}_{strategy_name}"
+
+    save_strategy_result(
+        strategy_name=strategy_name,
+        signal_date=signal_date,
+        total_data=len(df)
+    )
+
+    for row in df.to_dict("records"):
+        save_strategy_detail(
+            signal_date=row["date"],
+            action=strategy_name,
+            code=row["code"],
+            name=row["name"],
+            prev_close=row["prev_close"],
+            price=row["close"],
+            diff=row["diff"],
+            volume=row["volume"],
+            special_value=row["special_value"],
+            result_id=result_id
+        )
+
+    print("\nTXT 저장 완료")
+    print(f"RESULT_ID = {result_id}")
+    print(f"ROWCOUNT  = {len(df)}\n")
+    return len(df)
+
+
+# =======================================================
+# 실행
+# =======================================================
+def _load_state(mk, as_of):
+    """
+    증분 지표 상태 (MARKET_STATE_DIR 미설정 / 실패 시 None → 가격 기간 조회로 계산)
+    """
+    store = IndicatorStateStore.from_env(mk.engine, "daily_price_kr")
+    if store is None:
+        return None
+    try:
+        return store.sync(as_of)
+    except Exception as e:
+        print(f"[STATE ERROR] {e}")
+        return None
+
+
+def run(names=None):
+    """
+    names 전략만 실행 (None = 전체), 전략별 저장 건수 dict 반환
+    """
+    names = list(names or STRATEGIES)
+    unknown = [n for n in names if n not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"unknown strategies: {unknown} (available: {list(STRATEGIES)})")
+
+    mk = MarketDB()
+    company_df = mk.get_comp_info_optimization()
+    stocks = set(company_df["code"])
+
+    print(f"\n총 {len(stocks)}개 종목 스캔 시작... ({len(names)}개 전략)\n")
+
+    as_of = datetime.now().strftime("%Y-%m-%d")
+
+    # 일봉 / 주봉 feature 전략 → 상태 사용 가능하면 기간 조회 대상에서 제외
+    featured = [n for n in names if STRATEGIES[n][1] is not None and STRATEGIES[n][0] is not dual_momentum]
+    state = _load_state(mk, as_of) if featured else None
+
+    today = pd.Timestamp.today()
+
+    def window_start(selected):
+        start = min((today - pd.DateOffset(**STRATEGIES[n][1]) for n in selected), default=None)
+        return None if start is None else start.strftime("%Y-%m-%d")
+
+    weekly = [n for n in featured if STRATEGIES[n][0] in WEEKLY_STRATEGIES]
+    load_start = window_start(
+        n for n in names
+        if STRATEGIES[n][1] is not None and n not in weekly and (state is None or n not in featured)
+    )
+    weekly_start = window_start(weekly) if state is None else None
+
+    ctx = ScreeningContext(mk, stocks, load_start, as_of, state, weekly_start)
+
+    if ctx.prices is not None and ctx.prices.empty:
+        print("\n전체 가격 데이터 없음 — 종료")
+        return {}
+
+    counts = {}
+    for name in names:
+        func, _, title = STRATEGIES[name]
+        if func is dual_momentum:
+            df, signal_date = dual_momentum(ctx, name)
+        else:
+            df, signal_date = func(ctx), None
+        counts[name] = save_results(name, df, title, signal_date)
+
+    return counts
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:] or None)
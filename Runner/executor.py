@@ -1,18 +1,135 @@
 import subprocess
 import os
 import sys
+import json
+import time
+import signal
+import socket
+import threading
 import logging
 
+from output import OutputCollector
+from usage import HandlerResult, usage_from_rusage
+
 # logger 선언 (logging.yaml 설정을 그대로 사용)
 log = logging.getLogger("handler")
+exec_log = logging.getLogger("executor")
 
 # runner/ 디렉터리 기준으로 프로젝트 루트 계산
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def run_handler(handler_path: str) -> int:
+# ======================================================
+# 실행 모드
+#   spawn  : job마다 새 python 프로세스 실행 (기본)
+#   zygote : 무거운 모듈을 미리 import 한 warm 프로세스에서 fork 실행
+# ======================================================
+EXECUTOR_MODE = os.getenv("EXECUTOR_MODE", "spawn").lower()
+
+ZYGOTE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zygote.py")
+ZYGOTE_SOCKET = os.getenv("ZYGOTE_SOCKET", f"/tmp/stock-runner-zygote-{os.getpid()}.sock")
+ZYGOTE_START_TIMEOUT = 120  # seconds (preload 시간 포함)
+
+# 강제 종료: SIGTERM 후 유예 시간 내 종료되지 않으면 SIGKILL (process group 전체)
+KILL_GRACE_SEC = 10
+
+_zygote = None
+_zygote_lock = threading.Lock()
+
+# 실행 중 handler (job_key → _Running), 취소 요청 대상
+_running = {}
+_running_lock = threading.Lock()
+
+
+class _Running:
+    """
+    실행 중 handler 1건
+    - handler 는 자신이 process group leader (pid == pgid)
+    """
+
+    def __init__(self, handler_path):
+        self.handler_path = handler_path
+        self.pid = None
+        self.finished = False
+        self.terminated = None
+        self._lock = threading.Lock()
+
+    def attach(self, pid):
+        with self._lock:
+            self.pid = pid
+            pending = self.terminated
+        # pid 확보 전에 들어온 취소 요청
+        if pending:
+            self._signal(signal.SIGTERM)
+            self._schedule_kill()
+
+    def terminate(self, reason):
+        with self._lock:
+            if self.finished or self.terminated:
+                return
+            self.terminated = reason
+            if self.pid is None:
+                return
+
+        exec_log.warning("Handler %s: %s (pid=%s) → SIGTERM", reason, self.handler_path, self.pid)
+        self._signal(signal.SIGTERM)
+        self._schedule_kill()
+
+    def done(self):
+        with self._lock:
+            self.finished = True
+
+    def _schedule_kill(self):
+        def _kill():
+            if not self.finished:
+                exec_log.warning("Handler still alive: %s (pid=%s) → SIGKILL", self.handler_path, self.pid)
+                self._signal(signal.SIGKILL)
+
+        timer = threading.Timer(KILL_GRACE_SEC, _kill)
+        timer.daemon = True
+        timer.start()
+
+    def _signal(self, sig):
+        try:
+            os.killpg(self.pid, sig)
+        except ProcessLookupError:
+            # setsid 이전이면 group 이 아직 없음
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+
+def running_jobs():
+    """
+    이 runner 에서 handler 가 실행 중인 job_key 목록 (lease 연장 대상)
+    """
+    with _running_lock:
+        return list(_running)
+
+
+def cancel_handler(job_key) -> bool:
+    """
+    실행 중 job 취소 (process group 종료)
+    - 해당 job 이 이 runner 에서 실행 중이 아니면 False
+    """
+    with _running_lock:
+        running = _running.get(job_key)
+    if running is None:
+        return False
+    running.terminate("CANCELLED")
+    return True
+
+
+def run_handler(handler_path: str, timeout_sec=None, job_key=None) -> HandlerResult:
     """
     handler_path:
       - python 파일 절대 경로
+    timeout_sec:
+      - 초과 시 process group 강제 종료 (None/0 = 제한 없음)
+    job_key:
+      - cancel_handler() 로 취소할 때 쓰는 키 (wait_id)
+    returns:
+      - exit_code + 자식 프로세스 자원 사용량 (CPU/RSS/IO/context switch)
     """
 
     if not handler_path:
@@ -21,22 +138,181 @@ def run_handler(handler_path: str) -> int:
     if not os.path.exists(handler_path):
         raise FileNotFoundError(f"handler file not found: {handler_path}")
 
-    cmd = [sys.executable, handler_path]
+    log.info("Handler start: %s (timeout_sec=%s)", handler_path, timeout_sec)
+
+    collector = OutputCollector()
+    running = _Running(handler_path)
 
-    log.info("Handler start: %s", handler_path)
+    if job_key is not None:
+        with _running_lock:
+            _running[job_key] = running
+
+    watchdog = None
+    if timeout_sec:
+        watchdog = threading.Timer(timeout_sec, running.terminate, args=("TIMEOUT",))
+        watchdog.daemon = True
+        watchdog.start()
+
+    try:
+        if EXECUTOR_MODE == "zygote":
+            result = _run_zygote(handler_path, collector, running)
+        else:
+            result = _run_spawn(handler_path, collector, running)
+    finally:
+        running.done()
+        if watchdog is not None:
+            watchdog.cancel()
+        if job_key is not None:
+            with _running_lock:
+                _running.pop(job_key, None)
+
+    result.terminated = running.terminated
+    collector.flush()
+    result.metrics = collector.metrics()
+    log.info(
+        "Handler output: lines=%s suppressed=%s ROWCOUNT=%s CODECOUNT=%s OUTPUT=%s",
+        result.metrics["output_lines"],
+        result.metrics["suppressed_lines"],
+        result.metrics["row_count"],
+        result.metrics["code_count"],
+        result.metrics["output_path"]
+    )
 
+    log.info(
+        "Handler end: %s (exit_code=%s terminated=%s cpu_user_ms=%s cpu_sys_ms=%s max_rss_kb=%s)",
+        handler_path,
+        result.exit_code,
+        result.terminated,
+        result.usage.get("cpu_user_ms"),
+        result.usage.get("cpu_sys_ms"),
+        result.usage.get("max_rss_kb")
+    )
+
+    return result
+
+
+def start_executor():
+    """
+    runner 기동 시 1회 호출 (zygote 모드면 warm 프로세스 미리 기동)
+    """
+    exec_log.info("Executor mode: %s", EXECUTOR_MODE)
+    if EXECUTOR_MODE == "zygote":
+        _ensure_zygote()
+
+
+# ======================================================
+# spawn 모드
+# ======================================================
+def _run_spawn(handler_path, collector, running):
+    cmd = [sys.executable, handler_path]
+
+    # 새 session → handler 와 그 자식까지 process group 단위로 종료 가능
     process = subprocess.Popen(
         cmd,
         cwd=PROJECT_ROOT,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True
+        text=True,
+        start_new_session=True
     )
+    running.attach(process.pid)
 
     for line in process.stdout:
-        log.info(line.rstrip())
+        collector.feed(line)
+
+    # Popen.wait() 대신 wait4 로 회수해야 자식 rusage 를 얻을 수 있음
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    process.stdout.close()
+
+    return HandlerResult(process.returncode, usage_from_rusage(rusage))
+
+
+# ======================================================
+# zygote 모드
+# ======================================================
+def _ensure_zygote():
+    global _zygote
+
+    with _zygote_lock:
+        if _zygote is not None and _zygote.poll() is None:
+            return
+
+        if _zygote is not None:
+            exec_log.warning("Zygote exited (code=%s) - restarting", _zygote.returncode)
+
+        if os.path.exists(ZYGOTE_SOCKET):
+            os.unlink(ZYGOTE_SOCKET)
+
+        _zygote = subprocess.Popen(
+            [sys.executable, ZYGOTE_SCRIPT, ZYGOTE_SOCKET],
+            cwd=PROJECT_ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True
+        )
+
+        threading.Thread(
+            target=_forward_zygote_output,
+            args=(_zygote,),
+            name="zygote-log",
+            daemon=True
+        ).start()
+
+        deadline = time.monotonic() + ZYGOTE_START_TIMEOUT
+        while not os.path.exists(ZYGOTE_SOCKET):
+            if _zygote.poll() is not None:
+                raise RuntimeError(f"zygote failed to start (exit_code={_zygote.returncode})")
+            if time.monotonic() > deadline:
+                _zygote.kill()
+                raise RuntimeError("zygote start timeout")
+            time.sleep(0.1)
+
+        exec_log.info("Zygote ready: pid=%s socket=%s", _zygote.pid, ZYGOTE_SOCKET)
+
+
+def _forward_zygote_output(proc):
+    for line in proc.stdout:
+        exec_log.info(line.rstrip())
+
+
+def _run_zygote(handler_path, collector, running):
+    _ensure_zygote()
+
+    read_fd, write_fd = os.pipe()
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(ZYGOTE_SOCKET)
+            request = json.dumps({"handler": handler_path}).encode()
+            socket.send_fds(sock, [request], [write_fd])
+            os.close(write_fd)
+            write_fd = None
+
+            replies = sock.makefile("r")
+
+            # 1) fork 직후 handler pid 수신 (timeout/취소 대상)
+            started = replies.readline()
+            if started:
+                running.attach(int(json.loads(started)["pid"]))
+
+            # 2) 출력 계약은 spawn 모드와 동일 (stdout+stderr 라인 단위 전달)
+            with os.fdopen(read_fd, "r", errors="replace") as out:
+                read_fd = None
+                for line in out:
+                    collector.feed(line)
+
+            # 3) 종료 상태
+            reply = replies.readline()
+
+    finally:
+        if write_fd is not None:
+            os.close(write_fd)
+        if read_fd is not None:
+            os.close(read_fd)
 
-    exit_code = process.wait()
-    log.info("Handler end: %s (exit_code=%s)", handler_path, exit_code)
+    if not reply:
+        raise RuntimeError(f"zygote returned no exit status: {handler_path}")
 
-    return exit_code
+    reply = json.loads(reply)
+    return HandlerResult(int(reply["exit_code"]), reply.get("usage") or {})
@@ -0,0 +1,216 @@
+"""
+stock_job_queue lease 관리 (multi-node runner)
+
+- claim 시 runner_id + lease_until(DB 시각 기준) 기록
+- heartbeat thread 가 HEARTBEAT_SEC 마다 executor 에서 실제 실행 중인 job 의 lease 만 연장
+  (handler 종료 후 기록 / 삭제에 실패한 job 은 연장되지 않아 lease 만료 후 회수됨)
+- 같은 thread 가 만료된 lease(R) 를 회수
+    attempts < MAX_ATTEMPTS : W 로 되돌려 다른 runner 가 다시 claim
+    그 외                   : batch_out_h 에 FAIL(LEASE_EXPIRED) 기록 후 큐에서 삭제
+- 취소: 큐 status 를 'C' 로 변경
+    실행 중(R) job  : heartbeat 때 해당 runner 가 process group 종료 → CANCELLED 기록
+    대기 중(W) job  : 실행하지 않고 CANCELLED 기록 후 삭제
+"""
+import os
+import socket
+import threading
+import logging
+from datetime import datetime
+
+from db import get_conn
+from logger import BatchOutLogger
+
+log = logging.getLogger("runner")
+
+RUNNER_ID = os.getenv("RUNNER_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
+LEASE_SEC = int(os.getenv("RUNNER_LEASE_SEC", "120"))
+HEARTBEAT_SEC = int(os.getenv("RUNNER_HEARTBEAT_SEC", "30"))
+MAX_ATTEMPTS = int(os.getenv("RUNNER_MAX_ATTEMPTS", "3"))
+
+
+def acquire_lease(conn, wait_id):
+    sql = """
+    UPDATE stock_job_queue
+    SET status = 'R',
+        started_at = NOW(),
+        runner_id = %s,
+        heartbeat_at = NOW(),
+        lease_until = NOW() + INTERVAL %s SECOND,
+        attempts = attempts + 1
+    WHERE wait_id = %s
+    """
+    with conn.cursor() as cur:
+        cur.execute(sql, (RUNNER_ID, LEASE_SEC, wait_id))
+
+
+def renew_leases(conn, wait_ids):
+    """
+    wait_ids (이 runner 에서 실행 중인 job) 의 lease 연장
+    """
+    if not wait_ids:
+        return 0
+
+    placeholders = ", ".join(["%s"] * len(wait_ids))
+    sql = f"""
+    UPDATE stock_job_queue
+    SET heartbeat_at = NOW(),
+        lease_until = NOW() + INTERVAL %s SECOND
+    WHERE runner_id = %s
+      AND wait_id IN ({placeholders})
+      AND status IN ('R', 'C')
+    """
+    with conn.cursor() as cur:
+        return cur.execute(sql, (LEASE_SEC, RUNNER_ID, *wait_ids))
+
+
+def fetch_cancelled(conn):
+    """
+    이 runner 가 실행 중인 job 중 취소 요청(C) 된 wait_id
+    """
+    sql = """
+    SELECT wait_id
+    FROM stock_job_queue
+    WHERE runner_id = %s
+      AND status = 'C'
+    """
+    with conn.cursor() as cur:
+        cur.execute(sql, (RUNNER_ID,))
+        return [row[0] for row in cur.fetchall()]
+
+
+def purge_cancelled(conn):
+    """
+    실행 전 취소된 job, 실행하던 runner 가 사라진 취소 job 정리
+    """
+    sql = """
+    SELECT wait_id, job_code, batch_out_id
+    FROM stock_job_queue
+    WHERE status = 'C'
+      AND (runner_id IS NULL OR lease_until < NOW())
+    FOR UPDATE SKIP LOCKED
+    """
+    with conn.cursor() as cur:
+        cur.execute(sql)
+        cancelled = cur.fetchall()
+
+    for wait_id, job_code, batch_out_id in cancelled:
+        now = datetime.now()
+        BatchOutLogger(conn).log(
+            job_id=batch_out_id,
+            job_name=job_code,
+            job_info=None,
+            start_time=now,
+            end_time=now,
+            status="CANCELLED",
+            message="CANCELLED (not running)"
+        )
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM stock_job_queue WHERE wait_id = %s", (wait_id,))
+        log.warning("Job cancelled before run: job_code=%s wait_id=%s", job_code, wait_id)
+
+    conn.commit()
+    return len(cancelled)
+
+
+def recover_expired(conn):
+    """
+    lease 만료된 R job 회수 (다른 runner 의 crash 포함)
+    """
+    sql = """
+    SELECT wait_id, job_code, batch_out_id, runner_id, attempts
+    FROM stock_job_queue
+    WHERE status = 'R'
+      AND lease_until < NOW()
+    FOR UPDATE SKIP LOCKED
+    """
+    with conn.cursor() as cur:
+        cur.execute(sql)
+        expired = cur.fetchall()
+
+    for wait_id, job_code, batch_out_id, runner_id, attempts in expired:
+        if attempts < MAX_ATTEMPTS:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE stock_job_queue
+                    SET status = 'W',
+                        runner_id = NULL,
+                        lease_until = NULL
+                    WHERE wait_id = %s
+                    """,
+                    (wait_id,)
+                )
+            log.warning(
+                "Lease expired: job_code=%s runner=%s → re-queued (attempt %s/%s)",
+                job_code, runner_id, attempts, MAX_ATTEMPTS
+            )
+            continue
+
+        now = datetime.now()
+        BatchOutLogger(conn).log(
+            job_id=batch_out_id,
+            job_name=job_code,
+            job_info=None,
+            start_time=now,
+            end_time=now,
+            status="FAIL",
+            message=f"LEASE_EXPIRED runner={runner_id} attempts={attempts}"
+        )
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM stock_job_queue WHERE wait_id = %s", (wait_id,))
+        log.error(
+            "Lease expired: job_code=%s runner=%s → FAIL (max attempts %s)",
+            job_code, runner_id, MAX_ATTEMPTS
+        )
+
+    conn.commit()
+    return len(expired)
+
+
+def start_heartbeat(running, on_recover=None, on_cancel=None):
+    """
+    lease 연장 + 만료 회수 + 취소 처리 thread 기동
+    - running   : 실행 중 wait_id 목록을 돌려주는 함수 (lease 연장 대상)
+    - on_recover: job 을 되돌렸을 때 호출 (대기 worker 깨우기)
+    - on_cancel : 실행 중 job 이 취소 요청됐을 때 wait_id 로 호출
+    """
+    stop = threading.Event()
+
+    def _loop():
+        conn = None
+        while not stop.wait(HEARTBEAT_SEC):
+            try:
+                if conn is None:
+                    conn = get_conn()
+                else:
+                    conn.ping(reconnect=True)
+
+                renew_leases(conn, running())
+                cancelled = fetch_cancelled(conn)
+                conn.commit()
+
+                if on_cancel:
+                    for wait_id in cancelled:
+                        on_cancel(wait_id)
+
+                if recover_expired(conn) and on_recover:
+                    on_recover()
+
+                purge_cancelled(conn)
+
+            except Exception:
+                log.exception("Heartbeat failure")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = None
+
+    threading.Thread(target=_loop, name="heartbeat", daemon=True).start()
+    log.info(
+        "Runner id=%s lease=%ss heartbeat=%ss max_attempts=%s",
+        RUNNER_ID, LEASE_SEC, HEARTBEAT_SEC, MAX_ATTEMPTS
+    )
+    return stop
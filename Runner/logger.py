@@ -1,5 +1,25 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+
+# executor(usage.py) 가 수집하는 자원 사용량 컬럼
+USAGE_COLUMNS = (
+    "cpu_user_ms",
+    "cpu_sys_ms",
+    "max_rss_kb",
+    "io_read_blocks",
+    "io_write_blocks",
+    "ctx_voluntary",
+    "ctx_involuntary",
+)
+
+
+# handler stdout 마커(output.py) 에서 추출한 값
+METRIC_COLUMNS = (
+    "row_count",
+    "code_count",
+    "output_path",
+    "result_id",
+)
 
 
 class BatchOutLogger:
@@ -20,9 +40,20 @@ class BatchOutLogger:
         start_time: datetime,
         end_time: datetime,
         status: str,
-        message: str
+        message: str,
+        usage: Optional[Dict[str, Optional[int]]] = None,
+        metrics: Optional[Dict[str, Optional[object]]] = None
     ):
         duration_ms = int((end_time - start_time).total_seconds() * 1000)
+        usage = usage or {}
+        metrics = metrics or {}
+
+        row_count = metrics.get("row_count")
+        rows_per_sec = (
+            round(row_count * 1000 / duration_ms, 2)
+            if row_count is not None and duration_ms > 0
+            else None
+        )
 
         sql = """
         INSERT INTO batch_out_h
@@ -35,7 +66,19 @@ class BatchOutLogger:
             exec_status,
             exec_message,
             exec_date,
-            duration_ms
+            duration_ms,
+            cpu_user_ms,
+            cpu_sys_ms,
+            max_rss_kb,
+            io_read_blocks,
+            io_write_blocks,
+            ctx_voluntary,
+            ctx_involuntary,
+            row_count,
+            code_count,
+            output_path,
+            result_id,
+            rows_per_sec
         )
         VALUES
         (
@@ -43,6 +86,11 @@ class BatchOutLogger:
             %s, %s,
             %s, %s,
             CURDATE(),
+            %s,
+            %s, %s, %s,
+            %s, %s,
+            %s, %s,
+            %s, %s, %s, %s,
             %s
         )
         """
@@ -58,6 +106,9 @@ class BatchOutLogger:
                     end_time,
                     status,
                     message,
-                    duration_ms
+                    duration_ms,
+                    *(usage.get(col) for col in USAGE_COLUMNS),
+                    *(metrics.get(col) for col in METRIC_COLUMNS),
+                    rows_per_sec
                 )
             )
@@ -0,0 +1,92 @@
+"""
+handler stdout 수집기
+
+- ROWCOUNT= / CODECOUNT= / OUTPUT= / RESULT_ID= 마커를 구조화된 값으로 추출
+  (KR 전략의 'ROWCOUNT  = 5', US 전략의 '..., ROWCOUNT = 5' 형식 모두 허용, 마지막 값 사용)
+- 종목/페이지 단위 진행 로그는 PROGRESS_LOG_INTERVAL 마다 1줄만 남기고 나머지는 건수만 집계
+"""
+import re
+import time
+import logging
+from typing import Dict, Optional
+
+log = logging.getLogger("handler")
+
+PROGRESS_LOG_INTERVAL = 10.0  # seconds
+
+MARKER_RE = re.compile(r"\b(ROWCOUNT|CODECOUNT|OUTPUT|RESULT_ID)\s*=\s*([^\s,]+)")
+
+PROGRESS_PATTERNS = [
+    re.compile(r"^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}\] "),         # KR 종목별 수집 진행
+    re.compile(r"^\[\d+/\d+\] "),                                # US 종목별 수집 진행
+    re.compile(r"\b\d+/\d+( 페이지 수집)?$"),                     # 페이지 진행
+    re.compile(r"\(\S+\) (저장 완료|데이터 비어 있음)$"),          # 종목별 저장 결과
+]
+
+
+class OutputCollector:
+
+    def __init__(self):
+        self.markers: Dict[str, str] = {}
+        self.line_count = 0
+        self.suppressed = 0
+        self._pending = 0
+        self._last_progress = None
+        self._last_progress_at = 0.0
+
+    def feed(self, line: str):
+        line = line.rstrip()
+        if not line:
+            return
+
+        self.line_count += 1
+
+        for key, value in MARKER_RE.findall(line):
+            self.markers[key] = value
+
+        if not self._is_progress(line):
+            log.info(line)
+            return
+
+        now = time.monotonic()
+        if now - self._last_progress_at < PROGRESS_LOG_INTERVAL:
+            self._pending += 1
+            self.suppressed += 1
+            self._last_progress = line
+            return
+
+        if self._pending:
+            log.info("%s (+%s progress lines)", line, self._pending)
+        else:
+            log.info(line)
+        self._pending = 0
+        self._last_progress_at = now
+
+    def flush(self):
+        """
+        마지막으로 생략된 진행 로그 1줄 출력 (handler 종료 시 호출)
+        """
+        if self._pending:
+            log.info("%s (+%s progress lines)", self._last_progress, self._pending - 1)
+            self._pending = 0
+
+    @staticmethod
+    def _is_progress(line):
+        return any(p.search(line) for p in PROGRESS_PATTERNS)
+
+    def metrics(self) -> Dict[str, Optional[object]]:
+        return {
+            "row_count": _to_int(self.markers.get("ROWCOUNT")),
+            "code_count": _to_int(self.markers.get("CODECOUNT")),
+            "output_path": self.markers.get("OUTPUT"),
+            "result_id": self.markers.get("RESULT_ID"),
+            "output_lines": self.line_count,
+            "suppressed_lines": self.suppressed,
+        }
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -1,5 +1,5 @@
-import time
 import os
+import threading
 import logging
 import logging.config
 from datetime import datetime
@@ -9,8 +9,11 @@ import yaml
 from dotenv import load_dotenv
 
 from db import get_conn
-from executor import run_handler
+from executor import run_handler, start_executor, cancel_handler, running_jobs
+from lease import RUNNER_ID, acquire_lease, start_heartbeat
 from logger import BatchOutLogger
+from scheduler import DagScheduler
+from wakeup import Wakeup, start_listener
 
 # ======================================================
 # ENV 로딩 (Local / Docker 분기)
@@ -51,28 +54,82 @@ log = logging.getLogger("runner")
 # ======================================================
 # Runner 설정
 # ======================================================
-POLL_INTERVAL = 3  # seconds
+# 대기 job이 없을 때 polling 간격 (wakeup 신호가 오면 즉시 깨어남)
+# - 신호를 보내는 enqueuer 가 없으면 polling 이 유일한 경로 → 상한은 기존 고정 간격(3초) 유지
+POLL_INTERVAL_MIN = float(os.getenv("RUNNER_POLL_MIN", "1"))    # seconds
+POLL_INTERVAL_MAX = float(os.getenv("RUNNER_POLL_MAX", "3"))    # seconds
+
+# 동시 실행 worker 수 (handler는 각자 별도 프로세스로 실행되므로 thread로 충분)
+WORKER_COUNT = max(1, int(os.getenv("RUNNER_WORKERS", "1")))
+
+# stock_job_info.timeout_sec 미지정 job 의 실행 제한 시간 (0 = 제한 없음)
+DEFAULT_TIMEOUT_SEC = int(os.getenv("RUNNER_DEFAULT_TIMEOUT_SEC", "7200"))
+
+scheduler = DagScheduler()
 
 # ======================================================
 # DB Access Functions
 # ======================================================
 def fetch_one_waiting(conn):
+    """
+    DAG 기준 실행 가능한 job 중 critical path 가 가장 긴 1건을 잠금
+    - 선행 job 실패 / 순환 의존으로 실행 불가한 job 은 여기서 실패 처리
+    """
+    ready, failed = scheduler.plan(conn)
+
+    for job, reason in failed:
+        fail_blocked_job(conn, job, reason)
+
+    for wait_id, _, _ in ready:
+        job = lock_waiting(conn, wait_id)
+        if job:
+            return job
+
+    return None
+
+
+def lock_waiting(conn, wait_id):
     sql = """
     SELECT wait_id, job_code, batch_out_id
     FROM stock_job_queue
-    WHERE status = 'W'
-    ORDER BY requested_at
-    LIMIT 1
-    FOR UPDATE
+    WHERE wait_id = %s
+      AND status = 'W'
+    FOR UPDATE SKIP LOCKED
     """
     with conn.cursor() as cur:
-        cur.execute(sql)
+        cur.execute(sql, (wait_id,))
         return cur.fetchone()
 
 
-def fetch_handler_path(conn, job_code):
+def fail_blocked_job(conn, job, reason):
+    wait_id, job_code, batch_out_id = job
+
+    if not lock_waiting(conn, wait_id):
+        return
+
+    now = datetime.now()
+    BatchOutLogger(conn).log(
+        job_id=batch_out_id,
+        job_name=job_code,
+        job_info=None,
+        start_time=now,
+        end_time=now,
+        status="FAIL",
+        message=reason
+    )
+    delete_queue(conn, wait_id)
+    conn.commit()
+
+    log.warning("Job skipped: job_code=%s (%s)", job_code, reason)
+
+
+def fetch_job_info(conn, job_code):
+    """
+    returns (handler_path, timeout_sec) / 미등록·미사용 job 이면 (None, None)
+    - timeout_sec NULL 이면 DEFAULT_TIMEOUT_SEC, 0 이면 제한 없음
+    """
     sql = """
-    SELECT handler_name
+    SELECT handler_name, timeout_sec
     FROM stock_job_info
     WHERE job_code = %s
       AND use_yn = 'Y'
@@ -80,18 +137,14 @@ def fetch_handler_path(conn, job_code):
     with conn.cursor() as cur:
         cur.execute(sql, (job_code,))
         row = cur.fetchone()
-        return row[0] if row else None
 
+    if not row:
+        return None, None
 
-def mark_running(conn, wait_id):
-    sql = """
-    UPDATE stock_job_queue
-    SET status = 'R',
-        started_at = NOW()
-    WHERE wait_id = %s
-    """
-    with conn.cursor() as cur:
-        cur.execute(sql, (wait_id,))
+    handler_path, timeout_sec = row
+    if timeout_sec is None:
+        timeout_sec = DEFAULT_TIMEOUT_SEC
+    return handler_path, timeout_sec
 
 
 def delete_queue(conn, wait_id):
@@ -100,79 +153,183 @@ def delete_queue(conn, wait_id):
         cur.execute(sql, (wait_id,))
 
 
+def release_job(conn, wait_id):
+    """
+    실행 완료 job 삭제 (lease 를 보유한 경우만)
+    - 0건이면 lease 만료로 이미 다른 runner 에 넘어간 것
+    """
+    sql = "DELETE FROM stock_job_queue WHERE wait_id = %s AND runner_id = %s"
+    with conn.cursor() as cur:
+        return cur.execute(sql, (wait_id, RUNNER_ID))
+
+
 # ======================================================
 # Core Logic
 # ======================================================
-def process_once():
-    conn = get_conn()
+def process_once(conn):
+    """
+    대기 job 1건을 claim 후 실행
+    - 다른 worker가 잠근 행은 SKIP LOCKED 로 건너뛴다
+    - job을 실행했으면 True, 대기 job이 없으면 False
+    - conn 은 worker 가 계속 재사용 (close 하지 않음)
+    """
     try:
         job = fetch_one_waiting(conn)
         if not job:
             conn.commit()
-            return
+            return False
 
         wait_id, job_code, batch_out_id = job
 
-        handler_path = fetch_handler_path(conn, job_code)
+        # 상태 R + lease 기록 후 즉시 커밋 (락 최소화)
+        acquire_lease(conn, wait_id)
+        conn.commit()
+
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        log.exception("Runner ERROR")
+        return False
+
+    run_job(conn, wait_id, job_code, batch_out_id)
+    return True
+
+
+def run_job(conn, wait_id, job_code, batch_out_id):
+    """
+    claim 된 job 실행
+    - 정상/비정상 종료, runner 예외 모두 batch_out_h 기록 후 큐에서 제거
+    - 기록 자체가 실패하면 R 로 남고 lease 만료 후 회수된다
+      (heartbeat 는 executor 에서 실행 중인 job 만 연장 → handler 종료 후에는 연장되지 않음)
+    """
+    handler_path = None
+    result = None
+    start = datetime.now()
+
+    try:
+        handler_path, timeout_sec = fetch_job_info(conn, job_code)
+        conn.commit()
         if not handler_path:
             raise RuntimeError(f"handler not found for job_code={job_code}")
 
-        # 상태 R로 변경 후 즉시 커밋 (락 최소화)
-        mark_running(conn, wait_id)
-        conn.commit()
+        log.info("Job start: job_code=%s handler=%s", job_code, handler_path)
 
-        batch_logger = BatchOutLogger(conn)
+        result = run_handler(handler_path, timeout_sec=timeout_sec, job_key=wait_id)
+        exit_code = result.exit_code
 
-        log.info("Job start: job_code=%s handler=%s", job_code, handler_path)
+        if result.terminated == "TIMEOUT":
+            status = "TIMEOUT"
+            message = f"TIMEOUT={timeout_sec}s EXIT_CODE={exit_code}"
+        elif result.terminated == "CANCELLED":
+            status = "CANCELLED"
+            message = f"CANCELLED EXIT_CODE={exit_code}"
+        else:
+            status = "SUCCESS" if exit_code == 0 else "FAIL"
+            message = "NO_ERROR" if exit_code == 0 else f"EXIT_CODE={exit_code}"
+
+    except Exception as e:
+        log.exception("Job ERROR: job_code=%s", job_code)
+        status = "FAIL"
+        message = f"RUNNER_ERROR={type(e).__name__}: {e}"[:500]
 
-        start = datetime.now()
-        exit_code = run_handler(handler_path)
-        end = datetime.now()
+    end = datetime.now()
 
-        status = "SUCCESS" if exit_code == 0 else "FAIL"
-        message = "NO_ERROR" if exit_code == 0 else f"EXIT_CODE={exit_code}"
+    try:
+        # 긴 job 동안 wait_timeout 으로 끊겼을 수 있음
+        conn.ping(reconnect=True)
 
         # 실행 이력 기록 (DB 전용 로거)
-        batch_logger.log(
+        BatchOutLogger(conn).log(
             job_id=batch_out_id,
             job_name=job_code,        # 🔑 job_code == job_name
             job_info=handler_path,
             start_time=start,
             end_time=end,
             status=status,
-            message=message
+            message=message,
+            usage=result.usage if result else None,
+            metrics=result.metrics if result else None
         )
 
-        delete_queue(conn, wait_id)
-        conn.commit()
+        if not release_job(conn, wait_id):
+            log.warning("Lease lost: job_code=%s wait_id=%s (re-queued by lease expiry)", job_code, wait_id)
 
-        log.info(
-            "Job end: job_code=%s status=%s duration_ms=%s",
-            job_code,
-            status,
-            int((end - start).total_seconds() * 1000)
-        )
+        conn.commit()
 
     except Exception:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except Exception:
+            pass
         log.exception("Runner ERROR")
 
-    finally:
-        conn.close()
+    log.info(
+        "Job end: job_code=%s status=%s duration_ms=%s rowcount=%s",
+        job_code,
+        status,
+        int((end - start).total_seconds() * 1000),
+        result.metrics.get("row_count") if result else None
+    )
 
 
 # ======================================================
 # Runner Loop
 # ======================================================
-def main():
-    log.info("Python Runner START")
+def worker_loop(wakeup: Wakeup):
+    conn = None
+    interval = POLL_INTERVAL_MIN
+
     while True:
+        seen = wakeup.seq
         try:
-            process_once()
+            if conn is None:
+                conn = get_conn()
+            else:
+                conn.ping(reconnect=True)
+
+            # job을 처리했으면 바로 다음 job 조회
+            # (후행 job 이 실행 가능해졌을 수 있으므로 대기 중인 worker 도 깨움)
+            if process_once(conn):
+                interval = POLL_INTERVAL_MIN
+                wakeup.notify()
+                continue
+
         except Exception:
-            # process_once 외 영역 방어
+            # process_once 외 영역 방어 (DB 접속 실패 등)
             log.exception("Unexpected runner failure")
-        time.sleep(POLL_INTERVAL)
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                conn = None
+
+        # 빈 큐: 신호가 오면 즉시, 아니면 점점 길게 대기
+        if wakeup.wait(seen, interval):
+            interval = POLL_INTERVAL_MIN
+        else:
+            interval = min(interval * 2, POLL_INTERVAL_MAX)
+
+
+def main():
+    log.info("Python Runner START (workers=%s)", WORKER_COUNT)
+    start_executor()
+
+    wakeup = Wakeup()
+    start_listener(wakeup)
+    start_heartbeat(running_jobs, on_recover=wakeup.notify, on_cancel=cancel_handler)
+
+    workers = [
+        threading.Thread(target=worker_loop, args=(wakeup,), name=f"worker-{i}", daemon=True)
+        for i in range(1, WORKER_COUNT + 1)
+    ]
+    for w in workers:
+        w.start()
+
+    for w in workers:
+        w.join()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,235 @@
+"""
+stock_job_info.depends_on 기반 DAG 스케줄러
+
+- depends_on : 선행 job_code 콤마 구분 (예: 'STOCK_DB_UPDATE_KR')
+- 대기(W) job 은 선행 job 이 큐에 남아있지 않을 때(W/R/C 없음) 실행 가능
+- 선행 job 의 오늘 마지막 실행이 SUCCESS 가 아니면(FAIL/TIMEOUT/CANCELLED) 후행 job 은 실행하지 않고 실패 처리
+- 선행 job 의 오늘 실행 이력이 없으면(미등록 / 아직 claim 전) 충족되지 않은 것으로 보고 계속 대기
+  (전날 데이터로 실행 방지) — RUNNER_UPSTREAM_WAIT_SEC 초과 대기 시 UPSTREAM_MISSING 으로 실패 처리 (0 = 무제한)
+- 순환 의존에 속한 job 은 서로를 기다리며 영원히 대기하므로 실행하지 않고 실패 처리 (메시지에 순환 job 명시)
+- 자기 자신 의존(depends_on 에 자기 job_code)은 경고 후 무시
+- 실행 가능한 job 은 critical path(자신 + 후행 체인의 과거 평균 duration_ms) 가 긴 순서로 claim
+"""
+import os
+import time
+import threading
+import logging
+
+log = logging.getLogger("runner")
+
+GRAPH_REFRESH_SEC = 60          # stock_job_info / 평균 duration 재조회 주기
+DURATION_LOOKBACK_DAYS = 14     # batch_out_h 평균 duration 산정 기간
+
+# 선행 job 의 오늘 실행 이력이 없을 때 최대 대기 시간 (0 = 무제한 대기)
+UPSTREAM_WAIT_SEC = int(os.getenv("RUNNER_UPSTREAM_WAIT_SEC", "0"))
+
+
+class DagScheduler:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+        self.deps = {}          # job_code -> [upstream job_code]
+        self.priority = {}      # job_code -> critical path 길이 (ms)
+        self.cycles = {}        # job_code -> 속한 순환 의존 job_code 목록 ('A,B')
+        self._missing_logged = set()    # 선행 이력 없음으로 대기 중임을 이미 기록한 wait_id
+
+    # --------------------------------------------------
+    # 그래프 로딩
+    # --------------------------------------------------
+    def refresh(self, conn, force=False):
+        with self._lock:
+            if not force and time.monotonic() - self._loaded_at < GRAPH_REFRESH_SEC:
+                return
+
+            with conn.cursor() as cur:
+                cur.execute("SELECT job_code, depends_on FROM stock_job_info")
+                rows = cur.fetchall()
+
+                cur.execute(
+                    """
+                    SELECT job_name, AVG(duration_ms)
+                    FROM batch_out_h
+                    WHERE exec_status = 'SUCCESS'
+                      AND exec_date >= CURDATE() - INTERVAL %s DAY
+                    GROUP BY job_name
+                    """,
+                    (DURATION_LOOKBACK_DAYS,)
+                )
+                durations = {name: float(avg) for name, avg in cur.fetchall() if avg is not None}
+
+            deps = {}
+            for job_code, depends_on in rows:
+                upstream = [c.strip() for c in (depends_on or "").split(",") if c.strip()]
+                if job_code in upstream:
+                    log.error("Cyclic job dependency: DEPENDENCY_CYCLE=%s (self dependency ignored)", job_code)
+                deps[job_code] = [c for c in upstream if c != job_code]
+
+            self.deps = deps
+            self.cycles = self._find_cycles(deps)
+            self.priority = self._critical_path(deps, durations)
+            self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _find_cycles(deps):
+        """
+        순환 의존(강연결 요소, 2개 이상 job)에 속한 job_code -> 'A,B,...' (Tarjan)
+        """
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        cycles = {}
+
+        def visit(job):
+            index[job] = low[job] = len(index)
+            stack.append(job)
+            on_stack.add(job)
+
+            for up in deps.get(job, []):
+                if up not in index:
+                    visit(up)
+                    low[job] = min(low[job], low[up])
+                elif up in on_stack:
+                    low[job] = min(low[job], index[up])
+
+            if low[job] == index[job]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == job:
+                        break
+                if len(component) > 1:
+                    name = ",".join(sorted(component))
+                    for member in component:
+                        cycles[member] = name
+
+        for job in deps:
+            if job not in index:
+                visit(job)
+
+        if cycles:
+            for name in sorted(set(cycles.values())):
+                log.error("Cyclic job dependency: %s", name)
+        return cycles
+
+    @staticmethod
+    def _critical_path(deps, durations):
+        """
+        priority(job) = duration(job) + max(priority(후행 job))
+        - 이력이 없는 job 은 전체 평균 duration 사용
+        - 순환 의존은 경고 후 해당 간선 무시 (해당 job 은 plan 에서 실패 처리)
+        """
+        default = sum(durations.values()) / len(durations) if durations else 0.0
+
+        downstream = {}
+        for job, upstream in deps.items():
+            for up in upstream:
+                downstream.setdefault(up, []).append(job)
+
+        priority = {}
+        visiting = set()
+
+        def visit(job):
+            if job in priority:
+                return priority[job]
+            if job in visiting:
+                log.warning("Cyclic job dependency detected at job_code=%s", job)
+                return 0.0
+            visiting.add(job)
+            tail = max((visit(d) for d in downstream.get(job, [])), default=0.0)
+            visiting.discard(job)
+            priority[job] = durations.get(job, default) + tail
+            return priority[job]
+
+        for job in set(deps) | set(downstream):
+            visit(job)
+
+        return priority
+
+    # --------------------------------------------------
+    # 실행 계획
+    # --------------------------------------------------
+    def plan(self, conn):
+        """
+        returns (ready, failed)
+          ready  : [(wait_id, job_code, batch_out_id)] critical path 긴 순
+          failed : [((wait_id, job_code, batch_out_id), 실패 사유 message)]
+                   UPSTREAM_FAIL=<선행 job_code> / UPSTREAM_MISSING=<선행 job_code>
+                   / DEPENDENCY_CYCLE=<순환 job_code 목록>
+        """
+        self.refresh(conn)
+
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT wait_id, job_code, batch_out_id, status,
+                       TIMESTAMPDIFF(SECOND, requested_at, NOW())
+                FROM stock_job_queue
+                WHERE status IN ('W', 'R', 'C')
+                ORDER BY requested_at
+                """
+            )
+            queue = cur.fetchall()
+
+        waiting = [row[:3] for row in queue if row[3] == "W"]
+        waited = {row[0]: row[4] or 0 for row in queue}
+        if not waiting:
+            self._missing_logged.clear()
+            return [], []
+
+        pending = {row[1] for row in queue}
+        today_status = self._today_status(conn) if any(self.deps.get(j[1]) for j in waiting) else {}
+
+        ready, failed = [], []
+        for job in waiting:
+            upstream = self.deps.get(job[1], [])
+
+            # 순환 의존 → 선행 job 이 끝날 수 없으므로 대기하지 않고 실패
+            cycle = self.cycles.get(job[1])
+            if cycle:
+                failed.append((job, f"DEPENDENCY_CYCLE={cycle}"))
+                continue
+
+            if any(up in pending for up in upstream):
+                continue
+
+            failed_up = next(
+                (up for up in upstream if up in today_status and today_status[up] != "SUCCESS"),
+                None
+            )
+            if failed_up:
+                failed.append((job, f"UPSTREAM_FAIL={failed_up}"))
+                continue
+
+            # 오늘 실행 이력 없는 선행 job → 아직 충족 안 됨 (전날 결과로 실행하지 않음)
+            missing_up = next((up for up in upstream if up not in today_status), None)
+            if missing_up:
+                if UPSTREAM_WAIT_SEC and waited.get(job[0], 0) >= UPSTREAM_WAIT_SEC:
+                    failed.append((job, f"UPSTREAM_MISSING={missing_up}"))
+                elif job[0] not in self._missing_logged:
+                    self._missing_logged.add(job[0])
+                    log.warning("Job waiting: job_code=%s (no run of upstream %s today)", job[1], missing_up)
+                continue
+
+            ready.append(job)
+
+        # 정렬 안정성 유지 → 동일 priority 는 requested_at 순
+        ready.sort(key=lambda j: -self.priority.get(j[1], 0.0))
+        return ready, failed
+
+    @staticmethod
+    def _today_status(conn):
+        """
+        job_name -> 오늘 마지막 실행 상태
+        """
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT job_name, exec_status
+                FROM batch_out_h
+                WHERE exec_date = CURDATE()
+                ORDER BY exec_end_time
+                """
+            )
+            return {name: status for name, status in cur.fetchall()}
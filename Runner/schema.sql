@@ -0,0 +1,56 @@
+-- ======================================================
+-- Runner 확장 스키마 (MariaDB 10.6+ : FOR UPDATE SKIP LOCKED)
+-- 기존 테이블에 누적 적용 (IF NOT EXISTS 로 재실행 안전)
+-- ======================================================
+
+-- 선행 job_code (콤마 구분) : DAG 스케줄링
+ALTER TABLE stock_job_info
+    ADD COLUMN IF NOT EXISTS depends_on VARCHAR(500) NULL COMMENT '선행 job_code (콤마 구분)';
+
+-- 오늘 실행 상태 / 평균 duration 조회용
+CREATE INDEX IF NOT EXISTS idx_batch_out_h_date_job
+    ON batch_out_h (exec_date, job_name);
+
+-- 예) 전략 스캔은 KR 일봉 적재 이후 실행
+-- UPDATE stock_job_info SET depends_on = 'STOCK_DB_UPDATE_KR' WHERE job_code IN ('RSI_30_KR', 'HIGH_52_KR');
+
+-- 예) 가격 요약 / 주봉 테이블 갱신 (BATCH_CODE/StockList/PriceSummaryUpdateKR.py) 은 일봉 적재 직후,
+--     전략 스캔은 그 이후 (전략 프로세스는 요약 / 주봉 테이블을 읽기만 함)
+-- UPDATE stock_job_info SET depends_on = 'STOCK_DB_UPDATE_KR' WHERE job_code = 'PRICE_SUMMARY_UPDATE_KR';
+-- UPDATE stock_job_info SET depends_on = 'PRICE_SUMMARY_UPDATE_KR' WHERE job_code IN ('RSI_30_KR', 'HIGH_52_KR');
+
+-- job 별 자원 사용량 (executor os.wait4 rusage)
+ALTER TABLE batch_out_h
+    ADD COLUMN IF NOT EXISTS cpu_user_ms     BIGINT NULL COMMENT '자식 user CPU (ms)',
+    ADD COLUMN IF NOT EXISTS cpu_sys_ms      BIGINT NULL COMMENT '자식 sys CPU (ms)',
+    ADD COLUMN IF NOT EXISTS max_rss_kb      BIGINT NULL COMMENT '최대 RSS (KB)',
+    ADD COLUMN IF NOT EXISTS io_read_blocks  BIGINT NULL COMMENT 'block input 횟수',
+    ADD COLUMN IF NOT EXISTS io_write_blocks BIGINT NULL COMMENT 'block output 횟수',
+    ADD COLUMN IF NOT EXISTS ctx_voluntary   BIGINT NULL COMMENT '자발적 context switch (I/O 대기)',
+    ADD COLUMN IF NOT EXISTS ctx_involuntary BIGINT NULL COMMENT '비자발적 context switch (CPU 경합)';
+
+-- handler stdout 마커 (ROWCOUNT= / CODECOUNT= / OUTPUT= / RESULT_ID=) + 처리량
+ALTER TABLE batch_out_h
+    ADD COLUMN IF NOT EXISTS row_count    BIGINT        NULL COMMENT 'ROWCOUNT=',
+    ADD COLUMN IF NOT EXISTS code_count   INT           NULL COMMENT 'CODECOUNT=',
+    ADD COLUMN IF NOT EXISTS output_path  VARCHAR(500)  NULL COMMENT 'OUTPUT=',
+    ADD COLUMN IF NOT EXISTS result_id    VARCHAR(100)  NULL COMMENT 'RESULT_ID=',
+    ADD COLUMN IF NOT EXISTS rows_per_sec DECIMAL(12,2) NULL COMMENT 'row_count / duration';
+
+-- lease 기반 claim (multi-node runner)
+ALTER TABLE stock_job_queue
+    ADD COLUMN IF NOT EXISTS runner_id    VARCHAR(100) NULL COMMENT '실행 중인 runner (host-pid)',
+    ADD COLUMN IF NOT EXISTS heartbeat_at DATETIME     NULL COMMENT '마지막 heartbeat',
+    ADD COLUMN IF NOT EXISTS lease_until  DATETIME     NULL COMMENT 'lease 만료 시각 (초과 시 회수)',
+    ADD COLUMN IF NOT EXISTS attempts     INT NOT NULL DEFAULT 0 COMMENT 'claim 횟수';
+
+CREATE INDEX IF NOT EXISTS idx_stock_job_queue_status_lease
+    ON stock_job_queue (status, lease_until);
+
+-- job 별 실행 제한 시간 (NULL = RUNNER_DEFAULT_TIMEOUT_SEC, 0 = 제한 없음)
+ALTER TABLE stock_job_info
+    ADD COLUMN IF NOT EXISTS timeout_sec INT NULL COMMENT '실행 제한 시간 (초)';
+
+-- stock_job_queue.status : W(대기) / R(실행) / C(취소 요청)
+-- 취소: UPDATE stock_job_queue SET status = 'C' WHERE wait_id = ?;
+-- batch_out_h.exec_status : SUCCESS / FAIL / TIMEOUT / CANCELLED
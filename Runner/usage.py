@@ -0,0 +1,30 @@
+"""
+handler 실행 결과 + 자원 사용량 (os.wait4 rusage) + stdout 마커 (output.py)
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class HandlerResult:
+    exit_code: int
+    usage: Dict[str, Optional[int]] = field(default_factory=dict)
+    metrics: Dict[str, Optional[object]] = field(default_factory=dict)
+    # executor 가 강제 종료한 경우 사유 (TIMEOUT / CANCELLED)
+    terminated: Optional[str] = None
+
+
+def usage_from_rusage(ru) -> Dict[str, int]:
+    """
+    resource.struct_rusage → batch_out_h 컬럼명 dict
+    - ru_maxrss 는 Linux 기준 KB
+    """
+    return {
+        "cpu_user_ms": int(ru.ru_utime * 1000),
+        "cpu_sys_ms": int(ru.ru_stime * 1000),
+        "max_rss_kb": int(ru.ru_maxrss),
+        "io_read_blocks": int(ru.ru_inblock),
+        "io_write_blocks": int(ru.ru_oublock),
+        "ctx_voluntary": int(ru.ru_nvcsw),
+        "ctx_involuntary": int(ru.ru_nivcsw),
+    }
@@ -0,0 +1,103 @@
+"""
+Runner wakeup 신호
+
+- enqueuer 가 stock_job_queue 에 INSERT/COMMIT 한 직후 UDP datagram 1개를 보내면
+  대기 중인 worker 를 즉시 깨운다 (payload 내용은 사용하지 않음)
+- 신호는 best-effort: 유실되어도 worker 는 backoff polling 으로 결국 job 을 가져간다
+- 포트 bind 실패(같은 호스트의 두 번째 runner 등) 시 해당 runner 는 polling 만 사용
+
+enqueuer 쪽 호출
+  - Python : from wakeup import notify_runner; notify_runner()
+  - CLI    : python Runner/wakeup.py
+  - 그 외  : 127.0.0.1:RUNNER_WAKEUP_PORT 로 아무 UDP 패킷 1개 전송
+"""
+import os
+import socket
+import threading
+import logging
+
+log = logging.getLogger("runner")
+
+WAKEUP_HOST = os.getenv("RUNNER_WAKEUP_HOST", "127.0.0.1")
+WAKEUP_PORT = int(os.getenv("RUNNER_WAKEUP_PORT", "47001"))  # 0 = 비활성
+
+
+class Wakeup:
+    """
+    worker 대기/깨우기용 이벤트
+    - seq 는 notify 될 때마다 증가
+    - worker 는 poll 직전 seq 를 기억해 두고 wait(seq) 하므로
+      poll 도중 들어온 신호도 놓치지 않는다
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._seq = 0
+
+    @property
+    def seq(self):
+        with self._cond:
+            return self._seq
+
+    def notify(self):
+        with self._cond:
+            self._seq += 1
+            self._cond.notify_all()
+
+    def wait(self, seen_seq, timeout):
+        """
+        seq 가 바뀌거나 timeout 이 지나면 반환
+        - 신호로 깨어났으면 True
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._seq != seen_seq, timeout)
+
+
+def start_listener(wakeup: Wakeup):
+    """
+    UDP 수신 thread 기동 (RUNNER_WAKEUP_PORT=0 이면 polling 만 사용)
+    """
+    if not WAKEUP_PORT:
+        log.info("Wakeup listener disabled (polling only)")
+        return None
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.bind((WAKEUP_HOST, WAKEUP_PORT))
+    except OSError as e:
+        # 같은 호스트의 다른 runner 가 포트 사용 중 등 → runner 는 멈추지 않고 polling 만 사용
+        sock.close()
+        log.warning("Wakeup listener bind failed udp://%s:%s (%s) → polling only",
+                    WAKEUP_HOST, WAKEUP_PORT, e)
+        return None
+
+    def _listen():
+        while True:
+            try:
+                sock.recv(512)
+                wakeup.notify()
+            except Exception:
+                log.exception("Wakeup listener error")
+
+    thread = threading.Thread(target=_listen, name="wakeup", daemon=True)
+    thread.start()
+
+    log.info("Wakeup listener: udp://%s:%s", WAKEUP_HOST, WAKEUP_PORT)
+    return thread
+
+
+def notify_runner(host=WAKEUP_HOST, port=WAKEUP_PORT):
+    """
+    enqueuer 용: runner 깨우기 (실패해도 예외 없음)
+    """
+    if not port:
+        return
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(b"wakeup", (host, port))
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    notify_runner()
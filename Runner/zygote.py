@@ -0,0 +1,198 @@
+"""
+Pre-forked warm interpreter (zygote)
+
+- 무거운 공통 모듈(pandas, SQLAlchemy, bs4, yfinance ...)을 한 번만 import 해둔 상태로 대기
+- runner(executor)가 UNIX 소켓으로 handler 경로 + stdout pipe fd 를 보내면
+  fork 한 자식에서 runpy 로 스크립트를 실행한다
+- 프로세스 구조
+    zygote ─ fork ─ supervisor ─ fork ─ handler
+  supervisor 가 fork 직후 handler pid 를, wait 한 뒤 exit_code 를 소켓으로 돌려준다
+  (zygote 자체는 단일 스레드로 accept/fork 만 담당)
+
+실행: python zygote.py <socket_path>
+"""
+import importlib
+import json
+import os
+import runpy
+import signal
+import socket
+import sys
+import traceback
+
+from usage import usage_from_rusage
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 프로젝트 모듈은 import 시점에 날짜/ENV를 고정하므로 미리 로딩하지 않는다 (서드파티만)
+DEFAULT_PRELOAD = (
+    "numpy,pandas,sqlalchemy,pymysql,requests,bs4,lxml,"
+    "yfinance,FinanceDataReader,dotenv,yaml"
+)
+PRELOAD_MODULES = [
+    m.strip()
+    for m in os.getenv("ZYGOTE_PRELOAD", DEFAULT_PRELOAD).split(",")
+    if m.strip()
+]
+
+ACCEPT_TIMEOUT = 1.0  # seconds (부모 생존 확인 / 자식 회수 주기)
+
+
+def preload():
+    loaded = []
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except Exception as e:
+            print(f"[ZYGOTE] preload skip: {name} ({e})", flush=True)
+    print(f"[ZYGOTE] preload done: {','.join(loaded)}", flush=True)
+
+
+def reap_children():
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+# ======================================================
+# handler 프로세스 (fork 된 손자 프로세스)
+# ======================================================
+def exec_handler(handler_path, out_fd):
+    # 독립 process group (runner 가 timeout/취소 시 killpg)
+    os.setsid()
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+    # stdout/stderr → runner 로 연결된 pipe (subprocess 모드와 동일하게 합쳐서 전달)
+    os.dup2(out_fd, 1)
+    os.dup2(out_fd, 2)
+    os.close(out_fd)
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+
+    # `python handler.py` 실행과 동일한 환경
+    os.chdir(PROJECT_ROOT)
+    sys.argv = [handler_path]
+    sys.path[0] = os.path.dirname(handler_path)
+
+    exit_code = 0
+    try:
+        runpy.run_path(handler_path, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            pass
+
+    os._exit(exit_code & 0xFF)
+
+
+# ======================================================
+# supervisor 프로세스 (zygote 의 자식)
+# ======================================================
+def supervise(conn, request, out_fd):
+    pid = os.fork()
+    if pid == 0:
+        conn.close()
+        exec_handler(request["handler"], out_fd)
+
+    os.close(out_fd)
+    try:
+        conn.sendall(json.dumps({"pid": pid}).encode() + b"\n")
+    except OSError:
+        pass
+
+    _, status, rusage = os.wait4(pid, 0)
+    exit_code = os.waitstatus_to_exitcode(status)
+
+    reply = {"pid": pid, "exit_code": exit_code, "usage": usage_from_rusage(rusage)}
+    try:
+        conn.sendall(json.dumps(reply).encode() + b"\n")
+    finally:
+        conn.close()
+    os._exit(0)
+
+
+# ======================================================
+# zygote main loop
+# ======================================================
+def serve(sock_path):
+    parent_pid = os.getppid()
+
+    if os.path.exists(sock_path):
+        os.unlink(sock_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(sock_path)
+    server.listen(16)
+    server.settimeout(ACCEPT_TIMEOUT)
+
+    print(f"[ZYGOTE] ready: {sock_path} (pid={os.getpid()})", flush=True)
+
+    try:
+        while True:
+            reap_children()
+
+            # runner 종료 시 같이 종료
+            if os.getppid() != parent_pid:
+                break
+
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+
+            conn.settimeout(None)
+            try:
+                msg, fds, _, _ = socket.recv_fds(conn, 65536, 1)
+                request = json.loads(msg.decode())
+                if len(fds) != 1 or not request.get("handler"):
+                    raise ValueError(f"invalid request: {request}")
+            except Exception as e:
+                print(f"[ZYGOTE] bad request: {e}", flush=True)
+                conn.close()
+                continue
+
+            sys.stdout.flush()
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                supervise(conn, request, fds[0])
+
+            os.close(fds[0])
+            conn.close()
+    finally:
+        server.close()
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python zygote.py <socket_path>")
+        sys.exit(2)
+
+    preload()
+    serve(sys.argv[1])